@@ -0,0 +1,45 @@
+import random
+
+import pytest
+from unittest.mock import Mock
+from triangulator.triangulator import app, breaker, registry, result_cache
+
+
+@pytest.fixture
+def client():
+    """Fixture Flask pour simuler des requêtes HTTP."""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def uniform(n, seed=0):
+    """`n` points uniformes dans le carré unité."""
+    rng = random.Random(seed)
+    return [(rng.random(), rng.random()) for _ in range(n)]
+
+
+def psm_response(data, status=200, headers=None):
+    """Réponse simulée du PointSetManager, lue en flux comme avec `requests`.
+
+    Sans `headers`, la réponse annonce la longueur exacte du corps.
+    """
+    if headers is None:
+        headers = {'Content-Length': str(len(data))}
+    response = Mock(status_code=status, content=data, headers=headers)
+    response.iter_content.side_effect = lambda chunk_size=1, **kwargs: iter(
+        [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+    )
+    return response
+
+
+@pytest.fixture(autouse=True)
+def reset_service_state():
+    """Isole chaque test: cache, métriques et disjoncteur remis à zéro."""
+    result_cache.clear()
+    registry.reset()
+    breaker.reset()
+    yield
+    result_cache.clear()
+    registry.reset()
+    breaker.reset()
@@ -0,0 +1,248 @@
+"""
+Tests du contrôle d'admission
+
+Couvre:
+- Créneaux de calcul, file d'attente bornée et délai d'attente
+- Répartition small / large selon le nombre de points annoncé
+- Réponse 503 avec Retry-After quand la classe « large » est saturée
+- Les petits PointSets restent servis pendant un gros calcul
+- Jobs asynchrones soumis au même contrôle, sans refus
+"""
+
+import struct
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+from tests.conftest import psm_response
+from triangulator.admission import AdmissionController, JobClass, Overloaded
+from triangulator.jobs import SUCCEEDED, JobManager
+
+
+def pointset(n):
+    """PointSet de n points non colinéaires."""
+    return struct.pack('<I', n) + b''.join(
+        struct.pack('<dd', float(i), float(i * i)) for i in range(n)
+    )
+
+
+@pytest.fixture
+def tiny_admission(monkeypatch):
+    """Contrôleur du service avec un seuil « large » de 10 points."""
+    controller = AdmissionController(
+        10,
+        small=JobClass("small", 2, 2, 0.05),
+        large=JobClass("large", 1, 0, 0.05, initial_seconds=42.0),
+    )
+    monkeypatch.setattr('triangulator.triangulator.admission', controller)
+    return controller
+
+
+# ============================================================================
+# 1. Classes de calcul
+# ============================================================================
+
+def test_job_class_admits_up_to_max_concurrent():
+    """Créneaux libres: admission immédiate"""
+    job_class = JobClass("c", 2, 0, 0.01)
+    job_class.acquire()
+    job_class.acquire()
+    assert job_class.snapshot()["running"] == 2
+    with pytest.raises(Overloaded):
+        job_class.acquire()
+    job_class.release(1.0)
+    job_class.acquire()
+
+
+def test_job_class_queue_timeout_and_retry_after():
+    """File pleine ou attente trop longue → Overloaded avec délai estimé"""
+    job_class = JobClass("c", 1, 1, 0.01, initial_seconds=10.0)
+    job_class.acquire()
+    with pytest.raises(Overloaded) as excinfo:
+        job_class.acquire()
+    assert excinfo.value.job_class == "c"
+    assert excinfo.value.retry_after == 10
+    assert job_class.snapshot()["queued"] == 0
+
+
+def test_job_class_queued_job_runs_when_slot_frees():
+    """Un calcul en file démarre dès qu'un créneau se libère"""
+    job_class = JobClass("c", 1, 1, 5.0)
+    job_class.acquire()
+    admitted = threading.Event()
+
+    def waiter():
+        job_class.acquire()
+        admitted.set()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    assert not admitted.wait(0.05)
+    job_class.release(0.5)
+    assert admitted.wait(5.0)
+    thread.join()
+    assert job_class.snapshot()["running"] == 1
+
+
+def test_controller_classifies_by_point_count():
+    """Seuil inclus dans la classe « large »"""
+    controller = AdmissionController(
+        100, JobClass("small", 1, 0, 0), JobClass("large", 1, 0, 0)
+    )
+    assert controller.classify(99).name == "small"
+    assert controller.classify(100).name == "large"
+    with controller.admit(1000) as job_class:
+        assert job_class.snapshot()["running"] == 1
+    assert controller.snapshot()["large"]["running"] == 0
+
+
+# ============================================================================
+# 2. Intégration avec le service
+# ============================================================================
+
+@patch('triangulator.triangulator.requests.get')
+def test_large_budget_exhausted_returns_503(mock_get, client, tiny_admission):
+    """Classe « large » saturée → 503 + Retry-After, sans décoder le PointSet"""
+    mock_get.return_value = psm_response(pointset(20))
+    tiny_admission.large.acquire()
+    try:
+        with patch('triangulator.triangulator.decode_pointset') as mock_decode:
+            response = client.get('/triangulation/big')
+        mock_decode.assert_not_called()
+    finally:
+        tiny_admission.large.release(42.0)
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '42'
+    assert response.get_json()['job_class'] == 'large'
+
+    metrics = client.get('/metrics').get_data(as_text=True)
+    assert 'triangulator_admission_rejected_total{job_class="large"} 1' in metrics
+
+    # Capacité libérée: le calcul est accepté
+    assert client.get('/triangulation/big').status_code == 200
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_rejected_pointset_body_is_not_downloaded(mock_get, client, tiny_admission):
+    """Admission décidée sur l'en-tête: le corps d'un PointSet refusé n'est pas lu"""
+    data = pointset(20)
+    read = []
+
+    def chunks(chunk_size=1, **kwargs):
+        for start in range(0, len(data), 8):
+            read.append(start)
+            yield data[start:start + 8]
+
+    response = psm_response(data)
+    response.iter_content.side_effect = chunks
+    mock_get.return_value = response
+    tiny_admission.large.acquire()
+    try:
+        assert client.get('/triangulation/big').status_code == 503
+    finally:
+        tiny_admission.large.release(1.0)
+
+    assert read == [0]
+    response.close.assert_called_once()
+    assert mock_get.call_args.kwargs['stream'] is True
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_small_pointsets_served_while_large_busy(mock_get, client, tiny_admission):
+    """Un gros calcul en cours ne bloque pas les petits PointSets"""
+    mock_get.return_value = psm_response(pointset(5))
+    tiny_admission.large.acquire()
+    try:
+        assert client.get('/triangulation/small').status_code == 200
+        assert client.get('/hull/small-2').status_code == 200
+    finally:
+        tiny_admission.large.release(1.0)
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_cached_result_bypasses_admission(mock_get, client, tiny_admission):
+    """Un résultat en cache est servi même si la classe est saturée"""
+    mock_get.return_value = psm_response(pointset(20))
+    assert client.get('/triangulation/big').status_code == 200
+    tiny_admission.large.acquire()
+    try:
+        assert client.get('/triangulation/big').status_code == 200
+    finally:
+        tiny_admission.large.release(1.0)
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_hull_of_large_pointset_is_admitted_as_large(mock_get, client, tiny_admission):
+    """/hull est soumis au même contrôle d'admission"""
+    mock_get.return_value = psm_response(pointset(20))
+    tiny_admission.large.acquire()
+    try:
+        assert client.get('/hull/big').status_code == 503
+    finally:
+        tiny_admission.large.release(1.0)
+
+
+# ============================================================================
+# 3. Jobs asynchrones
+# ============================================================================
+
+@pytest.fixture
+def job_manager(tmp_path, monkeypatch):
+    """Gestionnaire de jobs du service, stockant dans un répertoire temporaire."""
+    manager = JobManager(str(tmp_path), workers=1)
+    monkeypatch.setattr('triangulator.triangulator.jobs', manager)
+    monkeypatch.setattr('triangulator.triangulator.JOB_ADMISSION_RETRY_MAX', 0.01)
+    yield manager
+    manager.shutdown()
+
+
+def wait_until(condition, timeout=5.0):
+    """Attend qu'une condition soit vraie, au plus `timeout` secondes."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_job_counts_against_large_limit(mock_get, client, tiny_admission, job_manager):
+    """Un job en cours occupe un créneau « large »: une requête est alors refusée"""
+    data = pointset(20)
+    release = threading.Event()
+
+    def chunks(chunk_size=1, **kwargs):
+        yield data[:4]
+        release.wait(5)
+        yield data[4:]
+
+    response = psm_response(data)
+    response.iter_content.side_effect = chunks
+    mock_get.return_value = response
+    job_id = client.post('/jobs', json={"pointSetId": "big"}).get_json()["jobId"]
+    try:
+        wait_until(lambda: tiny_admission.large.snapshot()["running"] == 1)
+        mock_get.return_value = psm_response(pointset(30))
+        assert client.get('/triangulation/other').status_code == 503
+    finally:
+        release.set()
+
+    assert job_manager.wait(job_id, timeout=5).status == SUCCEEDED
+    assert tiny_admission.large.snapshot()["running"] == 0
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_job_waits_for_a_slot_instead_of_failing(mock_get, client, tiny_admission, job_manager):
+    """Classe saturée: le job patiente à l'étape "admission" puis réussit"""
+    mock_get.side_effect = lambda *args, **kwargs: psm_response(pointset(20))
+    tiny_admission.large.acquire()
+    try:
+        job_id = client.post('/jobs', json={"pointSetId": "big"}).get_json()["jobId"]
+        wait_until(lambda: job_manager.get(job_id).stage == "admission")
+        assert client.get(f'/jobs/{job_id}').get_json()["status"] == "running"
+    finally:
+        tiny_admission.large.release(1.0)
+
+    assert job_manager.wait(job_id, timeout=5).status == SUCCEEDED
+    assert client.get(f'/jobs/{job_id}/result').data == client.get('/triangulation/big').data
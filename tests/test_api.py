@@ -13,15 +13,8 @@ import struct
 import pytest
 import requests
 from unittest.mock import patch, Mock
-from triangulator.triangulator import app
-
-
-@pytest.fixture
-def client():
-    """Fixture Flask pour simuler des requêtes HTTP."""
-    app.config['TESTING'] = True
-    with app.test_client() as client:
-        yield client
+from tests.conftest import psm_response
+from triangulator.triangulator import convex_hull
 
 
 # ============================================================================
@@ -54,10 +47,7 @@ def test_get_triangulation_success(mock_get, client):
     pointset_data += struct.pack('<dd', 1.0, 0.0)
     pointset_data += struct.pack('<dd', 0.0, 1.0)
 
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.content = pointset_data
-    mock_get.return_value = mock_response
+    mock_get.return_value = psm_response(pointset_data)
 
     response = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
     assert response.status_code == 200
@@ -118,11 +108,25 @@ def test_get_triangulation_returns_502_on_request_exception(mock_get, client):
     assert b'PointSetManager request failed' in response.data
 
 
+@patch('triangulator.triangulator.requests.get')
+def test_get_triangulation_returns_502_on_interrupted_body(mock_get, client):
+    """Corps interrompu après l'en-tête → 502"""
+    def chunks(chunk_size=1, **kwargs):
+        yield struct.pack('<I', 3)
+        raise requests.exceptions.ChunkedEncodingError("Connection broken")
+
+    mock_get.return_value = psm_response(b'')
+    mock_get.return_value.iter_content.side_effect = chunks
+    response = client.get('/triangulation/123')
+    assert response.status_code == 502
+    assert b'PointSetManager request failed' in response.data
+
+
 @patch('triangulator.triangulator.requests.get')
 def test_get_triangulation_with_empty_pointset_returns_200(mock_get, client):
     """PointSet vide (0 points) → 200"""
     empty = struct.pack('<I', 0)
-    mock_get.return_value = Mock(status_code=200, content=empty)
+    mock_get.return_value = psm_response(empty)
     response = client.get('/triangulation/123')
     assert response.status_code == 200
     assert len(response.data) > 0
@@ -134,7 +138,7 @@ def test_get_triangulation_with_two_points_returns_200(mock_get, client):
     pointset_data = struct.pack('<I', 2)
     pointset_data += struct.pack('<dd', 0.0, 0.0)
     pointset_data += struct.pack('<dd', 1.0, 0.0)
-    mock_get.return_value = Mock(status_code=200, content=pointset_data)
+    mock_get.return_value = psm_response(pointset_data)
     response = client.get('/triangulation/123')
     assert response.status_code == 200
     assert len(response.data) > 0
@@ -147,16 +151,17 @@ def test_get_triangulation_with_two_points_returns_200(mock_get, client):
 @patch('triangulator.triangulator.requests.get')
 def test_get_triangulation_decode_error_returns_400(mock_get, client):
     """Erreur lors de decode_pointset (ValueError) → 400"""
-    mock_get.return_value = Mock(status_code=200, content=b'SHORT')
+    mock_get.return_value = psm_response(b'SHORT')
     response = client.get('/triangulation/123')
     assert response.status_code == 400
     assert b'Invalid PointSet binary format' in response.data
 
 
 @patch('triangulator.triangulator.requests.get')
-def test_get_triangulation_decode_generic_exception_returns_400(mock_get, client):
+@patch('triangulator.triangulator.decode_pointset', side_effect=TypeError)
+def test_get_triangulation_decode_generic_exception_returns_400(mock_decode, mock_get, client):
     """Erreur générique lors de decode_pointset → 400"""
-    mock_get.return_value = Mock(status_code=200, content=None)
+    mock_get.return_value = psm_response(struct.pack('<I', 0))
     response = client.get('/triangulation/123')
     assert response.status_code == 400
 
@@ -174,7 +179,7 @@ def test_get_triangulation_triangulation_exception_returns_500(mock_triangulate,
     pointset_data += struct.pack('<dd', 1.0, 0.0)
     pointset_data += struct.pack('<dd', 0.0, 1.0)
     
-    mock_get.return_value = Mock(status_code=200, content=pointset_data)
+    mock_get.return_value = psm_response(pointset_data)
     mock_triangulate.side_effect = Exception("Triangulation error")
     
     response = client.get('/triangulation/123')
@@ -195,7 +200,7 @@ def test_get_triangulation_encode_valueerror_returns_400(mock_encode, mock_get,
     pointset_data += struct.pack('<dd', 1.0, 0.0)
     pointset_data += struct.pack('<dd', 0.0, 1.0)
     
-    mock_get.return_value = Mock(status_code=200, content=pointset_data)
+    mock_get.return_value = psm_response(pointset_data)
     mock_encode.side_effect = ValueError("Encoding error")
     
     response = client.get('/triangulation/123')
@@ -212,7 +217,7 @@ def test_get_triangulation_encode_generic_exception_returns_500(mock_encode, moc
     pointset_data += struct.pack('<dd', 1.0, 0.0)
     pointset_data += struct.pack('<dd', 0.0, 1.0)
     
-    mock_get.return_value = Mock(status_code=200, content=pointset_data)
+    mock_get.return_value = psm_response(pointset_data)
     mock_encode.side_effect = Exception("Generic encoding error")
     
     response = client.get('/triangulation/123')
@@ -244,7 +249,7 @@ def test_get_triangulation_returns_valid_binary_format(mock_get, client):
     pointset_data += struct.pack('<dd', 1.0, 1.0)
     pointset_data += struct.pack('<dd', 0.0, 1.0)
     
-    mock_get.return_value = Mock(status_code=200, content=pointset_data)
+    mock_get.return_value = psm_response(pointset_data)
     response = client.get('/triangulation/123')
     
     assert response.status_code == 200
@@ -264,7 +269,7 @@ def test_get_triangulation_with_collinear_points_returns_200(mock_get, client):
     pointset_data += struct.pack('<dd', 1.0, 0.0)
     pointset_data += struct.pack('<dd', 2.0, 0.0)
     
-    mock_get.return_value = Mock(status_code=200, content=pointset_data)
+    mock_get.return_value = psm_response(pointset_data)
     response = client.get('/triangulation/123')
     
     assert response.status_code == 200
@@ -273,4 +278,60 @@ def test_get_triangulation_with_collinear_points_returns_200(mock_get, client):
     from triangulator.triangulator import decode_triangles
     points, triangles = decode_triangles(response.data)
     assert len(points) == 3
-    assert len(triangles) == 0
\ No newline at end of file
+    assert len(triangles) == 0
+
+# ============================================================================
+# 9. Tests enveloppe convexe et cache des résultats
+# ============================================================================
+
+SQUARE_WITH_CENTER = struct.pack('<I', 5) + b''.join(
+    struct.pack('<dd', x, y)
+    for x, y in [(0.5, 0.5), (0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)]
+)
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_get_hull_returns_hull_indices(mock_get, client):
+    """/hull renvoie les indices de l'enveloppe encodés en binaire"""
+    from triangulator.triangulator import decode_hull
+    mock_get.return_value = psm_response(SQUARE_WITH_CENTER)
+    response = client.get('/hull/123')
+    assert response.status_code == 200
+    assert response.content_type == 'application/octet-stream'
+    assert decode_hull(response.data) == [1, 2, 3, 4]
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_get_hull_propagates_psm_errors(mock_get, client):
+    """/hull partage la gestion d'erreurs de /triangulation"""
+    mock_get.return_value = Mock(status_code=404)
+    assert client.get('/hull/missing').status_code == 404
+    mock_get.return_value = psm_response(b'SHORT')
+    assert client.get('/hull/bad').status_code == 400
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_results_are_cached_per_pointset(mock_get, client):
+    """Le PointSet n'est récupéré et l'enveloppe calculée qu'une fois"""
+    mock_get.return_value = psm_response(SQUARE_WITH_CENTER)
+    spy_hull = Mock(wraps=convex_hull)
+    # Le service l'appelle par son propre nom, la triangulation via geometry
+    with patch('triangulator.triangulator.convex_hull', spy_hull), \
+            patch('triangulator.geometry.convex_hull', spy_hull):
+        first = client.get('/triangulation/123')
+        second = client.get('/triangulation/123')
+        hull = client.get('/hull/123')
+    assert first.status_code == second.status_code == hull.status_code == 200
+    assert first.data == second.data
+    assert mock_get.call_count == 1
+    assert spy_hull.call_count == 1
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_failed_fetch_is_not_cached(mock_get, client):
+    """Une erreur du PSM n'est pas mise en cache"""
+    mock_get.side_effect = requests.Timeout("Timeout occurred")
+    assert client.get('/triangulation/123').status_code == 502
+    mock_get.side_effect = None
+    mock_get.return_value = psm_response(SQUARE_WITH_CENTER)
+    assert client.get('/triangulation/123').status_code == 200
@@ -0,0 +1,143 @@
+"""
+Tests de la triangulation hors ligne (triangulator.batch)
+
+Couvre:
+- Sélection des fichiers d'entrée et chemins de sortie
+- Triangulation d'un fichier (mmap, fichier vide, binaire invalide)
+- Traitement parallèle et ligne de commande
+"""
+
+import os
+
+import pytest
+from triangulator.batch import (
+    find_inputs,
+    main,
+    output_path,
+    run_batch,
+    triangulate_file,
+)
+from triangulator.codec import decode_triangles, encode_pointset
+
+SQUARE = [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)]
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """Répertoire de PointSets: deux valides, un invalide, un autre fichier."""
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.bin").write_bytes(encode_pointset(SQUARE))
+    (tmp_path / "sub" / "b.bin").write_bytes(encode_pointset(SQUARE[:3]))
+    (tmp_path / "broken.bin").write_bytes(b"\x05\x00\x00\x00")
+    (tmp_path / "notes.txt").write_text("pas un PointSet")
+    return tmp_path
+
+
+# ============================================================================
+# 1. Entrées et sorties
+# ============================================================================
+
+def test_find_inputs_walks_directories(archive):
+    """Répertoires parcourus récursivement, filtrés par motif"""
+    found = [os.path.relpath(p, archive) for p in find_inputs([str(archive)])]
+    assert found == ["a.bin", "broken.bin", os.path.join("sub", "b.bin")]
+
+
+def test_find_inputs_skips_previous_outputs(archive):
+    """Les résultats d'un traitement précédent ne sont pas repris"""
+    triangulate_file(str(archive / "a.bin"))
+    found = list(find_inputs([str(archive)]))
+    assert str(archive / "a.triangles.bin") not in found
+
+
+def test_output_path():
+    """Résultat à côté de l'entrée, ou dans le répertoire de sortie"""
+    assert output_path("/d/x.bin") == "/d/x.triangles.bin"
+    assert output_path("/d/x.bin", "/out") == "/out/x.triangles.bin"
+    assert output_path("/d/s/x.bin", "/out", "/d") == "/out/s/x.triangles.bin"
+
+
+# ============================================================================
+# 2. Triangulation d'un fichier
+# ============================================================================
+
+def test_triangulate_file_writes_triangles(archive):
+    """Le fichier Triangles écrit se relit avec decode_triangles"""
+    report = triangulate_file(str(archive / "a.bin"))
+    assert report["points"] == 4
+    assert report["triangles"] == 2
+    assert report["points_per_second"] > 0
+    assert report["peak_bytes"] >= len(
+        (archive / "a.triangles.bin").read_bytes()
+    )
+    vertices, triangles = decode_triangles(
+        (archive / "a.triangles.bin").read_bytes()
+    )
+    assert vertices == SQUARE
+    assert triangles == [(0, 1, 2), (0, 2, 3)]
+
+
+def test_triangulate_file_rejects_invalid_binaries(archive):
+    """Binaire tronqué ou fichier vide → ValueError, sans sortie partielle"""
+    (archive / "empty.bin").write_bytes(b"")
+    for name in ("broken", "empty"):
+        with pytest.raises(ValueError):
+            triangulate_file(str(archive / f"{name}.bin"))
+        assert not (archive / f"{name}.triangles.bin").exists()
+
+
+# ============================================================================
+# 3. Traitement par lots
+# ============================================================================
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch_reports_each_file(archive, tmp_path, workers):
+    """Chaque fichier a son rapport; les échecs n'interrompent pas le lot"""
+    out = tmp_path / "out"
+    paths = list(find_inputs([str(archive)]))
+    reports = run_batch(paths, output_dir=str(out), workers=workers)
+    by_name = {os.path.basename(r["path"]): r for r in reports}
+    assert by_name["a.bin"]["triangles"] == 2
+    assert by_name["b.bin"]["triangles"] == 1
+    assert "error" in by_name["broken.bin"]
+    assert sorted(os.listdir(out)) == ["a.triangles.bin", "sub"]
+    assert os.listdir(out / "sub") == ["b.triangles.bin"]
+
+
+def test_run_batch_mirrors_input_tree(archive, tmp_path):
+    """Fichiers homonymes dans des sous-répertoires: aucune sortie écrasée"""
+    (archive / "sub" / "a.bin").write_bytes(encode_pointset(SQUARE[:3]))
+    out = tmp_path / "out"
+    paths = [str(archive / "a.bin"), str(archive / "sub" / "a.bin")]
+    reports = run_batch(paths, output_dir=str(out), workers=1)
+    assert sorted(r["triangles"] for r in reports) == [1, 2]
+    assert len(decode_triangles((out / "a.triangles.bin").read_bytes())[1]) == 2
+    assert len(decode_triangles((out / "sub" / "a.triangles.bin").read_bytes())[1]) == 1
+
+
+def test_run_batch_fails_on_colliding_outputs(archive, tmp_path):
+    """Deux entrées pour une même sortie → toutes deux en échec, rien d'écrit"""
+    (archive / "a.dat").write_bytes(encode_pointset(SQUARE[:3]))
+    out = tmp_path / "out"
+    paths = [str(archive / "a.bin"), str(archive / "a.dat")]
+    reports = run_batch(paths, output_dir=str(out), workers=1)
+    assert all("commune à 2 entrées" in r["error"] for r in reports)
+    assert not out.exists()
+
+
+def test_run_batch_skips_existing_unless_forced(archive):
+    """Résultat existant: ignoré, sauf avec force"""
+    path = str(archive / "a.bin")
+    run_batch([path], workers=1)
+    assert run_batch([path], workers=1) == [{"path": path, "skipped": True}]
+    assert run_batch([path], workers=1, force=True)[0]["triangles"] == 2
+
+
+def test_main_returns_error_code_on_failure(archive, capsys):
+    """La CLI rapporte chaque fichier et échoue si l'un d'eux échoue"""
+    assert main([str(archive), "--workers", "1"]) == 1
+    out = capsys.readouterr()
+    assert out.out.count("OK") == 2
+    assert "ERREUR" in out.out
+    assert "2 fichiers triangulés, 1 en échec" in out.err
+    assert main([str(archive / "a.bin"), "--force"]) == 0
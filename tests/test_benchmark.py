@@ -0,0 +1,127 @@
+"""
+Tests du banc de mesure (triangulator.benchmark)
+
+Couvre:
+- Générateurs de distributions de points
+- Exécution d'un balayage réduit sur toutes les étapes
+- Enregistrement JSON et détection de régressions
+- Temps d'import à froid et isolation du cœur vis-à-vis de la couche web
+"""
+
+import json
+import random
+import subprocess
+import sys
+
+import pytest
+from triangulator.benchmark import (
+    DISTRIBUTIONS,
+    IMPORT_BUDGETS,
+    STAGES,
+    check_import,
+    find_regressions,
+    load_results,
+    main,
+    measure_import,
+    run_benchmark,
+    save_results,
+)
+
+
+@pytest.mark.parametrize("name", list(DISTRIBUTIONS))
+def test_distribution_generates_requested_size(name):
+    """Chaque distribution génère exactement n points, de façon reproductible"""
+    first = DISTRIBUTIONS[name](500, random.Random(1))
+    second = DISTRIBUTIONS[name](500, random.Random(1))
+    assert len(first) == 500
+    assert first == second
+
+
+def test_run_benchmark_covers_every_stage():
+    """Une mesure par (taille, distribution, étape), avec débit et mémoire"""
+    results = run_benchmark([50, 100], ["uniform", "grid"], STAGES, repeat=1)
+    assert len(results) == 2 * 2 * len(STAGES)
+    for r in results:
+        assert r["seconds"] > 0
+        assert r["points_per_second"] > 0
+        assert r["peak_bytes"] > 0
+
+
+def test_run_benchmark_without_memory():
+    """--no-memory: pas de mesure de pic mémoire"""
+    results = run_benchmark([10], ["duplicates"], ["http"], repeat=1, memory=False)
+    assert results[0]["peak_bytes"] is None
+
+
+def test_find_regressions_applies_tolerance():
+    """Seules les mesures plus lentes que référence × (1 + tolérance) sont signalées"""
+    base = {"stage": "triangulate", "distribution": "uniform", "size": 1000}
+    baseline = [{**base, "seconds": 1.0}]
+    assert find_regressions([{**base, "seconds": 1.1}], baseline, 0.2) == []
+    regressions = find_regressions([{**base, "seconds": 1.5}], baseline, 0.2)
+    assert len(regressions) == 1
+    assert regressions[0]["ratio"] == pytest.approx(1.5)
+    other = {**base, "size": 10, "seconds": 100.0}
+    assert find_regressions([other], baseline, 0.2) == []
+
+
+def test_save_and_load_results_roundtrip(tmp_path):
+    """Les mesures enregistrées en JSON sont relues à l'identique"""
+    results = run_benchmark([10], ["uniform"], ["decode_pointset"], repeat=1)
+    path = tmp_path / "bench.json"
+    save_results(str(path), results)
+    assert "environment" in json.loads(path.read_text())
+    assert load_results(str(path)) == results
+
+
+def test_main_flags_regression_against_baseline(tmp_path, capsys):
+    """La CLI retourne 1 si une mesure régresse par rapport à la référence"""
+    path = tmp_path / "baseline.json"
+    results = run_benchmark([10], ["uniform"], ["triangulate"], repeat=1)
+    save_results(str(path), [{**r, "seconds": 1e-12} for r in results])
+    args = [
+        "--sizes", "10", "--distributions", "uniform", "--stages", "triangulate",
+        "--repeat", "1", "--no-memory", "--baseline", str(path),
+    ]
+    assert main(args) == 1
+    assert "REGRESSION" in capsys.readouterr().err
+    assert main(args[:-2]) == 0
+
+
+@pytest.mark.parametrize("module", ["triangulator.codec", "triangulator.geometry"])
+def test_core_modules_do_not_load_web_layer(module):
+    """Le cœur s'importe sans Flask ni requests"""
+    result = measure_import(module, repeat=1)
+    assert result["web_modules"] == []
+
+
+def test_benchmark_module_defers_unittest_mock():
+    """Le banc ne charge unittest.mock que pour l'étape « http »"""
+    code = "import sys, triangulator.benchmark; print('unittest.mock' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True,
+    ).stdout
+    assert output.strip() == "False"
+
+
+def test_service_module_defers_http_client():
+    """Le module web ne charge requests qu'au premier appel au PointSetManager"""
+    result = measure_import("triangulator.triangulator", repeat=1)
+    assert "flask" in result["web_modules"]
+    assert "requests" not in result["web_modules"]
+
+
+def test_check_import_reports_budget_and_web_layer():
+    """Budget dépassé et couche web chargée sont signalés"""
+    result = {"module": "triangulator.codec", "seconds": 1.0, "budget": 0.05,
+              "web_modules": ["flask"]}
+    problems = check_import(result)
+    assert len(problems) == 2
+    assert check_import({**result, "seconds": 0.01, "web_modules": []}) == []
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("module", list(IMPORT_BUDGETS))
+def test_import_time_within_budget(module):
+    """Temps d'import à froid dans le budget"""
+    assert check_import(measure_import(module)) == []
@@ -11,21 +11,15 @@ Couvre:
 
 import struct
 import pytest
-from unittest.mock import patch, Mock
-from triangulator.triangulator import app, decode_pointset
+from unittest.mock import patch
+from tests.conftest import psm_response
+from triangulator.triangulator import decode_pointset
 from triangulator.triangulator import (
-    encode_pointset, decode_triangles, encode_triangles
+    encode_pointset, decode_triangles, encode_triangles, encode_hull, decode_hull,
+    read_point_count,
 )
 
 
-@pytest.fixture
-def client():
-    """Fixture Flask pour simuler des requêtes HTTP."""
-    app.config['TESTING'] = True
-    with app.test_client() as client:
-        yield client
-
-
 # ============================================================================
 # 1. TESTS DECODE_POINTSET - Direct (sans API)
 # ============================================================================
@@ -80,6 +74,16 @@ def test_decode_pointset_incomplete_point():
         decode_pointset(data)
 
 
+@pytest.mark.parametrize("point", [
+    (float('nan'), 0.0), (0.0, float('inf')), (float('-inf'), 1.0),
+])
+def test_decode_pointset_non_finite_coordinates(point):
+    """decode_pointset refuse nan et ±inf, avec l'indice du point"""
+    data = struct.pack('<I', 2) + struct.pack('<dd', 0.0, 0.0) + struct.pack('<dd', *point)
+    with pytest.raises(ValueError, match="non finie pour le point 1"):
+        decode_pointset(data)
+
+
 # ============================================================================
 # 2. TESTS ENCODE_POINTSET - Direct (sans API)
 # ============================================================================
@@ -271,7 +275,7 @@ def test_encode_triangles_with_invalid_vertices():
 @patch('triangulator.triangulator.requests.get')
 def test_api_binary_format_invalid_header_returns_400(mock_get, client):
     """API: données binaires trop courtes → 400"""
-    mock_get.return_value = Mock(status_code=200, content=b'\x00\x00')
+    mock_get.return_value = psm_response(b'\x00\x00')
     response = client.get('/triangulation/123')
     assert response.status_code == 400
 
@@ -280,7 +284,7 @@ def test_api_binary_format_invalid_header_returns_400(mock_get, client):
 def test_api_binary_format_corrupted_point_count_returns_400(mock_get, client):
     """API: nombre de points > données disponibles → 400"""
     corrupted = struct.pack('<I', 10) + struct.pack('<dd', 0.0, 0.0)
-    mock_get.return_value = Mock(status_code=200, content=corrupted)
+    mock_get.return_value = psm_response(corrupted)
     response = client.get('/triangulation/123')
     assert response.status_code == 400
 
@@ -289,7 +293,7 @@ def test_api_binary_format_corrupted_point_count_returns_400(mock_get, client):
 def test_api_binary_format_empty_pointset(mock_get, client):
     """API: PointSet vide → 200"""
     empty = struct.pack('<I', 0)
-    mock_get.return_value = Mock(status_code=200, content=empty)
+    mock_get.return_value = psm_response(empty)
     response = client.get('/triangulation/123')
     assert response.status_code == 200
 
@@ -298,7 +302,7 @@ def test_api_binary_format_empty_pointset(mock_get, client):
 def test_api_binary_format_single_point(mock_get, client):
     """API: PointSet avec 1 point → 200"""
     single = struct.pack('<I', 1) + struct.pack('<dd', 5.0, 10.0)
-    mock_get.return_value = Mock(status_code=200, content=single)
+    mock_get.return_value = psm_response(single)
     response = client.get('/triangulation/123')
     assert response.status_code == 200
 
@@ -309,6 +313,57 @@ def test_api_binary_format_rejects_extra_bytes(mock_get, client):
     data = struct.pack('<I', 1)
     data += struct.pack('<dd', 0.0, 0.0)
     data += b'\x00\x00\x00\x00'
-    mock_get.return_value = Mock(status_code=200, content=data)
+    mock_get.return_value = psm_response(data)
     response = client.get('/triangulation/123')
-    assert response.status_code == 400
\ No newline at end of file
+    assert response.status_code == 400
+
+
+# ============================================================================
+# 6. TESTS ENCODE_HULL / DECODE_HULL - Direct (sans API)
+# ============================================================================
+
+def test_hull_roundtrip():
+    """decode_hull(encode_hull(indices)) == indices"""
+    indices = [3, 0, 7, 2]
+    data = encode_hull(indices)
+    assert data == struct.pack('<5I', 4, 3, 0, 7, 2)
+    assert decode_hull(data) == indices
+
+
+def test_hull_empty():
+    """Enveloppe vide → header seul"""
+    assert encode_hull([]) == struct.pack('<I', 0)
+    assert decode_hull(struct.pack('<I', 0)) == []
+
+
+def test_encode_hull_rejects_negative_index():
+    """Indice négatif → ValueError"""
+    with pytest.raises(ValueError):
+        encode_hull([0, -1, 2])
+
+
+@pytest.mark.parametrize("data", [
+    b'\x01',
+    struct.pack('<I', 2) + struct.pack('<I', 0),
+    struct.pack('<I', 1) + struct.pack('<II', 0, 1),
+])
+def test_decode_hull_rejects_invalid_length(data):
+    """Longueur incohérente avec le header → ValueError"""
+    with pytest.raises(ValueError):
+        decode_hull(data)
+
+
+# ============================================================================
+# 7. TESTS READ_POINT_COUNT - Lecture de l'en-tête seul
+# ============================================================================
+
+def test_read_point_count_reads_header_only():
+    """Seul l'en-tête est lu, même si les données sont incomplètes"""
+    assert read_point_count(struct.pack('<I', 5_000_000)) == 5_000_000
+    assert read_point_count(struct.pack('<I', 1) + struct.pack('<dd', 1, 2)) == 1
+
+
+def test_read_point_count_rejects_short_header():
+    """Moins de 4 bytes → ValueError"""
+    with pytest.raises(ValueError):
+        read_point_count(b'\x01\x00')
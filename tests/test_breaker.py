@@ -0,0 +1,214 @@
+"""
+Tests du disjoncteur PointSetManager et du cache stale-while-revalidate
+
+Couvre:
+- Transitions du disjoncteur (ouverture, sonde, fermeture)
+- Échec immédiat (503) quand le PointSetManager est en panne
+- Entrées périmées servies puis revalidées en arrière-plan
+"""
+
+import struct
+
+import pytest
+import requests
+from unittest.mock import patch
+from tests.conftest import psm_response
+from triangulator import triangulator as service
+from triangulator.breaker import CLOSED, OPEN, PROBING, CircuitBreaker, CircuitOpen
+from triangulator.triangulator import result_cache
+
+
+SQUARE = struct.pack('<I', 4) + struct.pack('<8d', 0, 0, 1, 0, 1, 1, 0, 1)
+TRIANGLE = struct.pack('<I', 3) + struct.pack('<6d', 0, 0, 1, 0, 0, 1)
+
+
+def wait_revalidation():
+    """Attend la fin des revalidations en arrière-plan."""
+    service._revalidation_pool.submit(lambda: None).result(timeout=5)
+
+
+def age_entry(pointSetId, seconds):
+    """Vieillit artificiellement une entrée du cache."""
+    result_cache.get(pointSetId).fetched_at -= seconds
+
+
+# ============================================================================
+# 1. Disjoncteur
+# ============================================================================
+
+def test_breaker_opens_after_threshold():
+    """Ouverture après N échecs consécutifs, refus immédiat ensuite"""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpen) as exc:
+        breaker.before_call()
+    assert exc.value.retry_after >= 59
+
+
+def test_breaker_success_resets_failures():
+    """Un succès remet le compteur d'échecs à zéro"""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_breaker_trial_call_without_probe():
+    """Sans sonde, un appel d'essai passe après le délai et décide de l'état"""
+    changes = []
+    breaker = CircuitBreaker(1, reset_timeout=0, on_change=changes.append)
+    breaker.record_failure()
+    breaker.before_call()
+    assert breaker.state == PROBING
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert changes == [OPEN, PROBING, OPEN, PROBING, CLOSED]
+
+
+def test_breaker_probe_closes_or_reopens():
+    """La sonde ferme le circuit si elle réussit, le rouvre sinon"""
+    healthy = [False]
+    breaker = CircuitBreaker(1, reset_timeout=60, probe=lambda: healthy[0])
+    breaker.record_failure()
+    assert breaker.probe_now() is False
+    assert breaker.state == OPEN
+    healthy[0] = True
+    assert breaker.probe_now() is True
+    assert breaker.state == CLOSED
+
+
+# ============================================================================
+# 2. Intégration au service
+# ============================================================================
+
+@patch('triangulator.triangulator.requests.get')
+def test_fails_fast_when_circuit_open(mock_get, client):
+    """Après le seuil d'échecs, 503 sans appeler le PointSetManager"""
+    mock_get.side_effect = requests.Timeout()
+    for _ in range(service.BREAKER_FAILURE_THRESHOLD):
+        assert client.get('/triangulation/123').status_code == 502
+    calls = mock_get.call_count
+
+    response = client.get('/triangulation/123')
+    assert response.status_code == 503
+    assert int(response.headers['Retry-After']) >= 1
+    assert response.get_json()['error'] == "PointSetManager unavailable"
+    assert mock_get.call_count == calls
+    assert 'triangulator_upstream_circuit_open 1' in client.get('/metrics').text
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_not_found_does_not_open_circuit(mock_get, client):
+    """Les 404 sont des réponses normales, pas des pannes"""
+    mock_get.return_value = psm_response(b"", status=404)
+    for _ in range(service.BREAKER_FAILURE_THRESHOLD + 1):
+        assert client.get('/triangulation/123').status_code == 404
+    assert service.breaker.state == CLOSED
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_probe_recovers_circuit(mock_get, client):
+    """Une sonde réussie referme le circuit"""
+    mock_get.side_effect = requests.ConnectionError()
+    for _ in range(service.BREAKER_FAILURE_THRESHOLD):
+        client.get('/triangulation/123')
+    assert service.breaker.state == OPEN
+
+    mock_get.side_effect = None
+    mock_get.return_value = psm_response(b"", status=404)
+    assert service.breaker.probe_now() is True
+    mock_get.return_value = psm_response(SQUARE)
+    assert client.get('/triangulation/123').status_code == 200
+
+
+# ============================================================================
+# 3. Stale-while-revalidate
+# ============================================================================
+
+@patch('triangulator.triangulator.requests.get')
+def test_fresh_entry_is_a_hit(mock_get, client):
+    """Entrée fraîche: servie depuis le cache"""
+    mock_get.return_value = psm_response(SQUARE)
+    assert client.get('/triangulation/a').headers['X-Cache-Status'] == "miss"
+    response = client.get('/triangulation/a')
+    assert response.headers['X-Cache-Status'] == "hit"
+    assert 'Warning' not in response.headers
+    assert mock_get.call_count == 1
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_stale_entry_served_then_revalidated(mock_get, client):
+    """Entrée périmée: servie immédiatement, revalidée en arrière-plan"""
+    mock_get.return_value = psm_response(SQUARE)
+    first = client.get('/triangulation/a').data
+    age_entry('a', service.CACHE_TTL + 1)
+
+    response = client.get('/triangulation/a')
+    assert response.headers['X-Cache-Status'] == "stale"
+    assert response.headers['Warning'].startswith("110")
+    assert response.data == first
+
+    wait_revalidation()
+    assert mock_get.call_count == 2
+    assert client.get('/triangulation/a').headers['X-Cache-Status'] == "hit"
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_revalidation_picks_up_changed_pointset(mock_get, client):
+    """Binaire modifié: l'entrée est reconstruite"""
+    mock_get.return_value = psm_response(SQUARE)
+    client.get('/triangulation/a')
+    age_entry('a', service.CACHE_TTL + 1)
+    mock_get.return_value = psm_response(TRIANGLE)
+
+    client.get('/triangulation/a')
+    wait_revalidation()
+    assert len(result_cache.get('a').points) == 3
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_revalidation_evicts_deleted_pointset(mock_get, client):
+    """PointSet disparu: l'entrée est retirée du cache"""
+    mock_get.return_value = psm_response(SQUARE)
+    client.get('/triangulation/a')
+    age_entry('a', service.CACHE_TTL + 1)
+    mock_get.return_value = psm_response(b"", status=404)
+
+    client.get('/triangulation/a')
+    wait_revalidation()
+    assert result_cache.get('a') is None
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_stale_served_while_circuit_open(mock_get, client):
+    """PointSetManager en panne: l'entrée périmée est servie sans revalidation"""
+    mock_get.return_value = psm_response(SQUARE)
+    client.get('/triangulation/a')
+    age_entry('a', service.CACHE_TTL + 1)
+    for _ in range(service.BREAKER_FAILURE_THRESHOLD):
+        service.breaker.record_failure()
+    calls = mock_get.call_count
+
+    response = client.get('/triangulation/a')
+    assert response.status_code == 200
+    assert response.headers['X-Cache-Status'] == "stale"
+    wait_revalidation()
+    assert mock_get.call_count == calls
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_entry_too_old_is_refetched(mock_get, client):
+    """Au-delà de CACHE_MAX_STALE, l'entrée est recalculée"""
+    mock_get.return_value = psm_response(SQUARE)
+    client.get('/triangulation/a')
+    age_entry('a', service.CACHE_MAX_STALE + 1)
+    assert client.get('/triangulation/a').headers['X-Cache-Status'] == "miss"
+    assert mock_get.call_count == 2
+    assert result_cache.get('a').age() < 1
@@ -0,0 +1,153 @@
+"""
+Tests de la triangulation contrainte (triangulator.constrained)
+
+Couvre:
+- Format binaire des contraintes
+- Arêtes imposées, intérieur du bord, trous
+- Contraintes invalides (indices, polygones ouverts, arêtes sécantes)
+- Endpoint POST /triangulation/<id>/constrained
+"""
+
+import random
+
+import pytest
+from unittest.mock import patch
+from tests.conftest import psm_response
+from triangulator.codec import (
+    decode_constraints,
+    decode_triangles,
+    encode_constraints,
+    encode_pointset,
+)
+from triangulator.constrained import constrained_triangulation
+from triangulator.predicates import orient2d
+
+
+def area(points, triangles):
+    """Aire totale (orientée) des triangles."""
+    return sum(orient2d(*(points[v] for v in t)) / 2 for t in triangles)
+
+
+def cycle(indices):
+    """Arêtes du polygone fermé passant par `indices`."""
+    return list(zip(indices, indices[1:] + indices[:1], strict=True))
+
+
+# Parcelle concave (aire 70) percée d'un trou carré (aire 1), plus des
+# points intérieurs et extérieurs au domaine
+PARCEL = [(0.0, 0.0), (10.0, 0.0), (10.0, 10.0), (5.0, 4.0), (0.0, 10.0)]
+HOLE = [(2.0, 2.0), (3.0, 2.0), (3.0, 3.0), (2.0, 3.0)]
+POINTS = PARCEL + HOLE + [(5.0, 1.0), (8.0, 5.0), (5.0, 8.0), (2.5, 2.5)]
+BOUNDARY = cycle([0, 1, 2, 3, 4])
+HOLES = cycle([5, 6, 7, 8])
+
+
+# ============================================================================
+# 1. Format binaire
+# ============================================================================
+
+def test_constraints_roundtrip():
+    """Encodage puis décodage des arêtes du bord et des trous"""
+    data = encode_constraints(BOUNDARY, HOLES)
+    assert len(data) == 4 + 5 * 8 + 4 + 4 * 8
+    assert decode_constraints(data) == (BOUNDARY, HOLES)
+    assert decode_constraints(encode_constraints(BOUNDARY, [])) == (BOUNDARY, [])
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"\x01\x00\x00\x00",
+    encode_constraints(BOUNDARY, HOLES)[:-1],
+    encode_constraints(BOUNDARY, HOLES) + b"\x00",
+])
+def test_decode_constraints_rejects_corrupted_data(data):
+    """Binaire tronqué ou excédentaire → ValueError"""
+    with pytest.raises(ValueError):
+        decode_constraints(data)
+
+
+# ============================================================================
+# 2. Triangulation contrainte
+# ============================================================================
+
+def test_only_interior_triangles_are_kept():
+    """Triangles dans la parcelle, hors du trou, pavant exactement le domaine"""
+    triangles = constrained_triangulation(POINTS, BOUNDARY, HOLES)
+    assert all(orient2d(*(POINTS[v] for v in t)) > 0 for t in triangles)
+    assert area(POINTS, triangles) == pytest.approx(69.0)
+    used = {v for t in triangles for v in t}
+    assert 12 not in used
+    edges = {frozenset(e) for t in triangles for e in cycle(list(t))}
+    assert all(frozenset(e) in edges for e in BOUNDARY + HOLES)
+
+
+def test_point_on_a_boundary_edge_splits_it():
+    """Point exactement sur une arête du bord: l'arête passe par ce point"""
+    points = PARCEL + [(5.0, 0.0), (4.0, 6.0)]
+    triangles = constrained_triangulation(points, BOUNDARY, [])
+    assert area(points, triangles) == pytest.approx(70.0)
+    assert 5 in {v for t in triangles for v in t}
+
+
+def test_random_points_inside_domain():
+    """Points aléatoires: l'aire du domaine est toujours couverte"""
+    rng = random.Random(0)
+    points = POINTS + [(rng.uniform(0, 10), rng.uniform(0, 10)) for _ in range(300)]
+    triangles = constrained_triangulation(points, BOUNDARY, HOLES)
+    assert area(points, triangles) == pytest.approx(69.0)
+
+
+def test_collinear_points_give_no_triangle():
+    """Points colinéaires → aucun triangle"""
+    points = [(float(i), 0.0) for i in range(4)]
+    assert constrained_triangulation(points, cycle([0, 1, 2, 3]), []) == []
+
+
+@pytest.mark.parametrize("boundary, holes", [
+    ([], []),
+    (cycle([0, 1, 2, 3, 42]), []),
+    (BOUNDARY[:-1], []),
+    (BOUNDARY + [(0, 0)], []),
+    (BOUNDARY, cycle([0, 2, 3])[:2]),
+    (BOUNDARY, cycle([0, 2, 1, 3])),
+])
+def test_invalid_constraints_are_rejected(boundary, holes):
+    """Aucun bord, indice hors limites, polygone ouvert, arêtes sécantes"""
+    with pytest.raises(ValueError):
+        constrained_triangulation(POINTS, boundary, holes)
+
+
+# ============================================================================
+# 3. Intégration au service
+# ============================================================================
+
+@patch('triangulator.triangulator.requests.get')
+def test_constrained_endpoint(mock_get, client):
+    """Triangles intérieurs renvoyés avec tous les points, puis mis en cache"""
+    mock_get.return_value = psm_response(encode_pointset(POINTS))
+    body = encode_constraints(BOUNDARY, HOLES)
+    response = client.post('/triangulation/ps/constrained', data=body)
+    assert response.status_code == 200
+    vertices, triangles = decode_triangles(response.data)
+    assert vertices == POINTS
+    assert area(vertices, triangles) == pytest.approx(69.0)
+
+    again = client.post('/triangulation/ps/constrained', data=body)
+    assert again.data == response.data
+    assert again.headers['X-Cache-Status'] == "hit"
+    assert mock_get.call_count == 1
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_constrained_endpoint_errors(mock_get, client):
+    """Binaire invalide ou arêtes invalides pour ce PointSet → 400"""
+    mock_get.return_value = psm_response(encode_pointset(POINTS))
+    response = client.post('/triangulation/ps/constrained', data=b"\x01")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid constraints binary format"
+    mock_get.assert_not_called()
+
+    body = encode_constraints(cycle([0, 1, 99]), [])
+    response = client.post('/triangulation/ps/constrained', data=body)
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid constraints"
@@ -0,0 +1,145 @@
+"""
+Tests de la disponibilité de l'instance (/health)
+
+Couvre:
+- Rapport de capacité (calculs, jobs, cache, disjoncteur)
+- Passage à « non prête » au-delà des seuils configurés
+- Vivacité indépendante de la charge
+"""
+
+import threading
+
+import pytest
+from triangulator import triangulator as service
+from triangulator.admission import AdmissionController, JobClass
+from triangulator.jobs import JobManager
+
+
+@pytest.fixture
+def admission(monkeypatch):
+    """Contrôle d'admission du service, à files réduites."""
+    controller = AdmissionController(
+        100,
+        small=JobClass("small", 1, 4, queue_timeout=5),
+        large=JobClass("large", 1, 2, queue_timeout=5),
+    )
+    monkeypatch.setattr(service, 'admission', controller)
+    return controller
+
+
+def fill_queue(job_class, count):
+    """Occupe le créneau de `job_class` et met `count` calculs en attente."""
+    job_class.acquire()
+    waiters = [threading.Thread(target=job_class.acquire) for _ in range(count)]
+    for waiter in waiters:
+        waiter.start()
+    while job_class.snapshot()["queued"] < count:
+        threading.Event().wait(0.001)
+
+    def release():
+        for _ in range(count + 1):
+            job_class.release(0.0)
+        for waiter in waiters:
+            waiter.join(5)
+    return release
+
+
+# ============================================================================
+# 1. Rapport de capacité
+# ============================================================================
+
+def test_health_reports_capacity(client, admission):
+    """Instance au repos: prête, avec le détail de sa capacité"""
+    service.result_cache.put('a', service.PointSetEntry(points=[], hull=[]))
+    response = client.get('/health')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["status"] == "ok"
+    assert body["in_flight"] == 0
+    assert body["admission"]["large"]["max_queued"] == 2
+    assert body["cache"] == {
+        "entries": 1,
+        "max_entries": service.result_cache.max_entries,
+    }
+    assert body["upstream"]["state"] == "closed"
+    assert set(body["jobs"]) == {"workers", "running", "queued", "max_pending"}
+
+
+def test_health_counts_in_flight(client, admission):
+    """Calculs en cours comptés dans in_flight"""
+    admission.small.acquire()
+    try:
+        assert client.get('/health').get_json()["in_flight"] == 1
+    finally:
+        admission.small.release(0.0)
+
+
+# ============================================================================
+# 2. Seuils de disponibilité
+# ============================================================================
+
+def test_health_not_ready_when_large_queue_saturated(client, admission):
+    """File « large » trop remplie → 503 avec la raison"""
+    release = fill_queue(admission.large, 2)
+    try:
+        response = client.get('/health')
+        assert response.status_code == 503
+        body = response.get_json()
+        assert body["status"] == "not_ready"
+        assert body["reasons"] == ["large_queue_saturated"]
+        assert body["admission"]["large"]["queued"] == 2
+    finally:
+        release()
+    assert client.get('/health').status_code == 200
+
+
+def test_health_threshold_is_configurable(client, admission, monkeypatch):
+    """La fraction de file tolérée est réglable"""
+    release = fill_queue(admission.small, 2)
+    try:
+        assert client.get('/health').status_code == 200
+        monkeypatch.setattr(service, 'HEALTH_MAX_QUEUE_FILL', 0.25)
+        assert client.get('/health').get_json()["reasons"] == [
+            "small_queue_saturated"
+        ]
+    finally:
+        release()
+
+
+def test_health_not_ready_when_jobs_pile_up(client, tmp_path, monkeypatch):
+    """Trop de jobs en attente → non prête"""
+    manager = JobManager(str(tmp_path), workers=1)
+    monkeypatch.setattr(service, 'jobs', manager)
+    monkeypatch.setattr(service, 'HEALTH_MAX_JOBS_PENDING', 1)
+    release = threading.Event()
+    try:
+        for _ in range(2):
+            manager.submit('ps', lambda report: release.wait(5) and b"")
+        body = client.get('/health').get_json()
+        assert body["reasons"] == ["jobs_queue_saturated"]
+        assert body["jobs"]["running"] + body["jobs"]["queued"] == 2
+    finally:
+        release.set()
+        manager.shutdown()
+
+
+def test_circuit_open_only_fails_readiness_when_configured(client, monkeypatch):
+    """Disjoncteur ouvert: signalé, bloquant seulement si configuré"""
+    for _ in range(service.BREAKER_FAILURE_THRESHOLD):
+        service.breaker.record_failure()
+    response = client.get('/health')
+    assert response.status_code == 200
+    assert response.get_json()["upstream"]["state"] == "open"
+
+    monkeypatch.setattr(service, 'HEALTH_FAIL_ON_CIRCUIT_OPEN', True)
+    assert client.get('/health').get_json()["reasons"] == ["upstream_unavailable"]
+
+
+def test_liveness_ignores_load(client, admission):
+    """/health/live reste à 200 même saturée"""
+    release = fill_queue(admission.large, 2)
+    try:
+        assert client.get('/health').status_code == 503
+        assert client.get('/health/live').status_code == 200
+    finally:
+        release()
@@ -0,0 +1,180 @@
+"""
+Tests de l'API de jobs asynchrones
+
+Couvre:
+- Cycle de vie d'un job (soumission, progression, résultat)
+- Échecs (PointSetManager, erreurs internes) et codes HTTP associés
+- File de jobs bornée
+- Persistance sur disque et reprise après redémarrage
+"""
+
+import struct
+import threading
+
+import pytest
+from unittest.mock import Mock, patch
+from tests.conftest import psm_response
+from triangulator.jobs import FAILED, SUCCEEDED, JobFailed, JobManager
+from triangulator.triangulator import decode_triangles
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """Gestionnaire de jobs du service, stockant dans un répertoire temporaire."""
+    manager = JobManager(str(tmp_path), workers=1, max_pending=2)
+    monkeypatch.setattr('triangulator.triangulator.jobs', manager)
+    yield manager
+    manager.shutdown()
+
+
+SQUARE = struct.pack('<I', 4) + struct.pack('<8d', 0, 0, 1, 0, 1, 1, 0, 1)
+
+
+# ============================================================================
+# 1. Gestionnaire de jobs
+# ============================================================================
+
+def test_job_reports_progress_and_stores_result(tmp_path):
+    """Étapes rapportées, résultat écrit sur disque"""
+    manager = JobManager(str(tmp_path))
+    stages = []
+
+    def func(report):
+        report("step", 0.5)
+        stages.append(manager.get(job.jobId).stage)
+        return b"result"
+
+    job = manager.submit("ps", func)
+    done = manager.wait(job.jobId, timeout=5)
+    manager.shutdown()
+    assert stages == ["step"]
+    assert done.status == SUCCEEDED
+    assert done.progress == 1.0
+    assert done.resultSize == 6
+    assert open(manager.result_path(job.jobId), "rb").read() == b"result"
+
+
+def test_job_failure_keeps_http_status(tmp_path):
+    """JobFailed conserve le code HTTP; autre exception → 500"""
+    manager = JobManager(str(tmp_path))
+
+    def not_found(report):
+        raise JobFailed(404, {"error": "PointSet not found"})
+
+    def crash(report):
+        raise RuntimeError("boom")
+
+    first = manager.wait(manager.submit("a", not_found).jobId, timeout=5)
+    second = manager.wait(manager.submit("b", crash).jobId, timeout=5)
+    manager.shutdown()
+    assert (first.status, first.errorStatus) == (FAILED, 404)
+    assert (second.status, second.errorStatus) == (FAILED, 500)
+    assert manager.result_path(first.jobId) is None
+
+
+def test_jobs_survive_restart(tmp_path):
+    """Un nouveau gestionnaire relit les jobs terminés; un job interrompu est en échec"""
+    manager = JobManager(str(tmp_path))
+    job = manager.wait(manager.submit("ps", lambda report: b"abc").jobId, timeout=5)
+    manager.shutdown()
+
+    restarted = JobManager(str(tmp_path))
+    assert restarted.get(job.jobId).status == SUCCEEDED
+    assert restarted.result_path(job.jobId) is not None
+
+    interrupted = job.jobId[:-1] + ("0" if job.jobId[-1] != "0" else "1")
+    (tmp_path / f"{interrupted}.json").write_text(
+        f'{{"jobId": "{interrupted}", "pointSetId": "ps", "status": "running"}}'
+    )
+    assert restarted.get(interrupted).status == FAILED
+    assert restarted.get("../etc/passwd") is None
+
+
+# ============================================================================
+# 2. API HTTP
+# ============================================================================
+
+@patch('triangulator.triangulator.requests.get')
+def test_job_api_lifecycle(mock_get, client, manager):
+    """POST /jobs → 202, GET /jobs/<id> → état, GET result → Triangles"""
+    mock_get.return_value = psm_response(SQUARE)
+    response = client.post('/jobs', json={"pointSetId": "123"})
+    assert response.status_code == 202
+    job_id = response.get_json()["jobId"]
+    assert response.headers["Location"] == f"/jobs/{job_id}"
+
+    manager.wait(job_id, timeout=5)
+    status = client.get(f'/jobs/{job_id}').get_json()
+    assert status["status"] == "succeeded"
+    assert status["progress"] == 1.0
+
+    result = client.get(f'/jobs/{job_id}/result')
+    assert result.status_code == 200
+    assert result.content_type == 'application/octet-stream'
+    points, triangles = decode_triangles(result.data)
+    assert len(points) == 4
+    assert len(triangles) == 2
+    assert result.data == client.get('/triangulation/123').data
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_job_api_result_not_ready_returns_409(mock_get, client, manager):
+    """Résultat demandé avant la fin du job → 409"""
+    release = threading.Event()
+
+    def slow_fetch(*args, **kwargs):
+        release.wait(5)
+        return psm_response(SQUARE)
+
+    mock_get.side_effect = slow_fetch
+    job_id = client.post('/jobs', json={"pointSetId": "123"}).get_json()["jobId"]
+    try:
+        response = client.get(f'/jobs/{job_id}/result')
+        assert response.status_code == 409
+        assert response.get_json()["status"] in ("queued", "running")
+    finally:
+        release.set()
+    manager.wait(job_id, timeout=5)
+    assert client.get(f'/jobs/{job_id}/result').status_code == 200
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_job_api_failed_job_returns_step_status(mock_get, client, manager):
+    """PointSet introuvable → job en échec, résultat en 404"""
+    mock_get.return_value = Mock(status_code=404)
+    job_id = client.post('/jobs', json={"pointSetId": "missing"}).get_json()["jobId"]
+    manager.wait(job_id, timeout=5)
+    assert client.get(f'/jobs/{job_id}').get_json()["status"] == "failed"
+    response = client.get(f'/jobs/{job_id}/result')
+    assert response.status_code == 404
+    assert response.get_json()["error"] == "PointSet not found"
+
+
+@pytest.mark.parametrize("body", [None, {}, {"pointSetId": 12}, ["123"]])
+def test_job_api_rejects_invalid_body(client, manager, body):
+    """Corps sans pointSetId valide → 400"""
+    assert client.post('/jobs', json=body).status_code == 400
+
+
+def test_job_api_unknown_job_returns_404(client, manager):
+    """Job inconnu → 404"""
+    assert client.get('/jobs/0123abcd').status_code == 404
+    assert client.get('/jobs/0123abcd/result').status_code == 404
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_job_api_queue_full_returns_503(mock_get, client, manager):
+    """Au-delà de max_pending jobs non terminés → 503"""
+    release = threading.Event()
+
+    def slow_fetch(*args, **kwargs):
+        release.wait(5)
+        return psm_response(SQUARE)
+
+    mock_get.side_effect = slow_fetch
+    try:
+        assert client.post('/jobs', json={"pointSetId": "a"}).status_code == 202
+        assert client.post('/jobs', json={"pointSetId": "b"}).status_code == 202
+        assert client.post('/jobs', json={"pointSetId": "c"}).status_code == 503
+    finally:
+        release.set()
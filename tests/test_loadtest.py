@@ -0,0 +1,126 @@
+"""
+Tests du banc de charge (triangulator.loadtest)
+
+Couvre:
+- PointSetManager simulé (PointSets reproductibles, erreurs injectées)
+- Rapport (percentiles, taux d'erreur, issues du cache)
+- Charge de bout en bout sur le service démarré localement
+"""
+
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+from triangulator.codec import decode_pointset
+from triangulator.loadtest import (
+    FakePointSetManager,
+    local_service,
+    main,
+    percentile,
+    pointset_ids,
+    run_load,
+    summarize,
+)
+
+
+def fetch(url):
+    """Statut et corps d'un GET (erreurs HTTP comprises)."""
+    try:
+        with urllib.request.urlopen(url, timeout=10) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+# ============================================================================
+# 1. PointSetManager simulé
+# ============================================================================
+
+def test_fake_manager_serves_generated_pointsets():
+    """PointSet de la taille demandée, identique d'un appel à l'autre"""
+    with FakePointSetManager(points=50) as manager:
+        status, body = fetch(f"{manager.url}/pointsets/abc/binary")
+        assert status == 200
+        assert len(decode_pointset(body)) == 50
+        assert fetch(f"{manager.url}/pointsets/abc/binary")[1] == body
+        assert fetch(f"{manager.url}/pointsets/xyz/binary")[1] != body
+        assert fetch(f"{manager.url}/autre")[0] == 404
+        assert manager.served == 3
+
+
+def test_fake_manager_injects_errors():
+    """error_rate=1: toutes les requêtes en 503; identifiant nul introuvable"""
+    with FakePointSetManager(points=10, error_rate=1.0) as manager:
+        assert fetch(f"{manager.url}/pointsets/abc/binary")[0] == 503
+        nil = "00000000-0000-0000-0000-000000000000"
+        assert fetch(f"{manager.url}/pointsets/{nil}/binary")[0] == 404
+        assert manager.injected_errors == 1
+
+
+def test_fake_manager_rejects_invalid_settings():
+    """Distribution inconnue ou taux d'erreur hors de [0, 1] → ValueError"""
+    with pytest.raises(ValueError):
+        FakePointSetManager(distribution="spiral")
+    with pytest.raises(ValueError):
+        FakePointSetManager(error_rate=1.5)
+
+
+# ============================================================================
+# 2. Rapport
+# ============================================================================
+
+def test_percentile_nearest_rank():
+    """Percentile par rang le plus proche"""
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile(values, 1.0) == 100.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_summarize_counts_errors_and_cache():
+    """Erreurs HTTP et réseau comptées, issues du cache réparties"""
+    samples = [(0.01, 200, "miss"), (0.02, 200, "hit"), (0.03, 502, None),
+               (0.04, 0, None)]
+    summary = summarize(samples, 2.0)
+    assert summary["requests"] == 4
+    assert summary["requests_per_second"] == 2.0
+    assert summary["error_rate"] == 0.5
+    assert summary["latency"]["p50"] == 0.02
+    assert summary["latency"]["max"] == 0.04
+    assert summary["statuses"] == {"0": 1, "200": 2, "502": 1}
+    assert summary["cache"] == {"-": 2, "hit": 1, "miss": 1}
+
+
+# ============================================================================
+# 3. Charge de bout en bout
+# ============================================================================
+
+def test_load_on_local_service():
+    """Toutes les requêtes aboutissent; chaque PointSet calculé, puis en cache"""
+    ids = pointset_ids(3)
+    assert ids == pointset_ids(3)
+    with FakePointSetManager(points=200) as manager, \
+            local_service(manager.url) as url:
+        summary = run_load(url, ids, requests=60, concurrency=4)
+    assert summary["requests"] == 60
+    assert summary["statuses"] == {"200": 60}
+    assert summary["error_rate"] == 0.0
+    assert summary["cache"]["hit"] >= 60 - 4 * len(ids)
+    assert 3 <= manager.served <= 4 * len(ids)
+    assert summary["latency"]["p50"] <= summary["latency"]["p99"]
+
+
+def test_main_reports_and_enforces_error_rate(tmp_path, capsys):
+    """Rapport JSON écrit; seuil de taux d'erreur dépassé → code 1"""
+    output = tmp_path / "load.json"
+    args = ["--points", "50", "--pointsets", "2", "--requests", "20",
+            "--concurrency", "2", "--output", str(output)]
+    assert main(args) == 0
+    report = json.loads(output.read_text())
+    assert report["requests"] == 20
+    assert report["upstream"]["injected_errors"] == 0
+    assert "req/s" in capsys.readouterr().out
+
+    assert main(args + ["--error-rate", "1", "--max-error-rate", "0.5"]) == 1
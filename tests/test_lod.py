@@ -0,0 +1,119 @@
+"""
+Tests des niveaux de détail (triangulator.lod)
+
+Couvre:
+- Arrondi des budgets par niveau
+- Décimation par grille (budget respecté, points d'origine conservés)
+- Paramètres maxVertices/maxTriangles de /triangulation et cache par niveau
+"""
+
+import random
+
+import pytest
+from unittest.mock import patch
+from tests.conftest import psm_response, uniform
+from triangulator.codec import decode_triangles, encode_pointset
+from triangulator import lod
+from triangulator.lod import decimate, level_budget
+from triangulator.triangulator import result_cache
+
+
+def clustered(n, seed=0):
+    """`n` points répartis en quelques amas gaussiens."""
+    rng = random.Random(seed)
+    centers = [(rng.random(), rng.random()) for _ in range(5)]
+    return [
+        (rng.gauss(cx, 0.01), rng.gauss(cy, 0.01))
+        for cx, cy in (rng.choice(centers) for _ in range(n))
+    ]
+
+
+# ============================================================================
+# 1. Budgets et décimation
+# ============================================================================
+
+def test_level_budget_rounds_down_to_power_of_two():
+    """Budgets arrondis à la puissance de deux inférieure"""
+    assert [level_budget(n) for n in (4, 5, 100, 128, 1000)] == [4, 4, 64, 128, 512]
+    with pytest.raises(ValueError):
+        level_budget(3)
+
+
+@pytest.mark.parametrize("points", [uniform(5000), clustered(5000)])
+@pytest.mark.parametrize("budget", [4, 64, 1024])
+def test_decimate_respects_budget(points, budget):
+    """Au plus `budget` indices, croissants et distincts"""
+    kept = decimate(points, budget)
+    assert 0 < len(kept) <= budget
+    assert kept == sorted(set(kept))
+    assert 0 <= kept[0] and kept[-1] < len(points)
+
+
+def test_decimate_keeps_the_shape():
+    """Les points conservés couvrent toujours le nuage"""
+    kept = decimate(uniform(5000), 256)
+    assert len(kept) > 128
+    xs = [uniform(5000)[i][0] for i in kept]
+    assert min(xs) < 0.1 and max(xs) > 0.9
+
+
+def test_decimate_degenerate_inputs():
+    """Peu de points, points confondus ou alignés"""
+    assert decimate([(0.0, 0.0), (1.0, 1.0)], 4) == [0, 1]
+    assert decimate([(1.0, 1.0)] * 10, 4) == [0]
+    assert len(decimate([(float(i), 0.0) for i in range(100)], 8)) <= 8
+
+
+@pytest.mark.parametrize("height", [0.0, 1e-9, 1e-300])
+def test_decimate_thin_pointsets_in_few_passes(height):
+    """Nuage très allongé: peu de passes sur les points, budget respecté"""
+    rng = random.Random(0)
+    points = [(rng.random() * 1e6, rng.random() * height) for _ in range(20_000)]
+    with patch('triangulator.lod._cells', wraps=lod._cells) as cells:
+        kept = decimate(points, 4)
+    assert 0 < len(kept) <= 4
+    assert cells.call_count <= 12
+
+
+# ============================================================================
+# 2. Intégration au service
+# ============================================================================
+
+@patch('triangulator.triangulator.requests.get')
+def test_level_of_detail_endpoint(mock_get, client):
+    """Triangulation décimée bien plus petite, calculée une fois par niveau"""
+    points = uniform(2000)
+    mock_get.return_value = psm_response(encode_pointset(points))
+    full = client.get('/triangulation/ps')
+    overview = client.get('/triangulation/ps?maxVertices=100')
+    assert overview.status_code == 200
+    vertices, triangles = decode_triangles(overview.data)
+    assert len(vertices) <= 64
+    assert set(vertices) <= set(points)
+    assert len(overview.data) * 20 < len(full.data)
+
+    assert client.get('/triangulation/ps?maxTriangles=70').data == overview.data
+    assert list(result_cache.get('ps').variants) == [("lod", 64)]
+    assert mock_get.call_count == 1
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_level_of_detail_larger_than_pointset(mock_get, client):
+    """Budget supérieur au nombre de points → triangulation complète"""
+    points = uniform(50)
+    mock_get.return_value = psm_response(encode_pointset(points))
+    response = client.get('/triangulation/ps?maxVertices=1000')
+    assert response.data == client.get('/triangulation/ps').data
+    assert result_cache.get('ps').variants == {}
+
+
+@pytest.mark.parametrize("query, error", [
+    ("maxVertices=3", "Invalid level of detail parameters"),
+    ("maxTriangles=abc", "Invalid level of detail parameters"),
+    ("maxVertices=64&refine=true", "Invalid triangulation options"),
+])
+def test_level_of_detail_rejects_invalid_parameters(client, query, error):
+    """Budget invalide, ou combiné au raffinement → 400"""
+    response = client.get(f'/triangulation/ps?{query}')
+    assert response.status_code == 400
+    assert response.get_json()["error"] == error
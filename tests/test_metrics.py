@@ -0,0 +1,148 @@
+"""
+Tests des métriques et de l'instrumentation par étape
+
+Couvre:
+- Compteurs, jauges et histogrammes (format d'exposition texte)
+- Endpoint /metrics
+- Histogrammes par étape, tailles de payload, compteurs par code HTTP
+- En-tête Server-Timing
+"""
+
+import struct
+
+import pytest
+import requests
+from unittest.mock import Mock, patch
+from tests.conftest import psm_response
+from triangulator.metrics import CONTENT_TYPE, Registry
+
+
+TRIANGLE = struct.pack('<I', 3) + struct.pack('<6d', 0, 0, 1, 0, 0, 1)
+
+
+# ============================================================================
+# 1. Registre de métriques
+# ============================================================================
+
+def test_counter_and_gauge_rendering():
+    """Compteurs et jauges, avec et sans étiquettes"""
+    registry = Registry()
+    hits = registry.counter("hits_total", "Hits.", ["code"])
+    busy = registry.gauge("busy", "Busy.")
+    hits.labels(200).inc()
+    hits.labels(200).inc(2)
+    hits.labels(404).inc()
+    busy.inc()
+    busy.inc()
+    busy.dec()
+    text = registry.render()
+    assert "# TYPE hits_total counter" in text
+    assert 'hits_total{code="200"} 3' in text
+    assert 'hits_total{code="404"} 1' in text
+    assert "# TYPE busy gauge" in text
+    assert "\nbusy 1\n" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    """Intervalles cumulés, +Inf, somme et nombre"""
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value)
+    text = registry.render()
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 3' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "latency_seconds_sum 4.25" in text
+    assert "latency_seconds_count 4" in text
+
+
+def test_label_values_are_escaped():
+    """Guillemets, antislash et retours à la ligne échappés"""
+    registry = Registry()
+    registry.counter("c", "C.", ["v"]).labels('a"b\\c\nd').inc()
+    assert 'c{v="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+
+def test_registry_rejects_duplicates_and_wrong_label_count():
+    """Nom déjà déclaré ou nombre d'étiquettes incorrect → ValueError"""
+    registry = Registry()
+    counter = registry.counter("c", "C.", ["a"])
+    with pytest.raises(ValueError):
+        registry.counter("c", "C.")
+    with pytest.raises(ValueError):
+        counter.labels("x", "y")
+
+
+# ============================================================================
+# 2. Instrumentation du service
+# ============================================================================
+
+@patch('triangulator.triangulator.requests.get')
+def test_metrics_endpoint_reports_stages_and_payloads(mock_get, client):
+    """Chaque étape et chaque payload apparaissent dans /metrics"""
+    mock_get.return_value = psm_response(TRIANGLE)
+    assert client.get('/triangulation/123').status_code == 200
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type == CONTENT_TYPE
+    text = response.get_data(as_text=True)
+    for name in ("fetch", "decode", "hull", "triangulate", "encode"):
+        assert f'triangulator_stage_duration_seconds_count{{stage="{name}"}} 1' in text
+    assert 'triangulator_payload_size_bytes_sum{kind="pointset"} 52' in text
+    assert 'triangulator_payload_size_bytes_count{kind="triangles"} 1' in text
+    assert (
+        'triangulator_http_responses_total'
+        '{endpoint="/triangulation/<pointSetId>",status="200"} 1'
+    ) in text
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_error_responses_are_counted_by_status(mock_get, client):
+    """Les erreurs sont comptées par code HTTP"""
+    mock_get.side_effect = requests.Timeout("Timeout occurred")
+    client.get('/triangulation/a')
+    client.get('/triangulation/b')
+    mock_get.side_effect = None
+    mock_get.return_value = Mock(status_code=404)
+    client.get('/triangulation/c')
+    client.get('/unknown')
+
+    text = client.get('/metrics').get_data(as_text=True)
+    endpoint = 'endpoint="/triangulation/<pointSetId>"'
+    assert f'triangulator_http_responses_total{{{endpoint},status="502"}} 2' in text
+    assert f'triangulator_http_responses_total{{{endpoint},status="404"}} 1' in text
+    assert 'triangulator_http_responses_total{endpoint="unmatched",status="404"} 1' in text
+    # Le fetch en échec est tout de même chronométré
+    assert 'triangulator_stage_duration_seconds_count{stage="fetch"} 3' in text
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_in_flight_gauge_returns_to_zero(mock_get, client):
+    """La jauge des requêtes en cours revient à 0, y compris après une erreur"""
+    mock_get.return_value = psm_response(TRIANGLE)
+    client.get('/triangulation/123')
+    with patch('triangulator.triangulator.triangulate', side_effect=Exception):
+        client.get('/triangulation/456')
+
+    text = client.get('/metrics').get_data(as_text=True)
+    assert (
+        'triangulator_http_requests_in_flight'
+        '{endpoint="/triangulation/<pointSetId>"} 0'
+    ) in text
+    # La requête /metrics elle-même est en cours pendant le rendu
+    assert 'triangulator_http_requests_in_flight{endpoint="/metrics"} 1' in text
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_server_timing_header_lists_stages(mock_get, client):
+    """Server-Timing détaille les étapes exécutées pour la requête"""
+    mock_get.return_value = psm_response(TRIANGLE)
+    first = client.get('/triangulation/123')
+    names = [part.split(';')[0] for part in first.headers['Server-Timing'].split(', ')]
+    assert names == ["fetch", "decode", "hull", "triangulate", "encode", "total"]
+
+    # Réponse servie depuis le cache: aucune étape de calcul
+    second = client.get('/triangulation/123')
+    assert second.headers['Server-Timing'].startswith('total;dur=')
@@ -0,0 +1,267 @@
+"""
+Tests du pipeline fusionné (triangulator.pipeline)
+
+Couvre:
+- Même binaire que decode_pointset → triangulate → encode_triangles
+- Binaires invalides
+- Borne de la mémoire de travail
+- Utilisation par le service (seuil, en-tête de pic mémoire, points et
+  enveloppe calculés à la demande)
+"""
+
+import math
+import tracemalloc
+
+import pytest
+from unittest.mock import patch
+from tests.conftest import psm_response, uniform
+from triangulator import pipeline
+from triangulator import triangulator as service
+from triangulator.codec import (
+    decode_pointset,
+    decode_hull,
+    decode_triangles,
+    encode_pointset,
+    encode_triangles,
+)
+from triangulator.batch import triangulate_file
+from triangulator.geometry import convex_hull, spans_area, triangulate
+from triangulator.pipeline import peak_bytes, triangle_count, triangulate_pointset
+from triangulator.triangulator import result_cache
+
+
+# Mémoire des objets propres à une requête, indépendante de la taille du PointSet
+REQUEST_OVERHEAD_BYTES = 64 * 1024
+
+
+def classic(data):
+    """Binaire Triangles produit par les étapes séparées du service."""
+    points = decode_pointset(data)
+    return encode_triangles(triangulate(points, convex_hull(points)), points)
+
+
+POINTSETS = {
+    "vide": [],
+    "un point": [(1.0, 2.0)],
+    "deux points": [(0.0, 0.0), (1.0, 1.0)],
+    "alignés": [(float(i), 2.0 * i) for i in range(10)],
+    "confondus": [(1.0, 1.0)] * 5,
+    "doublons en tête": [(0.0, 0.0), (0.0, 0.0), (1.0, 0.0), (0.0, 1.0)],
+    "alignés puis un point": [(float(i), 0.0) for i in range(10)] + [(0.5, 1.0)],
+    "uniformes": uniform(1000),
+    # Produits arrondis à zéro ou débordants: décidés en arithmétique exacte
+    "sous-normaux": [(5e-324, 1e-300), (-0.0, 1e-300), (3.0, 0.0)],
+    "très grands alignés": [(-1e308, 0.2), (1e308, 0.2), (0.3, 0.2)],
+    "zéros signés": [(0.0, 0.0), (-0.0, 0.0), (1.0, -0.0), (2.0, 0.0)],
+    "quasi alignés": [(0.5, 0.5), (12.0, 12.0), (24.0, 24.0),
+                      (0.5 + 2.0 ** -53, 0.5)],
+    # Coordonnées non finies: refusées par tous les chemins
+    "nan et inf": [(2.0, math.nan), (2.0, math.nan), (1.0, -math.inf)],
+    "inf seul": [(0.0, 0.0), (1.0, 0.0), (math.inf, 1.0)],
+}
+
+
+def outcome(function, *args):
+    """Résultat de `function(*args)`, ou ValueError si elle la lève."""
+    try:
+        return function(*args)
+    except ValueError:
+        return ValueError
+
+
+# ============================================================================
+# 1. Équivalence avec les étapes séparées
+# ============================================================================
+
+@pytest.mark.parametrize("points", POINTSETS.values(), ids=POINTSETS.keys())
+def test_same_binary_as_separate_stages(points):
+    """Même binaire, avec ou sans enveloppe déjà calculée"""
+    data = encode_pointset(points)
+    expected = outcome(classic, data)
+    assert outcome(triangulate_pointset, data) == expected
+    assert outcome(triangle_count, data) == (
+        ValueError if expected is ValueError else len(triangulate(points))
+    )
+    if expected is ValueError:
+        return
+    assert triangulate_pointset(data, convex_hull(points)) == expected
+    # Équivalence garantie pour les PointSets acceptés au décodage
+    assert spans_area(points) == (len(convex_hull(points)) >= 3)
+
+
+def test_blocks_of_indices(monkeypatch):
+    """Éventail écrit en plusieurs blocs, dont un dernier incomplet"""
+    monkeypatch.setattr(pipeline, 'CHUNK_TRIANGLES', 7)
+    data = encode_pointset(uniform(100))
+    assert triangulate_pointset(data) == classic(data)
+
+
+def test_accepts_buffers():
+    """bytearray et memoryview acceptés comme bytes"""
+    data = encode_pointset(uniform(50))
+    assert triangulate_pointset(bytearray(data)) == classic(data)
+    assert triangulate_pointset(memoryview(data)) == classic(data)
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"\x01\x00",
+    b"\x02\x00\x00\x00" + b"\x00" * 16,
+    encode_pointset([(0.0, 0.0)]) + b"\x00",
+])
+def test_invalid_binaries(data):
+    """Binaire tronqué ou de longueur incohérente → ValueError"""
+    with pytest.raises(ValueError):
+        triangulate_pointset(data)
+
+
+def test_non_finite_coordinate_found_in_any_block(monkeypatch):
+    """Coordonnée non finie dans un bloc quelconque; grandes valeurs acceptées"""
+    monkeypatch.setattr(pipeline, 'CHUNK_TRIANGLES', 7)
+    points = [(1e308, -1e308)] * 20
+    assert triangulate_pointset(encode_pointset(points)) == classic(
+        encode_pointset(points)
+    )
+    points[16] = (0.0, math.nan)
+    with pytest.raises(ValueError, match="non finie pour le point 16"):
+        triangulate_pointset(encode_pointset(points))
+
+
+# ============================================================================
+# 2. Mémoire de travail
+# ============================================================================
+
+def test_peak_memory_within_bound():
+    """Pic mesuré par tracemalloc sous la borne annoncée, bien sous l'ancien"""
+    data = encode_pointset(uniform(50_000))
+    tracemalloc.start()
+    try:
+        triangulate_pointset(data)
+        _, fused = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        classic(data)
+        _, separate = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert fused <= peak_bytes(data)
+    assert fused * 5 < separate
+
+
+# ============================================================================
+# 3. Intégration au service
+# ============================================================================
+
+@patch('triangulator.triangulator.requests.get')
+def test_service_uses_pipeline_above_threshold(mock_get, client, monkeypatch):
+    """Même réponse, borne du pic mémoire rapportée, triangles calculés à la demande"""
+    points = uniform(500)
+    data = encode_pointset(points)
+    mock_get.return_value = psm_response(data)
+    monkeypatch.setattr(service, 'FUSED_PIPELINE_THRESHOLD', 100)
+
+    response = client.get('/triangulation/ps')
+    assert response.status_code == 200
+    assert response.data == classic(data)
+    peak = int(response.headers['X-Triangulator-Peak-Memory-Bound'])
+    assert peak >= len(data) + peak_bytes(data)
+    timing = response.headers['Server-Timing']
+    assert 'pipeline;dur=' in timing
+    assert 'decode;' not in timing and 'hull;' not in timing
+    entry = result_cache.get('ps')
+    assert (entry.points, entry.hull, entry.triangles, entry.pointset) == (
+        None, None, None, None
+    )
+
+    window = client.get('/triangulation/ps?bbox=0,0,0.5,0.5')
+    assert window.status_code == 200
+    assert decode_triangles(window.data)[1]
+    assert result_cache.get('ps').triangles == triangulate(points)
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_hull_and_variants_computed_on_demand(mock_get, client, monkeypatch):
+    """Points et enveloppe décodés depuis le binaire Triangles en cache"""
+    points = uniform(500)
+    mock_get.return_value = psm_response(encode_pointset(points))
+    monkeypatch.setattr(service, 'FUSED_PIPELINE_THRESHOLD', 100)
+    assert client.get('/triangulation/ps').status_code == 200
+
+    hull = client.get('/hull/ps')
+    assert hull.status_code == 200
+    assert decode_hull(hull.data) == convex_hull(points)
+    assert 'decode;' in hull.headers['Server-Timing']
+    assert result_cache.get('ps').points == points
+
+    lod = client.get('/triangulation/ps?maxVertices=100')
+    assert lod.status_code == 200
+    assert len(decode_triangles(lod.data)[0]) <= 100
+    assert mock_get.call_count == 1
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_cold_hull_above_threshold(mock_get, client, monkeypatch):
+    """/hull d'un PointSet absent du cache: décodé depuis le binaire reçu"""
+    points = uniform(500)
+    mock_get.return_value = psm_response(encode_pointset(points))
+    monkeypatch.setattr(service, 'FUSED_PIPELINE_THRESHOLD', 100)
+    assert decode_hull(client.get('/hull/ps').data) == convex_hull(points)
+
+    response = client.get('/triangulation/ps')
+    assert response.data == classic(encode_pointset(points))
+    assert 'pipeline;dur=' in response.headers['Server-Timing']
+    assert result_cache.get('ps').pointset is None
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_reported_peak_covers_the_request(mock_get, monkeypatch):
+    """Pic mesuré par tracemalloc sur toute la requête, sous la borne rapportée"""
+    data = encode_pointset(uniform(50_000))
+    mock_get.return_value = psm_response(data)
+    monkeypatch.setattr(service, 'FUSED_PIPELINE_THRESHOLD', 100)
+    with service.app.test_request_context():
+        service._triangulation_response('warm')
+
+    with service.app.test_request_context():
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            response = service._triangulation_response('ps')
+            _, measured = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    # Marge fixe pour les objets de la requête (contexte, métriques, simulacres)
+    reported = int(response.headers['X-Triangulator-Peak-Memory-Bound'])
+    assert measured - before <= reported + REQUEST_OVERHEAD_BYTES
+    assert measured - before > peak_bytes(data) + REQUEST_OVERHEAD_BYTES
+
+
+@pytest.mark.parametrize("points", POINTSETS.values(), ids=POINTSETS.keys())
+@patch('triangulator.triangulator.requests.get')
+def test_api_and_batch_return_the_same_binary(mock_get, points, client, tmp_path):
+    """Différentiel: API (étapes séparées ou pipeline) et lot, même binaire"""
+    data = encode_pointset(points)
+    mock_get.return_value = psm_response(data)
+    separate = client.get('/triangulation/separate')
+    with patch.object(service, 'FUSED_PIPELINE_THRESHOLD', 0):
+        fused = client.get('/triangulation/fused')
+    path = tmp_path / "ps.bin"
+    path.write_bytes(data)
+    batch = outcome(triangulate_file, str(path))
+
+    if batch is ValueError:
+        assert separate.status_code == fused.status_code == 400
+        assert 'non finie' in separate.get_json()['details']
+        assert 'non finie' in fused.get_json()['details']
+        return
+    assert 'triangulate;dur=' in separate.headers['Server-Timing']
+    assert 'pipeline;dur=' in fused.headers['Server-Timing']
+    assert separate.data == fused.data == (tmp_path / "ps.triangles.bin").read_bytes()
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_service_below_threshold_keeps_separate_stages(mock_get, client):
+    """Petit PointSet: étapes séparées, pas d'en-tête de borne mémoire"""
+    mock_get.return_value = psm_response(encode_pointset(uniform(50)))
+    response = client.get('/triangulation/ps')
+    assert 'X-Triangulator-Peak-Memory-Bound' not in response.headers
+    assert 'triangulate;dur=' in response.headers['Server-Timing']
@@ -0,0 +1,162 @@
+"""
+Tests des prédicats géométriques robustes
+
+Couvre:
+- Signe d'orient2d / incircle sur des cas simples
+- Exactitude sur des configurations quasi dégénérées (comparaison à Fraction)
+- Indépendance vis-à-vis de l'échelle des coordonnées
+- Coordonnées non finies
+"""
+
+import math
+import random
+from fractions import Fraction
+
+import pytest
+from unittest.mock import patch
+from triangulator.geometry import convex_hull
+from triangulator.predicates import incircle, orient2d
+from triangulator.triangulator import triangulate
+
+
+def exact_orient2d(a, b, c):
+    ax, ay, bx, by, cx, cy = map(Fraction, (*a, *b, *c))
+    return (ax - cx) * (by - cy) - (ay - cy) * (bx - cx)
+
+
+def exact_incircle(a, b, c, d):
+    dx, dy = Fraction(d[0]), Fraction(d[1])
+    rows = [(Fraction(p[0]) - dx, Fraction(p[1]) - dy) for p in (a, b, c)]
+    (adx, ady), (bdx, bdy), (cdx, cdy) = rows
+    return (
+        (adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+        + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+        + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady)
+    )
+
+
+def sign(value):
+    return (value > 0) - (value < 0)
+
+
+# ============================================================================
+# 1. ORIENT2D
+# ============================================================================
+
+def test_orient2d_simple_orientations():
+    """Sens trigonométrique > 0, horaire < 0, colinéaire == 0"""
+    assert orient2d((0, 0), (1, 0), (0, 1)) > 0
+    assert orient2d((0, 0), (0, 1), (1, 0)) < 0
+    assert orient2d((0, 0), (1, 1), (2, 2)) == 0
+
+
+def test_orient2d_fast_path_skips_exact_arithmetic():
+    """Un cas non dégénéré ne passe pas par l'arithmétique exacte"""
+    with patch('triangulator.predicates._orient2d_exact') as mock_exact:
+        assert orient2d((0.0, 0.0), (1.0, 0.0), (0.0, 1.0)) == 1.0
+    mock_exact.assert_not_called()
+
+
+def test_orient2d_near_degenerate_grid_is_exact():
+    """Grille de points à quelques ulp d'une droite (exemple de Kettner)"""
+    q, r = (12.0, 12.0), (24.0, 24.0)
+    ulp = 2.0 ** -53
+    for i in range(32):
+        for j in range(32):
+            p = (0.5 + i * ulp, 0.5 + j * ulp)
+            assert sign(orient2d(p, q, r)) == sign(exact_orient2d(p, q, r))
+
+
+@pytest.mark.parametrize("scale", [1e-150, 1e-7, 1.0, 1e9, 1e150])
+def test_orient2d_is_scale_independent(scale):
+    """Le signe ne dépend pas d'un seuil absolu"""
+    random.seed(7)
+    for _ in range(200):
+        a = (random.random() * scale, random.random() * scale)
+        b = (random.random() * scale, random.random() * scale)
+        t = random.random()
+        c = (a[0] + t * (b[0] - a[0]), a[1] + t * (b[1] - a[1]))
+        assert sign(orient2d(a, b, c)) == sign(exact_orient2d(a, b, c))
+
+
+def test_orient2d_underflowing_products_are_exact():
+    """Produit sous-normal arrondi à zéro: même signe pour chaque rotation"""
+    a, b, c = (5e-324, 1e-300), (-0.0, 1e-300), (3.0, 0.0)
+    expected = sign(exact_orient2d(a, b, c))
+    assert expected == 1
+    for p, q, r in [(a, b, c), (b, c, a), (c, a, b)]:
+        assert sign(orient2d(p, q, r)) == expected
+        assert sign(orient2d(r, q, p)) == -expected
+
+
+def test_orient2d_overflowing_products_are_exact():
+    """Différences infinies pour des coordonnées finies → évaluation exacte"""
+    a, b, c = (-1e308, 0.2), (1e308, 0.2), (0.3, 0.2)
+    assert orient2d(a, b, c) == 0.0
+    assert orient2d(a, b, (0.3, 0.25)) > 0
+    assert convex_hull([a, b, c]) == [0, 1]
+
+
+def test_orient2d_non_finite_coordinates():
+    """Coordonnées non finies: pas d'exception"""
+    assert math.isnan(orient2d((0, 0), (1, 1), (math.nan, 2)))
+
+
+# ============================================================================
+# 2. INCIRCLE
+# ============================================================================
+
+def test_incircle_simple_positions():
+    """Intérieur > 0, extérieur < 0, cocirculaire == 0"""
+    a, b, c = (1.0, 0.0), (0.0, 1.0), (-1.0, 0.0)
+    assert incircle(a, b, c, (0.0, 0.0)) > 0
+    assert incircle(a, b, c, (2.0, 2.0)) < 0
+    assert incircle(a, b, c, (0.0, -1.0)) == 0
+
+
+def test_incircle_overflowing_products_are_exact():
+    """Résultat flottant non fini pour des coordonnées finies → exact"""
+    a, b, c = (1e200, 0.0), (0.0, 1e200), (-1e200, 0.0)
+    assert incircle(a, b, c, (0.0, 0.0)) > 0
+    assert incircle(a, b, c, (0.0, -1e200)) == 0
+    assert incircle(a, b, c, (3e200, 3e200)) < 0
+
+
+@pytest.mark.parametrize("exponent", [-78, -80, -155, -160])
+def test_incircle_tiny_coordinates_are_exact(exponent):
+    """Produits de degré 4 sous les flottants normaux: signe exact"""
+    rng = random.Random(exponent)
+    for _ in range(2000):
+        scale = 10.0 ** (exponent + rng.uniform(-1, 1))
+        a, b, c, d = [
+            (rng.uniform(-1, 1) * scale, rng.uniform(-1, 1) * scale)
+            for _ in range(4)
+        ]
+        assert sign(incircle(a, b, c, d)) == sign(exact_incircle(a, b, c, d))
+
+
+def test_incircle_near_cocircular_is_exact():
+    """Points à quelques ulp du cercle circonscrit"""
+    a, b, c = (1.0, 0.0), (0.0, 1.0), (-1.0, 0.0)
+    ulp = 2.0 ** -52
+    for i in range(-16, 17):
+        for j in range(-16, 17):
+            d = (i * ulp, -1.0 + j * ulp)
+            assert sign(incircle(a, b, c, d)) == sign(exact_incircle(a, b, c, d))
+
+
+# ============================================================================
+# 3. INTÉGRATION AVEC LA TRIANGULATION
+# ============================================================================
+
+def test_triangulate_small_scale_points_are_not_collinear():
+    """L'ancien seuil absolu 1e-12 rejetait les petites échelles"""
+    points = [(0.0, 0.0), (1e-7, 0.0), (0.0, 1e-7)]
+    assert triangulate(points) == [(0, 1, 2)]
+
+
+def test_triangulate_large_scale_collinear_points():
+    """Points colinéaires à grande échelle → aucun triangle"""
+    points = [(i * 1e12 + 0.5, i * 3e12 + 1.5) for i in range(5)]
+    assert all(exact_orient2d(points[0], points[1], p) == 0 for p in points)
+    assert triangulate(points) == []
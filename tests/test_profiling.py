@@ -0,0 +1,170 @@
+"""
+Tests du profilage à la demande
+
+Couvre:
+- Sélection des requêtes profilées (interrupteur, en-tête, échantillonnage)
+- Contenu d'une capture (profil, mémoire, PointSet, métadonnées)
+- Rotation des captures et rejeu hors ligne
+- Endpoint d'administration /admin/profiling
+"""
+
+import json
+import os
+import struct
+
+import pytest
+from unittest.mock import Mock, patch
+from tests.conftest import psm_response
+from triangulator.profiling import Profiler, replay
+from triangulator.triangulator import profiler
+
+
+@pytest.fixture
+def enabled_profiler(tmp_path, monkeypatch):
+    """Profileur du service activé, écrivant dans un répertoire temporaire."""
+    monkeypatch.setattr(profiler, "output_dir", str(tmp_path))
+    monkeypatch.setattr(profiler, "enabled", True)
+    monkeypatch.setattr(profiler, "sample_rate", 0.0)
+    return profiler
+
+
+SQUARE = struct.pack('<I', 4) + struct.pack('<8d', 0, 0, 1, 0, 1, 1, 0, 1)
+PROFILE = {'X-Triangulator-Profile': '1'}
+
+
+# ============================================================================
+# 1. Sélection des requêtes
+# ============================================================================
+
+def test_profiler_disabled_by_default(tmp_path):
+    """Désactivé: aucune capture, même demandée"""
+    assert Profiler(str(tmp_path)).start("id", requested=True) is None
+
+
+def test_profiler_sampling(tmp_path):
+    """Activé: requêtes demandées toujours, autres selon le taux"""
+    p = Profiler(str(tmp_path), enabled=True, sample_rate=0.0)
+    assert p.start("id") is None
+    with p.start("id", requested=True):
+        pass
+    p.configure({"sample_rate": 1.0})
+    with p.start("id"):
+        pass
+
+
+def test_profiler_allows_one_capture_at_a_time(tmp_path):
+    """Une requête arrivant pendant une capture n'est pas profilée"""
+    p = Profiler(str(tmp_path), enabled=True)
+    with p.start("a", requested=True):
+        assert p.start("b", requested=True) is None
+    with p.start("c", requested=True):
+        pass
+
+
+@pytest.mark.parametrize("settings", [
+    {"enabled": "yes"},
+    {"sample_rate": 1.5},
+    {"sample_rate": True},
+    {"max_captures": 0},
+    {"unknown": 1},
+])
+def test_profiler_rejects_invalid_settings(tmp_path, settings):
+    """Paramètres invalides → ValueError, configuration inchangée"""
+    p = Profiler(str(tmp_path))
+    with pytest.raises(ValueError):
+        p.configure(settings)
+    assert p.settings()["enabled"] is False
+
+
+# ============================================================================
+# 2. Captures
+# ============================================================================
+
+def test_capture_files_and_replay(tmp_path):
+    """Une capture contient profil, mémoire, PointSet et métadonnées rejouables"""
+    p = Profiler(str(tmp_path), enabled=True)
+    with p.start("pointset-1", requested=True) as capture:
+        capture.input_data = SQUARE
+        sum(range(1000))
+    capture.status = 200
+    path = capture.save()
+
+    assert sorted(os.listdir(path)) == [
+        "memory.txt", "meta.json", "pointset.bin", "profile.pstats"
+    ]
+    meta = json.loads(open(os.path.join(path, "meta.json")).read())
+    assert meta["pointSetId"] == "pointset-1"
+    assert meta["status"] == 200
+    assert meta["input_bytes"] == len(SQUARE)
+    assert "triangulate" in replay(path)
+
+
+def test_captures_are_pruned(tmp_path):
+    """Seules les max_captures captures les plus récentes sont conservées"""
+    p = Profiler(str(tmp_path), enabled=True, max_captures=2)
+    ids = []
+    for _ in range(3):
+        with p.start("id", requested=True) as capture:
+            pass
+        capture.save()
+        ids.append(capture.id)
+    assert p.captures() == ids[1:]
+
+
+# ============================================================================
+# 3. Intégration avec le service
+# ============================================================================
+
+@patch('triangulator.triangulator.requests.get')
+def test_profiled_request_bypasses_cache_and_saves_capture(
+    mock_get, client, enabled_profiler
+):
+    """Requête profilée: recalcul complet, capture enregistrée et référencée"""
+    mock_get.return_value = psm_response(SQUARE)
+    plain = client.get('/triangulation/123')
+    assert 'X-Triangulator-Profile-Id' not in plain.headers
+
+    profiled = client.get('/triangulation/123', headers=PROFILE)
+    assert profiled.status_code == 200
+    assert profiled.data == plain.data
+    assert mock_get.call_count == 2
+
+    capture_id = profiled.headers['X-Triangulator-Profile-Id']
+    assert enabled_profiler.captures() == [capture_id]
+    path = os.path.join(enabled_profiler.output_dir, capture_id)
+    assert open(os.path.join(path, "pointset.bin"), "rb").read() == SQUARE
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_profiled_request_records_error_status(mock_get, client, enabled_profiler):
+    """Une requête en erreur est aussi capturée, avec son statut"""
+    mock_get.return_value = Mock(status_code=404)
+    response = client.get('/triangulation/missing', headers=PROFILE)
+    assert response.status_code == 404
+    path = os.path.join(
+        enabled_profiler.output_dir, response.headers['X-Triangulator-Profile-Id']
+    )
+    assert json.loads(open(os.path.join(path, "meta.json")).read())["status"] == 404
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_profile_header_ignored_when_disabled(mock_get, client):
+    """Profilage désactivé: l'en-tête est sans effet"""
+    mock_get.return_value = psm_response(SQUARE)
+    response = client.get('/triangulation/123', headers=PROFILE)
+    assert 'X-Triangulator-Profile-Id' not in response.headers
+
+
+def test_admin_profiling_toggle(client, enabled_profiler):
+    """GET/PUT /admin/profiling"""
+    response = client.put('/admin/profiling', json={"enabled": False})
+    assert response.status_code == 200
+    assert response.get_json()["enabled"] is False
+    assert response.get_json()["captures"] == []
+
+    response = client.put('/admin/profiling', json={"sample_rate": 2})
+    assert response.status_code == 400
+    response = client.put('/admin/profiling', data="not json")
+    assert response.status_code == 400
+
+    assert client.get('/admin/profiling').get_json()["sample_rate"] == 0.0
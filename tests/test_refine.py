@@ -0,0 +1,135 @@
+"""
+Tests du raffinement de maillage (triangulator.refine)
+
+Couvre:
+- Triangulation de Delaunay (orientation, adjacences, cercle vide)
+- Raffinement: angle minimal, aire maximale, plafond de points insérés
+- Mode raffiné de /triangulation (paramètres, cache par variante)
+"""
+
+import math
+
+import pytest
+from unittest.mock import patch
+from tests.conftest import psm_response, uniform
+from triangulator.codec import decode_triangles, encode_pointset
+from triangulator.predicates import incircle, orient2d
+from triangulator.refine import delaunay, min_angle, refine
+from triangulator.triangulator import result_cache
+
+
+def area(points, triangles):
+    """Aire totale (orientée) des triangles."""
+    return sum(orient2d(*(points[v] for v in t)) / 2 for t in triangles)
+
+
+def worst_angle(points, triangles):
+    """Plus petit angle de la triangulation, en degrés."""
+    return min(min_angle(*(points[v] for v in t)) for t in triangles)
+
+
+# Rectangle très allongé: la triangulation brute n'a que des triangles aplatis
+SLIVERS = [(0.0, 0.0), (10.0, 0.0), (10.0, 0.5), (0.0, 0.5), (5.0, 0.25)]
+
+
+# ============================================================================
+# 1. Triangulation de Delaunay
+# ============================================================================
+
+@pytest.mark.parametrize("points", [
+    uniform(200),
+    [(float(x), float(y)) for x in range(6) for y in range(6)],
+    [(math.cos(i / 5), math.sin(i / 5)) for i in range(31)],
+])
+def test_delaunay_is_valid(points):
+    """Triangles directs, pavant l'enveloppe, cercles circonscrits vides"""
+    triangles = delaunay(points)
+    assert all(orient2d(*(points[v] for v in t)) > 0 for t in triangles)
+    for t in triangles:
+        a, b, c = (points[v] for v in t)
+        assert all(incircle(a, b, c, p) <= 0 for p in points)
+
+
+def test_delaunay_degenerate_inputs():
+    """Moins de 3 points distincts ou points colinéaires → aucun triangle"""
+    assert delaunay([(0.0, 0.0), (1.0, 1.0)]) == []
+    assert delaunay([(float(i), 2.0 * i) for i in range(10)]) == []
+    assert delaunay([(0.0, 0.0)] * 3 + [(1.0, 0.0)]) == []
+
+
+# ============================================================================
+# 2. Raffinement
+# ============================================================================
+
+def test_refine_enforces_min_angle():
+    """Les triangles aplatis disparaissent, l'aire couverte est conservée"""
+    vertices, triangles = refine(SLIVERS, min_angle=20)
+    assert vertices[:len(SLIVERS)] == SLIVERS
+    assert worst_angle(vertices, triangles) >= 20
+    assert area(vertices, triangles) == pytest.approx(5.0)
+
+
+def test_refine_enforces_max_area():
+    """Aucun triangle au-delà de max_area"""
+    points = uniform(50, seed=1)
+    vertices, triangles = refine(points, min_angle=0, max_area=0.001)
+    assert max(abs(area(vertices, [t])) for t in triangles) <= 0.001
+    assert area(vertices, triangles) == pytest.approx(area(points, delaunay(points)))
+
+
+def test_refine_caps_inserted_points():
+    """Qualité inaccessible: le nombre de points insérés reste plafonné"""
+    vertices, triangles = refine(uniform(100), min_angle=40, max_points=25)
+    assert len(vertices) <= 125
+    assert triangles
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"min_angle": -1},
+    {"min_angle": 60},
+    {"max_area": 0},
+    {"max_points": -1},
+])
+def test_refine_rejects_invalid_parameters(kwargs):
+    """Paramètres hors bornes → ValueError"""
+    with pytest.raises(ValueError):
+        refine(SLIVERS, **kwargs)
+
+
+# ============================================================================
+# 3. Intégration au service
+# ============================================================================
+
+@patch('triangulator.triangulator.requests.get')
+def test_refined_triangulation_endpoint(mock_get, client):
+    """Maillage raffiné renvoyé, puis servi depuis le cache de l'entrée"""
+    mock_get.return_value = psm_response(encode_pointset(SLIVERS))
+    url = '/triangulation/ps?refine=true&minAngle=25&maxPoints=500'
+    response = client.get(url)
+    assert response.status_code == 200
+    vertices, triangles = decode_triangles(response.data)
+    assert vertices[:len(SLIVERS)] == SLIVERS
+    assert len(vertices) > len(SLIVERS)
+    assert worst_angle(vertices, triangles) >= 25
+
+    assert client.get(url).data == response.data
+    plain = client.get('/triangulation/ps')
+    assert decode_triangles(plain.data)[0] == SLIVERS
+    assert len(result_cache.get('ps').variants) == 1
+    assert mock_get.call_count == 1
+
+
+@pytest.mark.parametrize("query", [
+    "minAngle=abc",
+    "minAngle=75",
+    "maxArea=0",
+    "maxPoints=-1",
+    "maxPoints=1000000",
+])
+def test_refined_triangulation_rejects_invalid_parameters(client, query):
+    """Paramètres de raffinement invalides → 400 sans appel au PointSetManager"""
+    with patch('triangulator.triangulator.requests.get') as mock_get:
+        response = client.get(f'/triangulation/ps?refine=true&{query}')
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid refinement parameters"
+    mock_get.assert_not_called()
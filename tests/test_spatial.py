@@ -0,0 +1,113 @@
+"""
+Tests du réordonnancement le long d'une courbe (triangulator.spatial)
+
+Couvre:
+- Rangs de Hilbert et de Morton (cases voisines, entrelacement des bits)
+- Permutation des points et localité du parcours
+- Triangulation réordonnée, dans les indices d'origine
+- Option SPATIAL_ORDER du service
+"""
+
+import pytest
+from unittest.mock import patch
+from tests.conftest import psm_response, uniform
+from triangulator import triangulator as service
+from triangulator.codec import decode_triangles, encode_pointset
+from triangulator.geometry import convex_hull
+from triangulator.predicates import orient2d
+from triangulator.spatial import (
+    CURVES,
+    curve_keys,
+    curve_order,
+    hilbert_index,
+    morton_index,
+    triangulate_along,
+)
+
+
+def path_length(points, order):
+    """Longueur du chemin parcourant les points dans l'ordre donné."""
+    return sum(
+        ((points[a][0] - points[b][0]) ** 2 + (points[a][1] - points[b][1]) ** 2) ** 0.5
+        for a, b in zip(order, order[1:])
+    )
+
+
+# ============================================================================
+# 1. Rangs le long des courbes
+# ============================================================================
+
+def test_hilbert_visits_neighbouring_cells():
+    """Deux rangs consécutifs de Hilbert sont deux cases adjacentes"""
+    cells = sorted(
+        ((x, y) for x in range(32) for y in range(32)),
+        key=lambda c: hilbert_index(*c),
+    )
+    assert [hilbert_index(*c) for c in cells] == list(range(32 * 32))
+    for (x0, y0), (x1, y1) in zip(cells, cells[1:]):
+        assert abs(x1 - x0) + abs(y1 - y0) == 1
+
+
+def test_morton_interleaves_bits():
+    """Bit i de x → bit 2i, bit i de y → bit 2i+1"""
+    assert morton_index(0b11, 0) == 0b0101
+    assert morton_index(0, 0b11) == 0b1010
+    assert morton_index(0xFFFF, 0xFFFF) == 2**32 - 1
+
+
+def test_unknown_curve():
+    """Courbe inconnue → ValueError"""
+    with pytest.raises(ValueError):
+        curve_keys([(0.0, 0.0)], "peano")
+
+
+# ============================================================================
+# 2. Ordre de parcours
+# ============================================================================
+
+@pytest.mark.parametrize("curve", CURVES)
+def test_order_is_a_local_permutation(curve):
+    """Chaque point une fois, chemin bien plus court que l'ordre d'origine"""
+    points = uniform(5000)
+    order = curve_order(points, curve)
+    assert sorted(order) == list(range(len(points)))
+    assert path_length(points, order) * 10 < path_length(points, range(len(points)))
+
+
+def test_order_of_degenerate_inputs():
+    """Aucun point, points confondus"""
+    assert list(curve_order([])) == []
+    assert list(curve_order([(1.0, 1.0)] * 3)) == [0, 1, 2]
+
+
+# ============================================================================
+# 3. Triangulation réordonnée
+# ============================================================================
+
+@pytest.mark.parametrize("curve", CURVES)
+def test_triangles_use_original_indices(curve):
+    """Triangles non dégénérés, désignant les points d'origine"""
+    points = uniform(300)
+    order = curve_order(points, curve)
+    triangles = triangulate_along(points, curve, convex_hull(points))
+    assert len(triangles) == len(points) - 2
+    assert triangles[0][0] == order[0]
+    assert {v for t in triangles for v in t} == set(range(len(points)))
+    assert all(orient2d(*(points[v] for v in t)) != 0 for t in triangles[:10])
+
+
+# ============================================================================
+# 4. Intégration au service
+# ============================================================================
+
+@patch('triangulator.triangulator.requests.get')
+def test_spatial_order_option(mock_get, client, monkeypatch):
+    """SPATIAL_ORDER: même sommets, triangles issus du parcours de la courbe"""
+    points = uniform(200)
+    mock_get.return_value = psm_response(encode_pointset(points))
+    monkeypatch.setattr(service, 'SPATIAL_ORDER', 'hilbert')
+    response = client.get('/triangulation/ps')
+    assert response.status_code == 200
+    vertices, triangles = decode_triangles(response.data)
+    assert vertices == points
+    assert triangles == triangulate_along(points, 'hilbert')
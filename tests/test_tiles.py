@@ -0,0 +1,153 @@
+"""
+Tests des requêtes par fenêtre (triangulator.tiles)
+
+Couvre:
+- Intersection exacte triangle / fenêtre
+- Index des tuiles: mêmes résultats qu'un parcours exhaustif
+- Paramètre bbox de /triangulation (réindexation, index construit une fois)
+"""
+
+import random
+
+import pytest
+from unittest.mock import patch
+from tests.conftest import psm_response, uniform
+from triangulator import triangulator as service
+from triangulator.codec import decode_triangles, encode_pointset
+from triangulator.geometry import triangulate
+from triangulator.refine import delaunay
+from triangulator.tiles import TileIndex, intersects
+from triangulator.triangulator import result_cache
+
+
+TRIANGLE = [(0.0, 0.0), (4.0, 0.0), (0.0, 4.0)]
+
+
+# ============================================================================
+# 1. Intersection triangle / fenêtre
+# ============================================================================
+
+@pytest.mark.parametrize("window, expected", [
+    ((1.0, 1.0, 2.0, 2.0), True),      # fenêtre dans le triangle
+    ((-1.0, -1.0, 5.0, 5.0), True),    # triangle dans la fenêtre
+    ((2.0, 2.0, 3.0, 3.0), True),      # coin posé sur l'hypoténuse
+    ((2.5, 2.5, 3.0, 3.0), False),     # au-delà de l'hypoténuse
+    ((5.0, 0.0, 6.0, 1.0), False),     # boîtes disjointes
+])
+def test_intersects(window, expected):
+    """Boîtes englobantes puis arêtes du triangle, bornes incluses"""
+    assert intersects(TRIANGLE, (0, 1, 2), window) is expected
+    assert intersects(TRIANGLE, (0, 2, 1), window) is expected
+
+
+# ============================================================================
+# 2. Index des tuiles
+# ============================================================================
+
+@pytest.mark.parametrize("build", [delaunay, triangulate])
+def test_query_matches_exhaustive_scan(build):
+    """Mêmes triangles qu'un test de chacun d'eux, maillage ou éventail"""
+    points = uniform(3000)
+    triangles = build(points)
+    index = TileIndex(points, triangles)
+    rng = random.Random(1)
+    for _ in range(20):
+        x, y = rng.random(), rng.random()
+        window = (x, y, x + rng.random() / 5, y + rng.random() / 5)
+        expected = [t for t, tri in enumerate(triangles)
+                    if intersects(points, tri, window)]
+        assert index.query(window) == expected
+
+
+def test_fan_triangles_keep_the_index_small():
+    """Triangles allongés: la grille est réduite pour borner l'index"""
+    points = uniform(3000)
+    triangles = triangulate(points)
+    index = TileIndex(points, triangles)
+    assert sum(len(tile) for tile in index.tiles) <= 8 * len(triangles)
+
+
+def test_clip_reindexes_vertices():
+    """Sommets utilisés seulement, dans l'ordre du PointSet"""
+    points = uniform(500)
+    triangles = delaunay(points)
+    vertices, clipped = TileIndex(points, triangles).clip((0.2, 0.2, 0.3, 0.3))
+    assert clipped
+    assert sorted({v for t in clipped for v in t}) == list(range(len(vertices)))
+    originals = [points.index(p) for p in vertices]
+    assert originals == sorted(originals)
+
+
+def test_empty_index():
+    """Aucun triangle → aucune sélection"""
+    assert TileIndex([], []).query((0.0, 0.0, 1.0, 1.0)) == []
+
+
+# ============================================================================
+# 3. Intégration au service
+# ============================================================================
+
+@patch('triangulator.triangulator.requests.get')
+def test_bbox_endpoint(mock_get, client):
+    """Triangles de la fenêtre seulement; index construit une seule fois"""
+    points = [(float(x), float(y)) for x in range(20) for y in range(20)]
+    mock_get.return_value = psm_response(encode_pointset(points))
+    with patch.object(service, 'TileIndex', wraps=TileIndex) as index_class:
+        response = client.get('/triangulation/ps?bbox=100,100,200,200')
+        assert response.status_code == 200
+        assert decode_triangles(response.data) == ([], [])
+
+        full = client.get('/triangulation/ps')
+        window = client.get('/triangulation/ps?bbox=16.5,16.5,19,19')
+    assert index_class.call_count == 1
+    assert result_cache.get('ps').tiles is not None
+
+    vertices, triangles = decode_triangles(window.data)
+    full_vertices, full_triangles = decode_triangles(full.data)
+    expected = [t for t in full_triangles
+                if intersects(full_vertices, t, (16.5, 16.5, 19.0, 19.0))]
+    assert len(triangles) == len(expected)
+    assert len(triangles) < len(full_triangles) / 2
+    assert len(vertices) < len(full_vertices) / 2
+    assert mock_get.call_count == 1
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_bbox_over_cached_fan_triangulation(mock_get, client):
+    """Éventail réellement servi: résultats exacts, grille réduite (limite documentée)"""
+    points = uniform(4000)
+    mock_get.return_value = psm_response(encode_pointset(points))
+    full_vertices, full_triangles = decode_triangles(
+        client.get('/triangulation/ps').data
+    )
+    rng = random.Random(2)
+    for _ in range(10):
+        x, y = rng.random() * 0.9, rng.random() * 0.9
+        window = (x, y, x + 0.1, y + 0.1)
+        response = client.get('/triangulation/ps?bbox={},{},{},{}'.format(*window))
+        vertices, triangles = decode_triangles(response.data)
+        expected = [t for t in full_triangles
+                    if intersects(full_vertices, t, window)]
+        assert [tuple(vertices[v] for v in t) for t in triangles] == [
+            tuple(full_vertices[v] for v in t) for t in expected
+        ]
+
+    index = result_cache.get('ps').tiles
+    assert index.triangles == full_triangles
+    assert sum(len(tile) for tile in index.tiles) <= 8 * len(full_triangles)
+    # Triangles de l'éventail non locaux: guère plus de tuiles qu'une grille 4 × 4
+    assert index.nx * index.ny <= 16
+
+
+@pytest.mark.parametrize("query, error", [
+    ("bbox=1,2,3", "Invalid bounding box"),
+    ("bbox=0,0,a,1", "Invalid bounding box"),
+    ("bbox=1,0,0,1", "Invalid bounding box"),
+    ("bbox=0,0,inf,1", "Invalid bounding box"),
+    ("bbox=0,0,1,1&maxVertices=64", "Invalid triangulation options"),
+])
+def test_bbox_rejects_invalid_windows(client, query, error):
+    """Fenêtre mal formée, vide ou combinée à une autre option → 400"""
+    response = client.get(f'/triangulation/ps?{query}')
+    assert response.status_code == 400
+    assert response.get_json()["error"] == error
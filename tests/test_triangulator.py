@@ -1,5 +1,7 @@
 import pytest
-from triangulator.triangulator import triangulate
+from unittest.mock import patch
+from triangulator.geometry import spans_area
+from triangulator.triangulator import convex_hull, triangulate
 
 
 class TestTriangulate:
@@ -38,4 +40,49 @@ class TestTriangulate:
         """Points presque colinéaires → 1 triangle (seuil numérique)"""
         points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1e-8)]
         result = triangulate(points)
-        assert len(result) == 1
\ No newline at end of file
+        assert len(result) == 1
+
+class TestConvexHull:
+    """Tests de l'enveloppe convexe (chaîne monotone d'Andrew)"""
+
+    def test_convex_hull_degenerate_cases(self):
+        """0 point, points confondus, points colinéaires"""
+        assert convex_hull([]) == []
+        assert convex_hull([(1.0, 1.0)]) == [0]
+        assert convex_hull([(1.0, 1.0)] * 4) == [0]
+        assert sorted(convex_hull([(i, 2 * i) for i in range(5)])) == [0, 4]
+
+    def test_convex_hull_square_with_interior_points(self):
+        """Les points intérieurs et sur les arêtes sont exclus"""
+        points = [(0.5, 0.5), (0, 0), (1, 0), (1, 1), (0, 1), (0.5, 0), (0.2, 0.7)]
+        assert convex_hull(points) == [1, 2, 3, 4]
+
+    def test_convex_hull_is_counter_clockwise(self):
+        """Tous les virages de l'enveloppe sont à gauche"""
+        import random
+        random.seed(1)
+        points = [(random.random(), random.random()) for _ in range(200)]
+        hull = convex_hull(points)
+        for k in range(len(hull)):
+            (ax, ay), (bx, by), (cx, cy) = (
+                points[hull[k - 2]], points[hull[k - 1]], points[hull[k]]
+            )
+            assert (bx - ax) * (cy - ay) - (by - ay) * (cx - ax) > 0
+
+    def test_triangulate_reuses_given_hull(self):
+        """Une enveloppe fournie évite le test de colinéarité; sinon, pas de tri"""
+        points = [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0)]
+        with patch('triangulator.geometry.convex_hull') as mock_hull, \
+                patch('triangulator.geometry.spans_area',
+                      wraps=spans_area) as spy_area:
+            result = triangulate(points, hull=[0, 1, 3, 2])
+            spy_area.assert_not_called()
+            assert triangulate(points) == result
+            spy_area.assert_called_once_with(points)
+        mock_hull.assert_not_called()
+        assert result == [(0, 1, 2), (0, 2, 3)]
+
+    def test_triangulate_duplicated_first_point(self):
+        """Premier point dupliqué: la colinéarité se juge sur l'enveloppe"""
+        points = [(0.0, 0.0), (0.0, 0.0), (1.0, 0.0), (0.0, 1.0)]
+        assert len(triangulate(points)) == 2
@@ -0,0 +1,216 @@
+"""
+Tests du préchauffage du cache
+
+Couvre:
+- Lecture des listes de pointSetIds et des journaux d'accès
+- Préchauffage parallèle à concurrence bornée
+- Endpoint d'administration et état de /health pendant le préchauffage
+- Ligne de commande
+"""
+
+import json
+import struct
+import threading
+
+import pytest
+from unittest.mock import Mock, patch
+from tests.conftest import psm_response
+from triangulator import warmup as warmup_module
+from triangulator.triangulator import result_cache
+from triangulator.warmup import (
+    DONE,
+    IDLE,
+    Warmup,
+    hot_ids_from_access_log,
+    read_ids,
+)
+
+
+@pytest.fixture
+def service_warmup(monkeypatch):
+    """Préchauffage du service, isolé pour chaque test."""
+    state = Warmup()
+    monkeypatch.setattr('triangulator.triangulator.warmup', state)
+    yield state
+    state.wait(5)
+
+
+SQUARE = struct.pack('<I', 4) + struct.pack('<8d', 0, 0, 1, 0, 1, 1, 0, 1)
+
+ACCESS_LOG = [
+    '10.0.0.1 - - [19/Oct/2026 10:00:00] "GET /triangulation/a HTTP/1.1" 200 -',
+    '10.0.0.1 - - [19/Oct/2026 10:00:01] "GET /triangulation/b HTTP/1.1" 200 -',
+    '10.0.0.2 - - [19/Oct/2026 10:00:02] "GET /hull/b HTTP/1.1" 200 -',
+    '10.0.0.2 - - [19/Oct/2026 10:00:03] "GET /health HTTP/1.1" 200 -',
+    '10.0.0.3 - - [19/Oct/2026 10:00:04] "GET /triangulation/c?x=1 HTTP/1.1" 200 -',
+    '10.0.0.3 - - [19/Oct/2026 10:00:05] "POST /jobs HTTP/1.1" 202 -',
+]
+
+
+# ============================================================================
+# 1. Listes de PointSets
+# ============================================================================
+
+def test_read_ids_skips_blanks_comments_and_duplicates():
+    """Une ligne par id, commentaires et doublons ignorés"""
+    lines = ["a\n", "\n", "# commentaire\n", "b  # chaud\n", "a\n"]
+    assert read_ids(lines) == ["a", "b"]
+
+
+def test_access_log_ranks_by_hits_then_recency():
+    """Les plus demandés d'abord, puis les plus récents"""
+    assert hot_ids_from_access_log(ACCESS_LOG) == ["b", "c", "a"]
+    assert hot_ids_from_access_log(ACCESS_LOG, limit=1) == ["b"]
+
+
+# ============================================================================
+# 2. Préchauffage
+# ============================================================================
+
+def test_warmup_respects_concurrency_and_counts_failures():
+    """Concurrence bornée, échecs comptés sans interrompre le reste"""
+    state = Warmup()
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def warm(pointSetId):
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        threading.Event().wait(0.01)
+        with lock:
+            running[0] -= 1
+        if pointSetId == "bad":
+            raise RuntimeError("boom")
+
+    assert state.snapshot()["status"] == IDLE
+    assert state.start(["a", "b", "bad", "c", "d"], warm, concurrency=2)
+    assert state.wait(5)
+    snapshot = state.snapshot()
+    assert snapshot["status"] == DONE
+    assert (snapshot["completed"], snapshot["failed"]) == (4, 1)
+    assert snapshot["errors"] == [{"pointSetId": "bad", "error": "boom"}]
+    assert running[1] <= 2
+
+
+def test_warmup_refuses_concurrent_runs():
+    """Un seul préchauffage à la fois"""
+    state = Warmup()
+    release = threading.Event()
+    assert state.start(["a"], lambda _: release.wait(5))
+    assert not state.ready
+    assert state.start(["b"], lambda _: None) is False
+    release.set()
+    assert state.wait(5)
+    assert state.ready
+
+
+# ============================================================================
+# 3. Intégration au service
+# ============================================================================
+
+@patch('triangulator.triangulator.requests.get')
+def test_admin_warmup_populates_cache(mock_get, client, service_warmup):
+    """Les PointSets préchauffés sont servis depuis le cache"""
+    mock_get.return_value = psm_response(SQUARE)
+    response = client.post('/admin/warmup', json={"pointSetIds": ["a", "b"]})
+    assert response.status_code == 202
+    assert service_warmup.wait(5)
+
+    state = client.get('/admin/warmup').get_json()
+    assert (state["completed"], state["failed"]) == (2, 0)
+    assert result_cache.get('a').payload is not None
+    assert client.get('/triangulation/b').headers['X-Cache-Status'] == "hit"
+    assert mock_get.call_count == 2
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_health_not_ready_during_warmup(mock_get, client, service_warmup):
+    """/health répond 503 tant que le préchauffage n'est pas terminé"""
+    release = threading.Event()
+
+    def slow_get(*args, **kwargs):
+        release.wait(5)
+        return psm_response(SQUARE)
+
+    mock_get.side_effect = slow_get
+    client.post('/admin/warmup', json={"pointSetIds": ["a"]})
+    response = client.get('/health')
+    assert response.status_code == 503
+    assert response.get_json()["status"] == "warming_up"
+    assert client.post(
+        '/admin/warmup', json={"pointSetIds": ["b"]}
+    ).status_code == 409
+
+    release.set()
+    assert service_warmup.wait(5)
+    assert client.get('/health').status_code == 200
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_warmup_records_upstream_errors(mock_get, client, service_warmup):
+    """Un PointSet introuvable est compté comme un échec"""
+    mock_get.return_value = Mock(status_code=404)
+    client.post('/admin/warmup', json={"pointSetIds": ["missing"]})
+    assert service_warmup.wait(5)
+    state = client.get('/admin/warmup').get_json()
+    assert state["failed"] == 1
+    assert state["errors"][0]["error"] == "PointSet not found"
+
+
+@pytest.mark.parametrize("body", [
+    None,
+    {"pointSetIds": "a"},
+    {"pointSetIds": ["a", 1]},
+    {"pointSetIds": ["a"], "concurrency": 0},
+    {"pointSetIds": ["a"], "concurrency": True},
+])
+def test_admin_warmup_rejects_invalid_body(client, service_warmup, body):
+    """Corps invalide → 400"""
+    assert client.post('/admin/warmup', json=body).status_code == 400
+
+
+def test_admin_warmup_caps_to_cache_size(client, service_warmup, monkeypatch):
+    """Pas plus de PointSets que le cache ne peut en contenir"""
+    monkeypatch.setattr(result_cache, 'max_entries', 2)
+    with patch('triangulator.triangulator.warm_pointset'):
+        response = client.post('/admin/warmup', json={"pointSetIds": ["a", "b", "c"]})
+    assert response.get_json()["total"] == 2
+
+
+# ============================================================================
+# 4. Ligne de commande
+# ============================================================================
+
+def test_cli_sends_hot_ids_and_waits(tmp_path, capsys):
+    """La CLI envoie les ids à l'instance et suit le préchauffage"""
+    log = tmp_path / "access.log"
+    log.write_text("\n".join(ACCESS_LOG))
+    ids = tmp_path / "ids.txt"
+    ids.write_text("z\nb\n")
+    calls = []
+
+    def fake_request(url, body=None):
+        calls.append((url, body))
+        if body is not None:
+            return {"status": "running", "total": 4, "completed": 0, "failed": 0}
+        return {"status": "done", "total": 4, "completed": 4, "failed": 0}
+
+    with patch.object(warmup_module, '_request', side_effect=fake_request), \
+            patch.object(warmup_module.time, 'sleep'):
+        code = warmup_module.main([
+            "--url", "http://instance:5000/", "--ids", str(ids),
+            "--access-log", str(log), "--concurrency", "3",
+        ])
+
+    assert code == 0
+    assert calls[0] == ("http://instance:5000/admin/warmup",
+                        {"pointSetIds": ["z", "b", "c", "a"], "concurrency": 3})
+    assert calls[1] == ("http://instance:5000/admin/warmup", None)
+    assert json.loads(capsys.readouterr().out)["completed"] == 4
+
+
+def test_cli_requires_ids():
+    """Sans --ids ni --access-log, la CLI échoue"""
+    with pytest.raises(SystemExit):
+        warmup_module.main([])
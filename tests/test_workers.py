@@ -0,0 +1,209 @@
+"""
+Tests des processus de calcul par mémoire partagée (triangulator.workers)
+
+Couvre:
+- Segments partagés (copie, diffusion par blocs, libération)
+- Pool de calcul (même binaire que le pipeline en processus, enveloppe,
+  erreurs)
+- Service: PointSet reçu dans un segment, calculs confiés au pool, réponses
+  diffusées depuis un segment partagé
+"""
+
+import gc
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+from unittest.mock import patch
+from tests.conftest import psm_response, uniform
+from triangulator import triangulator as service
+from triangulator.codec import decode_hull, encode_pointset
+from triangulator.geometry import convex_hull
+from triangulator.pipeline import triangulate_pointset
+from triangulator.triangulator import result_cache
+from triangulator.workers import ComputePool, SharedBuffer
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """Pool d'un processus de calcul, partagé par les tests du module."""
+    pool = ComputePool(1)
+    yield pool
+    pool.shutdown()
+
+
+def segment_exists(name):
+    """Indique si un segment partagé de ce nom existe encore."""
+    try:
+        SharedMemory(name).close()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+# ============================================================================
+# 1. Segments partagés
+# ============================================================================
+
+def test_shared_buffer_copy_and_chunks():
+    """Copie du binaire, relue d'un bloc ou par blocs"""
+    data = bytes(range(256)) * 10
+    buffer = SharedBuffer.copy_of(data)
+    assert len(buffer) == len(data)
+    assert bytes(buffer) == data
+    assert b"".join(buffer.chunks(1000)) == data
+    assert [len(c) for c in buffer.chunks(1000)] == [1000, 1000, 560]
+    buffer.close()
+
+
+def test_shared_buffer_is_released():
+    """Segment supprimé par close, ou quand l'objet n'est plus référencé"""
+    buffer = SharedBuffer(16)
+    name = buffer.name
+    buffer.close()
+    buffer.close()
+    assert not segment_exists(name)
+
+    buffer = SharedBuffer.copy_of(b"abc")
+    name = buffer.name
+    del buffer
+    gc.collect()
+    assert not segment_exists(name)
+
+
+def test_empty_shared_buffer():
+    """Binaire vide: aucun bloc diffusé"""
+    buffer = SharedBuffer(0)
+    assert bytes(buffer) == b""
+    assert list(buffer.chunks()) == []
+
+
+# ============================================================================
+# 2. Pool de calcul
+# ============================================================================
+
+def test_pool_matches_in_process_pipeline(pool):
+    """Même binaire Triangles, avec ou sans enveloppe"""
+    points = uniform(5000)
+    data = encode_pointset(points)
+    expected = triangulate_pointset(data)
+    assert bytes(pool.triangulate(data)) == expected
+    assert bytes(pool.triangulate(data, convex_hull(points))) == expected
+    collinear = encode_pointset([(float(i), 0.0) for i in range(10)])
+    assert bytes(pool.triangulate(collinear)) == triangulate_pointset(collinear)
+
+
+def test_pool_uses_the_given_segment(pool):
+    """Segment source transmis sans copie, ni supprimé après le calcul"""
+    points = uniform(500)
+    source = SharedBuffer.copy_of(encode_pointset(points))
+    with patch.object(SharedBuffer, 'copy_of') as copy_of:
+        result = pool.triangulate(source)
+    copy_of.assert_not_called()
+    assert bytes(result) == triangulate_pointset(bytes(source))
+    assert segment_exists(source.name)
+    assert pool.hull(source) == convex_hull(points)
+    assert pool.hull(result) == convex_hull(points)
+
+
+def test_pool_rejects_invalid_binary(pool):
+    """Binaire invalide → ValueError, sans segment orphelin"""
+    with pytest.raises(ValueError):
+        pool.triangulate(b"\x05\x00\x00\x00")
+
+
+# ============================================================================
+# 3. Intégration au service
+# ============================================================================
+
+@patch('triangulator.triangulator.requests.get')
+def test_service_streams_from_shared_memory(mock_get, client, pool, monkeypatch):
+    """Réponse diffusée depuis le segment, conservé en cache"""
+    data = encode_pointset(uniform(500))
+    mock_get.return_value = psm_response(data)
+    monkeypatch.setattr(service, 'compute_pool', pool)
+    monkeypatch.setattr(service, 'FUSED_PIPELINE_THRESHOLD', 100)
+
+    response = client.get('/triangulation/ps')
+    assert response.status_code == 200
+    assert response.data == triangulate_pointset(data)
+    assert response.headers['Content-Length'] == str(len(response.data))
+    assert isinstance(result_cache.get('ps').payload, SharedBuffer)
+
+    cached = client.get('/triangulation/ps')
+    assert cached.headers['X-Cache-Status'] == 'hit'
+    assert cached.data == response.data
+    assert mock_get.call_count == 1
+
+    result = service.run_triangulation_job('ps', lambda stage, progress: None)
+    assert result == response.data
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_service_hands_the_received_segment_to_the_pool(
+    mock_get, client, pool, monkeypatch
+):
+    """Corps reçu dans un segment; colinéarité, décodage et enveloppe dans le pool"""
+    points = [(float(i), 0.0) for i in range(300)] + uniform(200)
+    data = encode_pointset(points)
+    mock_get.return_value = psm_response(data)
+    monkeypatch.setattr(service, 'compute_pool', pool)
+    monkeypatch.setattr(service, 'FUSED_PIPELINE_THRESHOLD', 100)
+
+    with (
+        patch('triangulator.pipeline.spans_area') as spans_area,
+        patch('triangulator.triangulator.decode_pointset') as decode,
+        patch('triangulator.triangulator.convex_hull') as hull,
+        patch.object(SharedBuffer, 'copy_of') as copy_of,
+    ):
+        response = client.get('/triangulation/ps')
+        hull_response = client.get('/hull/ps')
+    for mock in (spans_area, decode, hull, copy_of):
+        mock.assert_not_called()
+
+    assert response.data == triangulate_pointset(data)
+    assert decode_hull(hull_response.data) == convex_hull(points)
+    assert result_cache.get('ps').points is None
+
+
+@patch('triangulator.triangulator.requests.get')
+def test_service_rejects_body_longer_than_announced(mock_get, client, pool, monkeypatch):
+    """Corps plus long que l'en-tête ne l'annonce → 400, segment non débordé"""
+    # Sans Content-Length (corps transmis par blocs): détecté à la lecture
+    data = encode_pointset(uniform(500)) + b"\x00" * 16
+    mock_get.return_value = psm_response(data, headers={})
+    monkeypatch.setattr(service, 'compute_pool', pool)
+    monkeypatch.setattr(service, 'FUSED_PIPELINE_THRESHOLD', 100)
+
+    response = client.get('/triangulation/ps')
+    assert response.status_code == 400
+    assert 'Longueur invalide' in response.get_json()['details']
+
+
+@patch('triangulator.triangulator.SharedBuffer')
+@patch('triangulator.triangulator.requests.get')
+def test_service_rejects_huge_announced_count(mock_get, shared_buffer, client, pool, monkeypatch):
+    """En-tête annonçant 2**32 - 1 points → 400 sans allouer de segment"""
+    mock_get.return_value = psm_response(b"\xff\xff\xff\xff", headers={})
+    monkeypatch.setattr(service, 'compute_pool', pool)
+    monkeypatch.setattr(service, 'FUSED_PIPELINE_THRESHOLD', 100)
+
+    response = client.get('/triangulation/ps')
+    assert response.status_code == 400
+    assert 'au plus' in response.get_json()['details']
+    shared_buffer.assert_not_called()
+    mock_get.return_value.close.assert_called_once()
+
+
+@patch('triangulator.triangulator.SharedBuffer')
+@patch('triangulator.triangulator.requests.get')
+def test_service_rejects_count_not_matching_content_length(mock_get, shared_buffer, client, pool, monkeypatch):
+    """Nombre de points contredit par Content-Length → 400 sans allouer de segment"""
+    data = encode_pointset(uniform(500))
+    mock_get.return_value = psm_response(data[:1000])
+    monkeypatch.setattr(service, 'compute_pool', pool)
+    monkeypatch.setattr(service, 'FUSED_PIPELINE_THRESHOLD', 100)
+
+    response = client.get('/triangulation/ps')
+    assert response.status_code == 400
+    assert 'Content-Length 1000' in response.get_json()['details']
+    shared_buffer.assert_not_called()
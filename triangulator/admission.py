@@ -0,0 +1,157 @@
+"""Contrôle d'admission des calculs selon la taille des PointSets.
+
+Les calculs sont répartis en deux classes, « small » et « large », selon le
+nombre de points annoncé dans l'en-tête du binaire. Chaque classe a sa propre
+limite de calculs simultanés et sa propre file d'attente bornée: un calcul
+sur plusieurs millions de points ne peut donc occuper qu'une part fixe des
+workers, et les petits PointSets ne patientent jamais derrière lui.
+
+Quand la file d'une classe est pleine, ou que l'attente dépasse le délai
+maximal, le calcul est refusé avec une estimation du délai avant de réessayer.
+"""
+
+import math
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+# Poids de la dernière durée observée dans la moyenne glissante
+_EWMA_WEIGHT = 0.2
+
+
+class Overloaded(Exception):
+    """Calcul refusé: la classe de calcul est saturée."""
+
+    def __init__(self, job_class: str, retry_after: int) -> None:
+        """Indique la classe saturée et le délai conseillé (en secondes)."""
+        super().__init__(f"Capacité de calcul '{job_class}' épuisée")
+        self.job_class = job_class
+        self.retry_after = retry_after
+
+
+class JobClass:
+    """Classe de calculs: limite de concurrence et file d'attente bornée."""
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queued: int,
+        queue_timeout: float,
+        initial_seconds: float = 1.0,
+    ) -> None:
+        """Déclare une classe de calculs.
+
+        Args:
+            name: Nom de la classe
+            max_concurrent: Nombre maximal de calculs simultanés
+            max_queued: Nombre maximal de calculs en attente d'un créneau
+            queue_timeout: Attente maximale d'un créneau, en secondes
+            initial_seconds: Durée estimée d'un calcul avant toute mesure
+
+        """
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.running = 0
+        self.queued = 0
+        self.avg_seconds = initial_seconds
+        self._cond = threading.Condition()
+
+    def retry_after(self) -> int:
+        """Estime le délai, en secondes, avant qu'un créneau se libère."""
+        waves = (self.queued + 1) / self.max_concurrent
+        return max(1, math.ceil(self.avg_seconds * waves))
+
+    def acquire(self) -> None:
+        """Réserve un créneau de calcul, en attendant si nécessaire.
+
+        Raises:
+            Overloaded: Si la file est pleine ou l'attente trop longue
+
+        """
+        with self._cond:
+            if self.running < self.max_concurrent and self.queued == 0:
+                self.running += 1
+                return
+            if self.queued >= self.max_queued:
+                raise Overloaded(self.name, self.retry_after())
+
+            self.queued += 1
+            try:
+                admitted = self._cond.wait_for(
+                    lambda: self.running < self.max_concurrent, self.queue_timeout
+                )
+            finally:
+                self.queued -= 1
+            if not admitted:
+                raise Overloaded(self.name, self.retry_after())
+            self.running += 1
+
+    def release(self, seconds: float) -> None:
+        """Libère un créneau et met à jour la durée moyenne des calculs."""
+        with self._cond:
+            self.running -= 1
+            self.avg_seconds += _EWMA_WEIGHT * (seconds - self.avg_seconds)
+            self._cond.notify()
+
+    def snapshot(self) -> dict:
+        """Retourne l'état courant de la classe, sérialisable en JSON."""
+        with self._cond:
+            return {
+                "running": self.running,
+                "queued": self.queued,
+                "max_concurrent": self.max_concurrent,
+                "max_queued": self.max_queued,
+                "avg_seconds": self.avg_seconds,
+            }
+
+
+class AdmissionController:
+    """Répartit les calculs entre les classes « small » et « large »."""
+
+    def __init__(
+        self, large_threshold: int, small: JobClass, large: JobClass
+    ) -> None:
+        """Associe les deux classes au seuil qui les sépare.
+
+        Args:
+            large_threshold: Nombre de points à partir duquel un calcul est
+                             dans la classe « large »
+            small: Classe des petits calculs
+            large: Classe des gros calculs
+
+        """
+        self.large_threshold = large_threshold
+        self.small = small
+        self.large = large
+
+    def classify(self, point_count: int) -> JobClass:
+        """Retourne la classe d'un calcul portant sur `point_count` points."""
+        return self.large if point_count >= self.large_threshold else self.small
+
+    @contextmanager
+    def admit(self, point_count: int) -> Iterator[JobClass]:
+        """Exécute le bloc dans un créneau de la classe adaptée.
+
+        Raises:
+            Overloaded: Si aucun créneau n'est disponible à temps
+
+        """
+        job_class = self.classify(point_count)
+        job_class.acquire()
+        start = time.perf_counter()
+        try:
+            yield job_class
+        finally:
+            job_class.release(time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        """Retourne l'état des deux classes, sérialisable en JSON."""
+        return {
+            "large_threshold": self.large_threshold,
+            "small": self.small.snapshot(),
+            "large": self.large.snapshot(),
+        }
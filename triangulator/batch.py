@@ -0,0 +1,279 @@
+"""Triangulation hors ligne de fichiers PointSet locaux.
+
+Traite des fichiers binaires PointSet (ou des répertoires entiers) sans
+passer par le service web ni par le PointSetManager: chaque fichier est lu
+via `mmap` et triangulé par le pipeline fusionné (`triangulator.pipeline`),
+et le résultat au format Triangles est écrit à côté de l'original (ou dans
+un répertoire de sortie, qui reproduit l'arborescence des entrées). Les
+fichiers sont répartis entre plusieurs processus pour exploiter tous les
+cœurs.
+
+Usage:
+    python -m triangulator.batch archive/ --pattern "*.bin" --workers 8
+    python -m triangulator.batch a.bin b.bin --output-dir out/ --force
+"""
+
+import argparse
+import fnmatch
+import mmap
+import os
+import struct
+import sys
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from triangulator.codec import BYTES_PER_POINT, HEADER_SIZE, read_point_count
+from triangulator.pipeline import peak_bytes, triangulate_pointset
+
+DEFAULT_PATTERN = "*.bin"
+OUTPUT_SUFFIX = ".triangles.bin"
+
+
+def output_path(
+    path: str, output_dir: str | None = None, root: str | None = None
+) -> str:
+    """Chemin du fichier Triangles produit pour le PointSet `path`.
+
+    Args:
+        path: Fichier PointSet
+        output_dir: Répertoire des résultats (par défaut, celui de `path`)
+        root: Répertoire d'entrée dont l'arborescence est reproduite sous
+              `output_dir` (par défaut, celui de `path`)
+
+    """
+    base, _ = os.path.splitext(os.path.basename(path))
+    directory = os.path.dirname(path)
+    if output_dir is not None:
+        relative = (
+            os.curdir if root is None
+            else os.path.relpath(os.path.abspath(directory), root)
+        )
+        directory = os.path.normpath(os.path.join(output_dir, relative))
+    return os.path.join(directory, base + OUTPUT_SUFFIX)
+
+
+def input_root(paths: list[str]) -> str | None:
+    """Plus long répertoire commun aux fichiers `paths` (None si vide)."""
+    if not paths:
+        return None
+    return os.path.commonpath(
+        [os.path.dirname(os.path.abspath(path)) for path in paths]
+    )
+
+
+def find_inputs(paths: list[str], pattern: str = DEFAULT_PATTERN) -> Iterator[str]:
+    """Énumère les fichiers PointSet à traiter.
+
+    Les fichiers donnés explicitement sont toujours retenus; les répertoires
+    sont parcourus récursivement et seuls les fichiers correspondant à
+    `pattern` sont retenus, hors résultats d'un traitement précédent.
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if fnmatch.fnmatch(name, pattern) and not name.endswith(OUTPUT_SUFFIX):
+                    yield os.path.join(root, name)
+
+
+def triangulate_file(
+    path: str, output_dir: str | None = None, root: str | None = None
+) -> dict:
+    """Triangule un fichier PointSet et écrit le résultat.
+
+    Le fichier est projeté en mémoire plutôt que lu: le binaire Triangles
+    est construit directement depuis les pages du fichier, sans liste de
+    points ni de triangles intermédiaire. Le résultat est écrit de façon
+    atomique, au chemin donné par `output_path(path, output_dir, root)`.
+
+    Returns:
+        dict: path, output, points, triangles, bytes, seconds,
+              points_per_second, peak_bytes (borne de la mémoire allouée
+              par le pipeline)
+
+    Raises:
+        ValueError: Si le binaire est invalide
+        OSError: En cas d'erreur de lecture ou d'écriture
+
+    """
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            # mmap refuse les fichiers vides; le pipeline signalera l'erreur
+            payload = triangulate_pointset(b"")
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                payload = triangulate_pointset(data)
+                peak = peak_bytes(data)
+    points = read_point_count(payload)
+    (triangles,) = struct.unpack_from(
+        "<I", payload, HEADER_SIZE + points * BYTES_PER_POINT
+    )
+
+    target = output_path(path, output_dir, root)
+    if output_dir is not None:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = f"{target}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    seconds = time.perf_counter() - start
+    return {
+        "path": path,
+        "output": target,
+        "points": points,
+        "triangles": triangles,
+        "bytes": size,
+        "seconds": seconds,
+        "points_per_second": points / seconds if seconds else 0.0,
+        "peak_bytes": peak,
+    }
+
+
+def _safe_triangulate_file(
+    path: str, output_dir: str | None, root: str | None
+) -> dict:
+    """`triangulate_file`, avec l'erreur rapportée au lieu d'être levée."""
+    try:
+        return triangulate_file(path, output_dir, root)
+    except (OSError, ValueError) as e:
+        return {"path": path, "error": str(e)}
+
+
+def run_batch(
+    paths: list[str],
+    output_dir: str | None = None,
+    workers: int | None = None,
+    force: bool = False,
+    log: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """Triangule une liste de fichiers en parallèle.
+
+    Args:
+        paths: Fichiers PointSet à traiter
+        output_dir: Répertoire des résultats (par défaut, à côté des
+                    entrées), sous lequel l'arborescence des entrées est
+                    reproduite à partir de leur répertoire commun
+        workers: Nombre de processus (par défaut, un par cœur); 1 traite
+                 les fichiers dans le processus courant
+        force: Retraiter les fichiers dont le résultat existe déjà
+        log: Fonction appelée avec le rapport de chaque fichier terminé
+
+    Returns:
+        list[dict]: Un rapport par fichier, dans l'ordre d'achèvement; en cas
+                    d'échec, le rapport contient `error`, sinon les champs de
+                    `triangulate_file`. Les fichiers ignorés ont `skipped`.
+                    Des entrées qui produiraient le même fichier de sortie
+                    (`a.bin` et `a.dat`) sont toutes en échec, sans écriture.
+
+    """
+    reports = []
+
+    def done(report: dict) -> None:
+        reports.append(report)
+        if log is not None:
+            log(report)
+
+    root = input_root(paths) if output_dir is not None else None
+    targets: dict[str, list[str]] = {}
+    for path in paths:
+        targets.setdefault(
+            os.path.abspath(output_path(path, output_dir, root)), []
+        ).append(path)
+
+    todo = []
+    for target, sources in targets.items():
+        if len(sources) > 1:
+            for path in sources:
+                done({"path": path, "error": (
+                    f"Sortie {target} commune à {len(sources)} entrées: "
+                    + ", ".join(sources)
+                )})
+        elif not force and os.path.exists(target):
+            done({"path": sources[0], "skipped": True})
+        else:
+            todo.append(sources[0])
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(todo) <= 1:
+        for path in todo:
+            done(_safe_triangulate_file(path, output_dir, root))
+        return reports
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(todo))) as executor:
+        futures = [
+            executor.submit(_safe_triangulate_file, path, output_dir, root)
+            for path in todo
+        ]
+        for future in as_completed(futures):
+            done(future.result())
+    return reports
+
+
+def format_report(report: dict) -> str:
+    """Représentation d'un rapport de fichier sur une ligne lisible."""
+    if "error" in report:
+        return f"ERREUR  {report['path']}: {report['error']}"
+    if report.get("skipped"):
+        return f"IGNORÉ  {report['path']} (résultat existant)"
+    return (
+        f"OK      {report['path']}: {report['points']} points, "
+        f"{report['triangles']} triangles en {report['seconds']:.3f} s "
+        f"({report['points_per_second']:,.0f} points/s)"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Point d'entrée: retourne 1 si au moins un fichier a échoué, 0 sinon."""
+    parser = argparse.ArgumentParser(
+        prog="python -m triangulator.batch",
+        description="Triangule des fichiers PointSet locaux.",
+    )
+    parser.add_argument("paths", nargs="+",
+                        help="fichiers PointSet ou répertoires à parcourir")
+    parser.add_argument("--pattern", default=DEFAULT_PATTERN,
+                        help="motif des fichiers retenus dans les répertoires")
+    parser.add_argument("--output-dir",
+                        help="répertoire des résultats, qui reproduit "
+                             "l'arborescence des entrées (défaut: à côté "
+                             "des entrées)")
+    parser.add_argument("--workers", type=int,
+                        help="nombre de processus (défaut: un par cœur)")
+    parser.add_argument("--force", action="store_true",
+                        help="retraiter les fichiers déjà triangulés")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    reports = run_batch(
+        list(find_inputs(args.paths, args.pattern)),
+        output_dir=args.output_dir, workers=args.workers, force=args.force,
+        log=lambda report: print(format_report(report)),
+    )
+    elapsed = time.perf_counter() - start
+
+    succeeded = [r for r in reports if "points" in r]
+    failed = [r for r in reports if "error" in r]
+    points = sum(r["points"] for r in succeeded)
+    print(
+        f"{len(succeeded)} fichiers triangulés, {len(failed)} en échec, "
+        f"{len(reports) - len(succeeded) - len(failed)} ignorés; "
+        f"{points} points en {elapsed:.3f} s "
+        f"({points / elapsed if elapsed else 0:,.0f} points/s)",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,474 @@
+"""Banc de mesure des performances du Triangulator.
+
+Mesure chaque étape du traitement (`decode_pointset`, `triangulate`,
+`encode_triangles` et le chemin HTTP complet via le client de test Flask)
+pour plusieurs tailles et distributions de points, puis rapporte le débit
+(points/s) et le pic mémoire de chaque mesure. Les étapes
+`triangulate_hilbert` et `triangulate_morton` mesurent la triangulation
+précédée du réordonnancement le long d'une courbe (`triangulator.spatial`),
+à comparer à `triangulate`. L'étape `pipeline` mesure le pipeline fusionné
+(`triangulator.pipeline`), du binaire PointSet au binaire Triangles, à
+comparer à la somme des trois premières étapes.
+
+Les résultats peuvent être enregistrés en JSON et comparés à une référence
+enregistrée précédemment pour détecter les régressions.
+
+Le temps d'import à froid des modules du paquet est mesuré séparément,
+chacun dans un nouvel interpréteur, et comparé à un budget: les processus
+de calcul et les outils en ligne de commande ne doivent charger que le
+cœur (formats binaires et géométrie), sans la couche web.
+
+Usage:
+    python -m triangulator.benchmark --sizes 1000 100000 --output bench.json
+    python -m triangulator.benchmark --baseline bench.json --tolerance 0.2
+    python -m triangulator.benchmark --distributions uniform clustered \
+        --stages triangulate triangulate_hilbert triangulate_morton
+    python -m triangulator.benchmark --import-time
+"""
+
+import argparse
+import gc
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from triangulator.codec import (
+    Point,
+    decode_pointset,
+    encode_pointset,
+    encode_triangles,
+)
+from triangulator.geometry import triangulate
+from triangulator.pipeline import triangulate_pointset
+from triangulator.spatial import triangulate_along
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.2
+
+# Budget de temps d'import à froid, en secondes, par module
+IMPORT_BUDGETS = {
+    "triangulator.codec": 0.05,
+    "triangulator.geometry": 0.05,
+    "triangulator.triangulator": 0.5,
+}
+# Modules de la couche web, qui ne doivent pas être chargés par le cœur
+WEB_MODULES = ("flask", "requests", "werkzeug", "triangulator.triangulator")
+
+
+# ============================================================================
+# 1. DISTRIBUTIONS DE POINTS
+# ============================================================================
+
+
+def uniform_points(n: int, rng: random.Random) -> list[Point]:
+    """Points uniformément répartis dans le carré [0, 1000]²."""
+    return [(rng.uniform(0, 1000), rng.uniform(0, 1000)) for _ in range(n)]
+
+
+def clustered_points(n: int, rng: random.Random) -> list[Point]:
+    """Points regroupés en amas gaussiens d'environ 1000 points."""
+    centers = uniform_points(max(1, n // 1000), rng)
+    points = []
+    for _ in range(n):
+        cx, cy = rng.choice(centers)
+        points.append((rng.gauss(cx, 5.0), rng.gauss(cy, 5.0)))
+    return points
+
+
+def collinear_points(n: int, rng: random.Random) -> list[Point]:
+    """Points majoritairement (90%) alignés sur une même droite."""
+    points = []
+    for i in range(n):
+        if rng.random() < 0.9:
+            points.append((float(i), 2.0 * i + 1.0))
+        else:
+            points.append((rng.uniform(0, n), rng.uniform(0, 2 * n)))
+    return points
+
+
+def grid_points(n: int, rng: random.Random) -> list[Point]:
+    """Points sur une grille régulière, parcourue ligne par ligne."""
+    side = max(1, math.ceil(math.sqrt(n)))
+    return [(float(i % side), float(i // side)) for i in range(n)]
+
+
+def duplicate_points(n: int, rng: random.Random) -> list[Point]:
+    """Points tirés parmi n/10 positions distinctes (nombreux doublons)."""
+    pool = uniform_points(max(1, n // 10), rng)
+    return [rng.choice(pool) for _ in range(n)]
+
+
+DISTRIBUTIONS: dict[str, Callable[[int, random.Random], list[Point]]] = {
+    "uniform": uniform_points,
+    "clustered": clustered_points,
+    "collinear": collinear_points,
+    "grid": grid_points,
+    "duplicates": duplicate_points,
+}
+
+
+# ============================================================================
+# 2. ÉTAPES MESURÉES
+# ============================================================================
+
+
+def _http_stage(points: list[Point]) -> Callable[[], object]:
+    """Prépare une requête GET /triangulation avec un PointSetManager simulé."""
+    # Importés ici: seule cette étape en a besoin
+    from unittest.mock import Mock, patch
+
+    from triangulator import triangulator as service
+
+    content = encode_pointset(points)
+    client = service.app.test_client()
+
+    def run() -> object:
+        service.result_cache.clear()
+        with patch.object(service.requests, "get") as mock_get:
+            mock_get.return_value = Mock(status_code=200)
+            mock_get.return_value.iter_content.return_value = iter([content])
+            response = client.get("/triangulation/benchmark")
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.data!r}")
+        return response.data
+
+    return run
+
+
+def prepare_stages(points: list[Point]) -> dict[str, Callable[[], object]]:
+    """Construit les étapes à mesurer, avec leurs entrées déjà calculées.
+
+    Args:
+        points: PointSet de test
+
+    Returns:
+        dict: Nom de l'étape → fonction sans argument exécutant l'étape
+
+    """
+    binary = encode_pointset(points)
+    triangles = triangulate(points)
+    return {
+        "decode_pointset": lambda: decode_pointset(binary),
+        "triangulate": lambda: triangulate(points),
+        "triangulate_hilbert": lambda: triangulate_along(points, "hilbert"),
+        "triangulate_morton": lambda: triangulate_along(points, "morton"),
+        "encode_triangles": lambda: encode_triangles(triangles, points),
+        "pipeline": lambda: triangulate_pointset(binary),
+        "http": _http_stage(points),
+    }
+
+
+STAGES = [
+    "decode_pointset",
+    "triangulate",
+    "triangulate_hilbert",
+    "triangulate_morton",
+    "encode_triangles",
+    "pipeline",
+    "http",
+]
+
+
+# ============================================================================
+# 3. MESURES
+# ============================================================================
+
+
+def measure(
+    func: Callable[[], object], repeat: int = DEFAULT_REPEAT, memory: bool = True
+) -> tuple[float, int | None]:
+    """Mesure le meilleur temps et le pic mémoire d'une fonction.
+
+    Le temps est mesuré sans `tracemalloc`, qui ralentit fortement les
+    allocations; le pic mémoire est mesuré lors d'une exécution séparée.
+
+    Args:
+        func: Fonction à mesurer
+        repeat: Nombre d'exécutions chronométrées (le minimum est retenu)
+        memory: Mesurer aussi le pic mémoire
+
+    Returns:
+        tuple: (secondes, pic mémoire en bytes ou None)
+
+    """
+    best = math.inf
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return best, peak
+
+
+def run_benchmark(
+    sizes: list[int],
+    distributions: list[str],
+    stages: list[str],
+    repeat: int = DEFAULT_REPEAT,
+    memory: bool = True,
+    seed: int = 42,
+    log: Callable[[str], None] | None = None,
+) -> list[dict]:
+    """Exécute le balayage tailles × distributions × étapes.
+
+    Args:
+        sizes: Nombres de points à tester
+        distributions: Noms de distributions (clés de `DISTRIBUTIONS`)
+        stages: Noms d'étapes (éléments de `STAGES`)
+        repeat: Nombre d'exécutions chronométrées par mesure
+        memory: Mesurer aussi le pic mémoire
+        seed: Graine du générateur aléatoire
+        log: Fonction appelée avec une ligne de résultat par mesure
+
+    Returns:
+        list[dict]: Une entrée par mesure (stage, distribution, size,
+                    seconds, points_per_second, peak_bytes)
+
+    """
+    results = []
+    for size in sizes:
+        for distribution in distributions:
+            points = DISTRIBUTIONS[distribution](size, random.Random(seed))
+            prepared = prepare_stages(points)
+            for stage in stages:
+                seconds, peak = measure(prepared[stage], repeat, memory)
+                result = {
+                    "stage": stage,
+                    "distribution": distribution,
+                    "size": size,
+                    "seconds": seconds,
+                    "points_per_second": size / seconds if seconds else math.inf,
+                    "peak_bytes": peak,
+                }
+                results.append(result)
+                if log is not None:
+                    log(format_result(result))
+            del points, prepared
+    return results
+
+
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+web = sorted(m for m in {web!r} if m in sys.modules)
+print(json.dumps({{"seconds": seconds, "web_modules": web}}))
+"""
+
+
+def measure_import(module: str, repeat: int = DEFAULT_REPEAT) -> dict:
+    """Mesure le temps d'import à froid d'un module.
+
+    Chaque mesure est faite dans un nouvel interpréteur, pour que rien ne
+    soit déjà en cache dans `sys.modules`.
+
+    Args:
+        module: Nom du module à importer
+        repeat: Nombre d'interpréteurs lancés (le minimum est retenu)
+
+    Returns:
+        dict: module, seconds, budget et web_modules (modules de la couche
+              web chargés par l'import)
+
+    """
+    code = _IMPORT_PROBE.format(module=module, web=WEB_MODULES)
+    best = math.inf
+    web_modules: list[str] = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        probe = json.loads(output)
+        best = min(best, probe["seconds"])
+        web_modules = probe["web_modules"]
+    return {
+        "module": module,
+        "seconds": best,
+        "budget": IMPORT_BUDGETS.get(module),
+        "web_modules": web_modules,
+    }
+
+
+def check_import(result: dict) -> list[str]:
+    """Problèmes d'une mesure d'import: budget dépassé, couche web chargée."""
+    problems = []
+    if result["budget"] is not None and result["seconds"] > result["budget"]:
+        problems.append(
+            f"{result['module']}: import en {result['seconds'] * 1000:.1f} ms, "
+            f"budget {result['budget'] * 1000:.1f} ms"
+        )
+    if result["module"] != "triangulator.triangulator" and result["web_modules"]:
+        problems.append(
+            f"{result['module']}: charge la couche web "
+            f"({', '.join(result['web_modules'])})"
+        )
+    return problems
+
+
+def format_result(result: dict) -> str:
+    """Représentation d'une mesure sur une ligne lisible."""
+    peak = result["peak_bytes"]
+    peak_text = f"{peak / 2**20:9.1f} MiB" if peak is not None else "        -"
+    return (
+        f"{result['stage']:<19} {result['distribution']:<11} "
+        f"{result['size']:>10} {result['seconds']:10.4f}s "
+        f"{result['points_per_second']:14.0f} pts/s {peak_text}"
+    )
+
+
+# ============================================================================
+# 4. RÉFÉRENCE ET RÉGRESSIONS
+# ============================================================================
+
+
+def _key(result: dict) -> tuple[str, str, int]:
+    return result["stage"], result["distribution"], result["size"]
+
+
+def find_regressions(
+    results: list[dict], baseline: list[dict], tolerance: float = DEFAULT_TOLERANCE
+) -> list[dict]:
+    """Compare des mesures à une référence.
+
+    Une mesure est une régression si son temps dépasse celui de la référence
+    de plus de `tolerance` (en proportion). Les mesures absentes de la
+    référence sont ignorées.
+
+    Args:
+        results: Mesures courantes
+        baseline: Mesures de référence
+        tolerance: Ralentissement relatif toléré (0.2 = +20%)
+
+    Returns:
+        list[dict]: Les mesures en régression, avec le temps de référence
+                    (`baseline_seconds`) et le ratio (`ratio`)
+
+    """
+    reference = {_key(r): r["seconds"] for r in baseline}
+    regressions = []
+    for result in results:
+        expected = reference.get(_key(result))
+        if expected is None or expected <= 0:
+            continue
+        ratio = result["seconds"] / expected
+        if ratio > 1 + tolerance:
+            regressions.append({
+                **result, "baseline_seconds": expected, "ratio": ratio
+            })
+    return regressions
+
+
+def save_results(path: str, results: list[dict]) -> None:
+    """Enregistre des mesures en JSON, avec l'environnement d'exécution."""
+    document = {
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+        },
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+
+
+def load_results(path: str) -> list[dict]:
+    """Charge des mesures enregistrées par `save_results`."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+# ============================================================================
+# 5. LIGNE DE COMMANDE
+# ============================================================================
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Point d'entrée: retourne 1 si une régression est détectée, 0 sinon."""
+    parser = argparse.ArgumentParser(
+        prog="python -m triangulator.benchmark",
+        description="Mesure les performances du Triangulator.",
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+        help="Nombres de points (ex: 1000 100000 10000000)",
+    )
+    parser.add_argument(
+        "--distributions", nargs="+", choices=list(DISTRIBUTIONS),
+        default=list(DISTRIBUTIONS),
+    )
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument(
+        "--no-memory", action="store_true",
+        help="Ne pas mesurer le pic mémoire (plus rapide)",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Fichier JSON où enregistrer les mesures")
+    parser.add_argument("--baseline", help="Fichier JSON de référence")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--import-time", action="store_true",
+        help="Mesurer seulement les temps d'import à froid des modules",
+    )
+    args = parser.parse_args(argv)
+
+    if args.import_time:
+        problems = []
+        for module in IMPORT_BUDGETS:
+            result = measure_import(module, args.repeat)
+            print(f"{module:<28} {result['seconds'] * 1000:8.1f} ms")
+            problems += check_import(result)
+        for problem in problems:
+            print(f"REGRESSION {problem}", file=sys.stderr)
+        return 1 if problems else 0
+
+    results = run_benchmark(
+        args.sizes, args.distributions, args.stages,
+        repeat=args.repeat, memory=not args.no_memory, seed=args.seed,
+        log=print,
+    )
+
+    if args.output:
+        save_results(args.output, results)
+
+    if args.baseline:
+        regressions = find_regressions(
+            results, load_results(args.baseline), args.tolerance
+        )
+        for r in regressions:
+            print(
+                f"REGRESSION {r['stage']} {r['distribution']} {r['size']}: "
+                f"{r['seconds']:.4f}s vs {r['baseline_seconds']:.4f}s "
+                f"(x{r['ratio']:.2f})",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Disjoncteur (circuit breaker) pour les appels au PointSetManager.
+
+Après `failure_threshold` échecs consécutifs (timeouts, erreurs réseau,
+erreurs 5xx), le circuit s'ouvre: les appels échouent immédiatement au lieu
+d'attendre le timeout, ce qui laisse les workers disponibles pendant un
+incident. Une fois `reset_timeout` écoulé, une sonde est lancée en
+arrière-plan; si elle réussit le circuit se referme, sinon il reste ouvert
+pour une nouvelle période.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+
+CLOSED = "closed"
+OPEN = "open"
+PROBING = "probing"
+
+
+class CircuitOpen(Exception):
+    """Appel refusé: le circuit est ouvert."""
+
+    def __init__(self, retry_after: int) -> None:
+        """Indique le délai conseillé avant de réessayer (en secondes)."""
+        super().__init__("Circuit ouvert")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Disjoncteur à sonde de rétablissement en arrière-plan."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        probe: Callable[[], bool] | None = None,
+        on_change: Callable[[str], None] | None = None,
+    ) -> None:
+        """Configure le disjoncteur.
+
+        Args:
+            failure_threshold: Échecs consécutifs avant ouverture
+            reset_timeout: Durée d'ouverture avant la sonde, en secondes
+            probe: Fonction testant le service distant (True s'il répond);
+                   sans sonde, le premier appel après `reset_timeout` sert
+                   de test
+            on_change: Fonction appelée avec le nouvel état à chaque transition
+
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe = probe
+        self.on_change = on_change
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            self.state = state
+            if self.on_change is not None:
+                self.on_change(state)
+
+    def _open(self) -> None:
+        self.opened_at = time.monotonic()
+        self._set_state(OPEN)
+
+    def retry_after(self) -> int:
+        """Délai restant avant la prochaine sonde, en secondes (au moins 1)."""
+        remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+        return max(1, int(remaining + 0.999))
+
+    def allow(self) -> bool:
+        """Indique si un appel peut être tenté, sans lancer de sonde."""
+        return self.state == CLOSED
+
+    def before_call(self) -> None:
+        """Vérifie qu'un appel peut être tenté.
+
+        Quand le circuit est ouvert depuis plus de `reset_timeout`, lance la
+        sonde en arrière-plan (ou, sans sonde, laisse passer cet appel).
+
+        Raises:
+            CircuitOpen: Si le circuit est ouvert ou en cours de sonde
+
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == PROBING:
+                raise CircuitOpen(1)
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                raise CircuitOpen(self.retry_after())
+            self._set_state(PROBING)
+            if self.probe is None:
+                # L'appel courant sert de test: son issue ferme ou rouvre le circuit
+                return
+
+        threading.Thread(
+            target=self.probe_now, name="circuit-breaker-probe", daemon=True
+        ).start()
+        raise CircuitOpen(1)
+
+    def probe_now(self) -> bool:
+        """Exécute la sonde et ferme ou rouvre le circuit selon son résultat."""
+        try:
+            healthy = bool(self.probe()) if self.probe is not None else False
+        except Exception:
+            healthy = False
+        if healthy:
+            self.record_success()
+        else:
+            with self._lock:
+                self._open()
+        return healthy
+
+    def record_success(self) -> None:
+        """Enregistre un appel réussi: le circuit se referme."""
+        with self._lock:
+            self.failures = 0
+            self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        """Enregistre un appel en échec; ouvre le circuit au seuil atteint."""
+        with self._lock:
+            self.failures += 1
+            if self.state == PROBING or self.failures >= self.failure_threshold:
+                self._open()
+
+    def reset(self) -> None:
+        """Referme le circuit et oublie les échecs passés."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = 0.0
+            self._set_state(CLOSED)
+
+    def snapshot(self) -> dict:
+        """Retourne l'état courant, sérialisable en JSON."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+            }
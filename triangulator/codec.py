@@ -0,0 +1,382 @@
+"""Formats binaires échangés avec le PointSetManager et les clients.
+
+Formats (petit-boutiste):
+    PointSet:  uint32 N, puis N × (float64 x, float64 y)
+    Triangles: PointSet des sommets, puis uint32 T, puis T × 3 uint32
+    Enveloppe: uint32 H, puis H × uint32 (indices des sommets)
+    Contraintes: uint32 B, puis B × 2 uint32 (arêtes du bord extérieur),
+                 uint32 K, puis K × 2 uint32 (arêtes des trous)
+
+Les coordonnées d'un PointSet doivent être finies: nan et ±inf sont
+refusés au décodage, comme une longueur invalide.
+
+Ce module ne dépend que de la bibliothèque standard: les outils en ligne de
+commande et les processus de calcul l'importent sans charger la couche web.
+"""
+
+import math
+import struct
+
+# Types
+Point = tuple[float, float]
+Triangle = tuple[int, int, int]
+Edge = tuple[int, int]
+
+BYTES_PER_POINT = 16
+BYTES_PER_TRIANGLE = 12
+BYTES_PER_INDEX = 4
+BYTES_PER_EDGE = 8
+HEADER_SIZE = 4
+
+
+# ============================================================================
+# 1. DÉCODAGE/ENCODAGE BINAIRE - POINTSET
+# ============================================================================
+
+
+def decode_pointset(binary_data: bytes) -> list[Point]:
+    """Décode un ensemble de points depuis un format binaire.
+
+    Format attendu:
+        uint32 N = nombre de points
+        N * (float64 x, float64 y)
+
+    Args:
+        binary_data: bytes contenant les données encodées
+
+    Returns:
+        list[Point]: Liste de tuples (x, y) où x, y sont des float64
+
+    Raises:
+        ValueError: Si le format binaire est invalide ou corrompu, ou si une
+                    coordonnée n'est pas finie (nan, ±inf)
+
+    """
+    if len(binary_data) < HEADER_SIZE:
+        raise ValueError(
+            f"Binaire trop court: au minimum {HEADER_SIZE} bytes attendus "
+            f"pour le header, reçu {len(binary_data)} bytes"
+        )
+
+    offset = 0
+
+    try:
+        (count,) = struct.unpack_from("<I", binary_data, offset)
+    except struct.error as e:
+        raise ValueError(f"Erreur lors de la lecture du nombre de points: {e}") from e
+
+    offset += HEADER_SIZE
+    expected_length = HEADER_SIZE + count * BYTES_PER_POINT
+    if len(binary_data) != expected_length:
+        raise ValueError(
+            f"Longueur invalide: attendu {expected_length} bytes pour "
+            f"{count} points, reçu {len(binary_data)} bytes"
+        )
+
+    points = []
+    for i in range(count):
+        try:
+            x, y = struct.unpack_from("<dd", binary_data, offset)
+        except struct.error as e:
+            raise ValueError(f"Erreur lors de la lecture du point {i}: {e}") from e
+        if not (math.isfinite(x) and math.isfinite(y)):
+            raise ValueError(non_finite_message(i, x, y))
+        offset += BYTES_PER_POINT
+        points.append((x, y))
+
+    return points
+
+
+def non_finite_message(index: int, x: float, y: float) -> str:
+    """Message d'erreur d'un point aux coordonnées non finies."""
+    return f"Coordonnée non finie pour le point {index}: ({x}, {y})"
+
+
+def read_point_count(binary_data: bytes) -> int:
+    """Lit le nombre de points annoncé par l'en-tête d'un PointSet.
+
+    Seuls les 4 premiers bytes sont lus: le reste du binaire n'est ni décodé
+    ni validé, ce qui permet d'estimer le coût d'un calcul avant de le lancer.
+
+    Args:
+        binary_data: bytes contenant les données encodées
+
+    Returns:
+        int: Nombre de points annoncé
+
+    Raises:
+        ValueError: Si le binaire est plus court que l'en-tête
+
+    """
+    if len(binary_data) < HEADER_SIZE:
+        raise ValueError(
+            f"Binaire trop court: au minimum {HEADER_SIZE} bytes attendus "
+            f"pour le header, reçu {len(binary_data)} bytes"
+        )
+    (count,) = struct.unpack_from("<I", binary_data, 0)
+    return count
+
+
+def encode_pointset(points: list[Point]) -> bytes:
+    """Encode un ensemble de points au format binaire.
+
+    Format:
+        uint32 N = nombre de points
+        N * (float64 x, float64 y)
+
+    Args:
+        points: Liste de tuples (x, y)
+
+    Returns:
+        bytes: Données encodées au format binaire
+
+    Raises:
+        ValueError: Si les points ne sont pas du format correct
+
+    """
+    try:
+        out = [struct.pack("<I", len(points))]
+        for x, y in points:
+            out.append(struct.pack("<dd", float(x), float(y)))
+        return b"".join(out)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Erreur lors de l'encodage des points: {e}") from e
+
+
+# ============================================================================
+# 2. DÉCODAGE/ENCODAGE BINAIRE - TRIANGLES
+# ============================================================================
+
+
+def decode_triangles(data: bytes) -> tuple[list[Point], list[Triangle]]:
+    """Décode les points et triangles depuis un format binaire complet.
+
+    Format:
+        uint32 N (nombre de points)
+        N * (float64 x, float64 y)
+        uint32 T (nombre de triangles)
+        T * (uint32 a, uint32 b, uint32 c)
+
+    Args:
+        data: bytes contenant les données encodées
+
+    Returns:
+        tuple[list[Point], list[Triangle]]: Points et triangles décodés
+
+    Raises:
+        ValueError: Si le format binaire est invalide ou corrompu
+
+    """
+    if len(data) < HEADER_SIZE:
+        raise ValueError("Binaire trop court: au minimum 4 bytes attendus")
+
+    offset = 0
+
+    try:
+        (count,) = struct.unpack_from("<I", data, offset)
+    except struct.error as e:
+        raise ValueError(f"Erreur lors de la lecture du nombre de points: {e}") from e
+
+    offset += HEADER_SIZE
+    points = []
+    for i in range(count):
+        if offset + BYTES_PER_POINT > len(data):
+            raise ValueError(
+                f"Données corrompues: point {i} incomplet, "
+                f"offset={offset}, len={len(data)}"
+            )
+        try:
+            x, y = struct.unpack_from("<dd", data, offset)
+        except struct.error as e:
+            raise ValueError(f"Erreur lors de la lecture du point {i}: {e}") from e
+        offset += BYTES_PER_POINT
+        points.append((x, y))
+
+    # Décoder les triangles
+    if offset + HEADER_SIZE > len(data):
+        raise ValueError("Données corrompues: nombre de triangles manquant")
+
+    try:
+        (tcount,) = struct.unpack_from("<I", data, offset)
+    except struct.error as e:
+        raise ValueError(
+            f"Erreur lors de la lecture du nombre de triangles: {e}"
+        ) from e
+    offset += HEADER_SIZE
+    triangles = []
+    for i in range(tcount):
+        if offset + BYTES_PER_TRIANGLE > len(data):
+            raise ValueError(
+                f"Données corrompues: triangle {i} incomplet, "
+                f"offset={offset}, len={len(data)}"
+            )
+        try:
+            a, b, c = struct.unpack_from("<III", data, offset)
+        except struct.error as e:
+            raise ValueError(f"Erreur lors de la lecture du triangle {i}: {e}") from e
+        offset += BYTES_PER_TRIANGLE
+        triangles.append((a, b, c))
+
+    if offset != len(data):
+        raise ValueError(
+            f"Données excédentaires: {len(data) - offset} bytes non lus après "
+            f"la fin des données attendues"
+        )
+
+    return points, triangles
+
+
+def encode_triangles(triangles: list[Triangle], vertices: list[Point]) -> bytes:
+    """Encode les points et triangles au format binaire complet.
+
+    Format:
+        uint32 N (nombre de points)
+        N * (float64 x, float64 y)
+        uint32 T (nombre de triangles)
+        T * (uint32 i, uint32 j, uint32 k)
+
+    Args:
+        triangles: Liste de tuples (a, b, c) représentant les indices de points
+        vertices: Liste de points (x, y)
+
+    Returns:
+        bytes: Données encodées au format binaire
+
+    Raises:
+        ValueError: Si les données ne sont pas du format correct
+
+    """
+    try:
+        out = [struct.pack("<I", len(vertices))]
+        for x, y in vertices:
+            out.append(struct.pack("<dd", float(x), float(y)))
+        out.append(struct.pack("<I", len(triangles)))
+        for a, b, c in triangles:
+            out.append(struct.pack("<III", int(a), int(b), int(c)))
+        return b"".join(out)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Erreur lors de l'encodage des triangles: {e}") from e
+
+
+def encode_hull(indices: list[int]) -> bytes:
+    """Encode les indices des sommets d'une enveloppe convexe.
+
+    Format:
+        uint32 H (nombre de sommets de l'enveloppe)
+        H * uint32 (indice du sommet dans le PointSet)
+
+    Args:
+        indices: Indices des sommets de l'enveloppe, dans l'ordre trigonométrique
+
+    Returns:
+        bytes: Données encodées au format binaire
+
+    Raises:
+        ValueError: Si les indices ne sont pas du format correct
+
+    """
+    try:
+        return struct.pack(f"<I{len(indices)}I", len(indices), *map(int, indices))
+    except (TypeError, ValueError, struct.error) as e:
+        raise ValueError(f"Erreur lors de l'encodage de l'enveloppe: {e}") from e
+
+
+def decode_hull(data: bytes) -> list[int]:
+    """Décode les indices d'une enveloppe convexe encodée par `encode_hull`.
+
+    Args:
+        data: bytes contenant les données encodées
+
+    Returns:
+        list[int]: Indices des sommets de l'enveloppe
+
+    Raises:
+        ValueError: Si le format binaire est invalide ou corrompu
+
+    """
+    if len(data) < HEADER_SIZE:
+        raise ValueError("Binaire trop court: au minimum 4 bytes attendus")
+
+    (count,) = struct.unpack_from("<I", data, 0)
+    expected_length = HEADER_SIZE + count * BYTES_PER_INDEX
+    if len(data) != expected_length:
+        raise ValueError(
+            f"Longueur invalide: attendu {expected_length} bytes pour "
+            f"{count} indices, reçu {len(data)} bytes"
+        )
+
+    return list(struct.unpack_from(f"<{count}I", data, HEADER_SIZE))
+
+
+# ============================================================================
+# 3. DÉCODAGE/ENCODAGE BINAIRE - CONTRAINTES
+# ============================================================================
+
+
+def encode_constraints(boundary: list[Edge], holes: list[Edge]) -> bytes:
+    """Encode les arêtes du bord et des trous d'un domaine.
+
+    Format:
+        uint32 B (nombre d'arêtes du bord extérieur)
+        B * (uint32 u, uint32 v)
+        uint32 K (nombre d'arêtes des trous)
+        K * (uint32 u, uint32 v)
+
+    Args:
+        boundary: Arêtes du bord extérieur (indices de points du PointSet)
+        holes: Arêtes des trous
+
+    Returns:
+        bytes: Données encodées au format binaire
+
+    Raises:
+        ValueError: Si les arêtes ne sont pas du format correct
+
+    """
+    try:
+        out = []
+        for edges in (boundary, holes):
+            out.append(struct.pack("<I", len(edges)))
+            for u, v in edges:
+                out.append(struct.pack("<II", int(u), int(v)))
+        return b"".join(out)
+    except (TypeError, ValueError, struct.error) as e:
+        raise ValueError(f"Erreur lors de l'encodage des contraintes: {e}") from e
+
+
+def decode_constraints(data: bytes) -> tuple[list[Edge], list[Edge]]:
+    """Décode les arêtes encodées par `encode_constraints`.
+
+    Args:
+        data: bytes contenant les données encodées
+
+    Returns:
+        tuple[list[Edge], list[Edge]]: Arêtes du bord et des trous
+
+    Raises:
+        ValueError: Si le format binaire est invalide ou corrompu
+
+    """
+    offset = 0
+    lists = []
+    for name in ("du bord", "des trous"):
+        if offset + HEADER_SIZE > len(data):
+            raise ValueError(f"Données corrompues: nombre d'arêtes {name} manquant")
+        (count,) = struct.unpack_from("<I", data, offset)
+        offset += HEADER_SIZE
+        end = offset + count * BYTES_PER_EDGE
+        if end > len(data):
+            raise ValueError(
+                f"Données corrompues: {count} arêtes {name} annoncées, "
+                f"{(len(data) - offset) // BYTES_PER_EDGE} présentes"
+            )
+        flat = struct.unpack_from(f"<{2 * count}I", data, offset)
+        lists.append(list(zip(flat[::2], flat[1::2], strict=True)))
+        offset = end
+
+    if offset != len(data):
+        raise ValueError(
+            f"Données excédentaires: {len(data) - offset} bytes non lus après "
+            f"la fin des données attendues"
+        )
+    return lists[0], lists[1]
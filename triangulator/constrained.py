@@ -0,0 +1,288 @@
+"""Triangulation de Delaunay contrainte d'un domaine à trous.
+
+Le domaine est décrit par des arêtes entre points du PointSet: celles du
+bord extérieur et celles des trous, formant des polygones fermés. Les
+arêtes sont imposées dans la triangulation de Delaunay (les triangles
+qu'elles traversent sont retirés et les deux cavités retriangulées), puis
+seuls les triangles intérieurs au bord et extérieurs aux trous sont gardés.
+
+Les arêtes sont ajoutées sans point de Steiner: un point du PointSet situé
+exactement sur une arête la coupe en deux, et deux arêtes qui se croisent
+sont refusées.
+"""
+
+from collections import deque
+from collections.abc import Iterator
+
+from triangulator.codec import Edge, Point, Triangle
+from triangulator.predicates import incircle, orient2d
+from triangulator.refine import _Mesh
+
+
+class _ConstrainedMesh(_Mesh):
+    """Triangulation dans laquelle des arêtes peuvent être imposées.
+
+    `fixed` contient les arêtes imposées (u < v), `incident[v]` un triangle
+    ayant v pour sommet.
+    """
+
+    def __init__(self, points: list[Point]) -> None:
+        super().__init__(points)
+        self.fixed: set[Edge] = set()
+        self.incident: dict[int, int] = {}
+
+    def build(self) -> None:
+        """Triangulation de Delaunay, puis index des triangles par sommet."""
+        super().build()
+        for t, tri in enumerate(self.tris):
+            if tri is not None:
+                for v in tri:
+                    self.incident[v] = t
+
+    def _around(self, a: int) -> Iterator[int]:
+        """Triangles ayant `a` pour sommet."""
+        start = t = self.incident[a]
+        while True:
+            yield t
+            tri = self.tris[t]
+            t = self.adj[t][(tri.index(a) + 1) % 3]
+            if t == start:
+                return
+            if t < 0:
+                break
+        # `a` est sur l'enveloppe: on repart dans l'autre sens
+        t = start
+        while True:
+            tri = self.tris[t]
+            t = self.adj[t][(tri.index(a) + 2) % 3]
+            if t < 0:
+                return
+            yield t
+
+    def insert_edge(self, a: int, b: int) -> None:
+        """Impose l'arête (a, b) dans la triangulation.
+
+        Raises:
+            ValueError: Si l'arête croise une arête déjà imposée
+
+        """
+        pending = [(a, b)]
+        while pending:
+            a, b = pending.pop()
+            crossed, left, right, stop = self._walk(a, b)
+            if stop != b:
+                # Sommet sur le segment: l'arête est imposée en deux fois
+                pending.append((stop, b))
+            if crossed:
+                self._replace(
+                    crossed,
+                    self._fill(a, stop, left) + self._fill(stop, a, right[::-1]),
+                )
+            self.fixed.add((min(a, stop), max(a, stop)))
+
+    def _walk(
+        self, a: int, b: int
+    ) -> tuple[list[int], list[int], list[int], int]:
+        """Parcourt les triangles traversés par le segment [a, b].
+
+        Returns:
+            tuple: (triangles traversés, sommets à gauche puis à droite de
+                   a → b, dans l'ordre de la marche, sommet d'arrivée: b, ou
+                   le premier sommet rencontré sur le segment)
+
+        Raises:
+            ValueError: Si le segment croise une arête imposée
+
+        """
+        pts = self.points
+        pa, pb = pts[a], pts[b]
+        for t in self._around(a):
+            tri = self.tris[t]
+            i = tri.index(a)
+            u, v = tri[(i + 1) % 3], tri[(i + 2) % 3]
+            for w in (u, v):
+                if w == b or (
+                    orient2d(pa, pb, pts[w]) == 0
+                    and (pts[w][0] - pa[0]) * (pb[0] - pa[0])
+                    + (pts[w][1] - pa[1]) * (pb[1] - pa[1]) > 0
+                ):
+                    return [], [], [], w
+            if orient2d(pa, pts[u], pb) > 0 and orient2d(pa, pts[v], pb) < 0:
+                break
+        else:  # pragma: no cover - triangulation incohérente
+            raise ValueError(f"Aucun triangle autour du sommet {a}")
+
+        crossed, right, left = [t], [u], [v]
+        while True:
+            u, v = right[-1], left[-1]
+            if (min(u, v), max(u, v)) in self.fixed:
+                raise ValueError(
+                    f"L'arête ({a}, {b}) croise l'arête imposée ({u}, {v})"
+                )
+            tri = self.tris[t]
+            t = self.adj[t][next(k for k in range(3) if tri[k] not in (u, v))]
+            crossed.append(t)
+            w = next(x for x in self.tris[t] if x != u and x != v)
+            if w == b:
+                return crossed, left, right, b
+            side = orient2d(pa, pb, pts[w])
+            if side > 0:
+                left.append(w)
+            elif side < 0:
+                right.append(w)
+            else:
+                return crossed, left, right, w
+
+    def _fill(self, a: int, b: int, chain: list[int]) -> list[Triangle]:
+        """Triangule le polygone bordé par (a, b) et `chain`, à gauche de a → b.
+
+        `chain` liste les sommets du polygone de a vers b. Chaque triangle
+        est formé avec le sommet dont le cercle circonscrit ne contient
+        aucun autre sommet du polygone, ce qui donne la triangulation de
+        Delaunay contrainte de la cavité.
+        """
+        pts = self.points
+        triangles = []
+        stack = [(a, b, chain)]
+        while stack:
+            a, b, chain = stack.pop()
+            if not chain:
+                continue
+            k = 0
+            for j in range(1, len(chain)):
+                if incircle(pts[a], pts[b], pts[chain[k]], pts[chain[j]]) > 0:
+                    k = j
+            c = chain[k]
+            triangles.append((a, b, c))
+            stack.append((a, c, chain[:k]))
+            stack.append((c, b, chain[k + 1:]))
+        return triangles
+
+    def _replace(self, removed: list[int], triangles: list[Triangle]) -> None:
+        """Remplace les triangles `removed` par `triangles`, de même bord."""
+        outer = {(u, v): n for u, v, n, _ in self._boundary(set(removed))}
+        for t in removed:
+            self.tris[t] = None
+            self.free.append(t)
+
+        by_edge: dict[Edge, tuple[int, int]] = {}
+        for a, b, c in triangles:
+            t = self._new(a, b, c)
+            for v in (a, b, c):
+                self.incident[v] = t
+            by_edge[(b, c)], by_edge[(c, a)], by_edge[(a, b)] = (t, 0), (t, 1), (t, 2)
+        for (u, v), (t, i) in by_edge.items():
+            if (v, u) in by_edge:
+                self.adj[t][i] = by_edge[(v, u)][0]
+            else:
+                n = outer[(u, v)]
+                self.adj[t][i] = n
+                if n >= 0:
+                    self._link(n, u, v, t)
+
+
+def _crossings(p: Point, points: list[Point], edges: list[Edge]) -> int:
+    """Nombre d'arêtes coupées par la demi-droite horizontale partant de `p`."""
+    x, y = p
+    count = 0
+    for u, v in edges:
+        (x1, y1), (x2, y2) = points[u], points[v]
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            count += 1
+    return count
+
+
+def _check_polygons(edges: list[Edge], point_count: int, name: str) -> None:
+    """Vérifie que les arêtes forment des polygones fermés de points valides.
+
+    Raises:
+        ValueError: Si un indice est hors du PointSet, une arête dégénérée,
+                    ou un sommet d'extrémité d'un nombre impair d'arêtes
+
+    """
+    degree: dict[int, int] = {}
+    for u, v in edges:
+        for w in (u, v):
+            if not 0 <= w < point_count:
+                raise ValueError(
+                    f"Arête {name} ({u}, {v}): indice {w} hors du PointSet "
+                    f"({point_count} points)"
+                )
+            degree[w] = degree.get(w, 0) + 1
+        if u == v:
+            raise ValueError(f"Arête {name} ({u}, {v}) dégénérée")
+    odd = sorted(w for w, d in degree.items() if d % 2)
+    if odd:
+        raise ValueError(
+            f"Les arêtes {name} ne forment pas des polygones fermés "
+            f"(sommets {odd[:5]})"
+        )
+
+
+def constrained_triangulation(
+    points: list[Point], boundary: list[Edge], holes: list[Edge]
+) -> list[Triangle]:
+    """Triangulation de Delaunay contrainte de l'intérieur d'un domaine.
+
+    Args:
+        points: Points du PointSet
+        boundary: Arêtes (indices de points) des polygones du bord extérieur
+        holes: Arêtes des polygones des trous
+
+    Returns:
+        list[Triangle]: Triangles intérieurs au bord et hors des trous, dans
+                        le sens trigonométrique, indexant `points`
+
+    Raises:
+        ValueError: Si les arêtes sont invalides, ne forment pas des
+                    polygones fermés, ou se croisent
+
+    """
+    if not boundary:
+        raise ValueError("Au moins une arête de bord est requise")
+    _check_polygons(boundary, len(points), "de bord")
+    _check_polygons(holes, len(points), "de trou")
+
+    mesh = _ConstrainedMesh(points)
+    mesh.build()
+    if not mesh.incident:
+        return []
+
+    # Points confondus: seul le premier est un sommet de la triangulation
+    canonical = {p: i for i, p in reversed(list(enumerate(points)))}
+    for u, v in boundary + holes:
+        u, v = canonical[points[u]], canonical[points[v]]
+        if u != v:
+            mesh.insert_edge(u, v)
+
+    # Régions délimitées par les arêtes imposées, classées d'après un point
+    # intérieur à l'un de leurs triangles
+    interior = []
+    seen: set[int] = set()
+    for seed, tri in enumerate(mesh.tris):
+        if tri is None or seed in seen:
+            continue
+        region = [seed]
+        seen.add(seed)
+        queue = deque([seed])
+        while queue:
+            t = queue.popleft()
+            tri = mesh.tris[t]
+            for i in range(3):
+                n = mesh.adj[t][i]
+                u, v = tri[(i + 1) % 3], tri[(i + 2) % 3]
+                if n < 0 or n in seen or (min(u, v), max(u, v)) in mesh.fixed:
+                    continue
+                seen.add(n)
+                region.append(n)
+                queue.append(n)
+
+        a, b, c = (points[v] for v in mesh.tris[seed])
+        center = ((a[0] + b[0] + c[0]) / 3.0, (a[1] + b[1] + c[1]) / 3.0)
+        if (
+            _crossings(center, points, boundary) % 2 == 1
+            and _crossings(center, points, holes) % 2 == 0
+        ):
+            interior.extend(region)
+
+    return [tuple(mesh.tris[t]) for t in sorted(interior)]
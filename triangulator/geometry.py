@@ -0,0 +1,122 @@
+"""Enveloppe convexe et triangulation d'un ensemble de points.
+
+Ce module ne dépend que de la bibliothèque standard (et des prédicats
+géométriques du paquet).
+"""
+
+from collections.abc import Iterable
+
+from triangulator.codec import Point, Triangle
+from triangulator.predicates import orient2d
+
+
+def convex_hull(points: list[Point]) -> list[int]:
+    """Enveloppe convexe d'un ensemble de points (chaîne monotone d'Andrew).
+
+    Complexité O(n log n), dominée par le tri des points. Les points
+    colinéaires situés sur une arête de l'enveloppe ne sont pas conservés;
+    la colinéarité est décidée exactement par `predicates.orient2d`.
+
+    Cas dégénérés:
+    - Aucun point: retourne une liste vide
+    - Tous les points confondus: retourne un seul indice
+    - Tous les points colinéaires: retourne les deux extrémités
+
+    Args:
+        points: Liste de points
+
+    Returns:
+        list[int]: Indices des sommets de l'enveloppe, dans l'ordre
+                   trigonométrique en partant du point le plus à gauche
+
+    """
+    order = sorted(range(len(points)), key=points.__getitem__)
+    if len(order) < 3:
+        # Dédoublonne les points confondus
+        return order[:1] if len({points[i] for i in order}) < 2 else order
+
+    lower: list[int] = []
+    for i in order:
+        p = points[i]
+        while (
+            len(lower) >= 2
+            and orient2d(points[lower[-2]], points[lower[-1]], p) <= 0
+        ):
+            lower.pop()
+        lower.append(i)
+
+    upper: list[int] = []
+    for i in reversed(order):
+        p = points[i]
+        while (
+            len(upper) >= 2
+            and orient2d(points[upper[-2]], points[upper[-1]], p) <= 0
+        ):
+            upper.pop()
+        upper.append(i)
+
+    hull = lower[:-1] + upper[:-1]
+    if len(hull) == 2 and points[hull[0]] == points[hull[1]]:
+        return hull[:1]
+    return hull
+
+
+def spans_area(points: Iterable[Point]) -> bool:
+    """Indique si les points ne sont pas tous alignés (ou confondus).
+
+    Équivaut à `len(convex_hull(points)) >= 3` pour des coordonnées finies
+    (les seules acceptées par `decode_pointset` et par le pipeline), avec
+    le même prédicat exact, sans trier les points: la recherche s'arrête au
+    premier point hors de la droite des deux premiers points distincts, en
+    pratique dès le troisième point. `points` peut être un itérateur lu à
+    la demande.
+    """
+    points = iter(points)
+    a = next(points, None)
+    b = None
+    for p in points:
+        if b is None:
+            if p != a:
+                b = p
+        elif orient2d(a, b, p) != 0:
+            return True
+    return False
+
+
+def triangulate(
+    points: list[Point], hull: list[int] | None = None
+) -> list[Triangle]:
+    """Calculate fan triangulation from a list of points.
+
+    Algorithme:
+    - Si < 3 points: retourne liste vide
+    - Si tous les points sont colinéaires (enveloppe convexe de moins de
+      3 sommets): retourne liste vide
+    - Sinon: crée une triangulation en éventail à partir du point 0
+
+    La triangulation en éventail connecte le premier point à toutes les
+    arêtes de la chaîne des autres points.
+
+    Exemple avec 4 points [0, 1, 2, 3]:
+        Triangles: (0,1,2), (0,2,3)
+
+    Args:
+        points: Liste de points à trianguler
+        hull: Enveloppe convexe déjà calculée par `convex_hull` (optionnel;
+              sinon la colinéarité est testée par `spans_area`)
+
+    Returns:
+        list[Triangle]: Liste de triangles (a, b, c) où a, b, c sont des indices
+
+    Raises:
+        ValueError: En cas d'erreur interne de calcul
+
+    """
+    n = len(points)
+    if n < 3:
+        return []
+
+    if not (spans_area(points) if hull is None else len(hull) >= 3):
+        return []
+
+    return [(0, i, i + 1) for i in range(1, n - 1)]
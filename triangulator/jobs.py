@@ -0,0 +1,253 @@
+"""Traitements asynchrones des triangulations volumineuses.
+
+Un job est soumis pour un PointSet, exécuté par un pool de workers local,
+et son résultat binaire est écrit sur disque. Le client interroge l'état
+du job (étape, progression) puis télécharge le résultat une fois terminé,
+sans garder de connexion HTTP ouverte pendant le calcul.
+
+Chaque job est décrit par un fichier `<id>.json` et, une fois réussi, son
+résultat est stocké dans `<id>.bin`. Les fichiers sont écrits de façon
+atomique et les jobs terminés restent consultables après un redémarrage.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Signature de la fonction de rapport de progression: (étape, fraction)
+Reporter = Callable[[str, float], None]
+
+
+class JobFailed(Exception):
+    """Échec d'un job, avec le code HTTP et le corps JSON à renvoyer."""
+
+    def __init__(self, status: int, body: dict) -> None:
+        """Associe un code HTTP au corps JSON de l'erreur."""
+        super().__init__(body.get("error"))
+        self.status = status
+        self.body = body
+
+
+class QueueFull(Exception):
+    """Trop de jobs en attente pour en accepter un nouveau."""
+
+
+@dataclass
+class Job:
+    """État d'un job, tel que renvoyé par l'API."""
+
+    jobId: str
+    pointSetId: str
+    status: str = QUEUED
+    stage: str = QUEUED
+    progress: float = 0.0
+    createdAt: float = field(default_factory=time.time)
+    startedAt: float | None = None
+    finishedAt: float | None = None
+    resultSize: int | None = None
+    errorStatus: int | None = None
+    error: dict | None = None
+
+    @property
+    def finished(self) -> bool:
+        """Indique si le job est terminé (succès ou échec)."""
+        return self.status in (SUCCEEDED, FAILED)
+
+
+class JobManager:
+    """Soumet les jobs au pool de workers et conserve leurs résultats."""
+
+    def __init__(
+        self,
+        store_dir: str,
+        workers: int = 2,
+        max_pending: int = 100,
+        retention: float = 24 * 3600,
+    ) -> None:
+        """Configure le gestionnaire.
+
+        Args:
+            store_dir: Répertoire des états et résultats des jobs
+            workers: Nombre de jobs exécutés simultanément
+            max_pending: Nombre maximal de jobs non terminés
+            retention: Durée de conservation d'un job terminé, en secondes
+
+        """
+        self.store_dir = store_dir
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self._jobs: dict[str, Job] = {}
+        self._futures: dict[str, Future] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Stockage
+    # ------------------------------------------------------------------
+
+    def _path(self, job_id: str, extension: str) -> str:
+        return os.path.join(self.store_dir, f"{job_id}.{extension}")
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _save(self, job: Job) -> None:
+        data = json.dumps(asdict(job)).encode("utf-8")
+        self._write_atomic(self._path(job.jobId, "json"), data)
+
+    def get(self, job_id: str) -> Job | None:
+        """Retourne l'état d'un job, en le relisant sur disque si besoin."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        if not all(c in "0123456789abcdef" for c in job_id):
+            return None
+        try:
+            with open(self._path(job_id, "json"), encoding="utf-8") as f:
+                job = Job(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+        if not job.finished:
+            # Job interrompu par un arrêt du service
+            job.status = job.stage = FAILED
+            job.errorStatus = 500
+            job.error = {"error": "Job interrupted", "details": "Service redémarré"}
+        return job
+
+    def result_path(self, job_id: str) -> str | None:
+        """Chemin du résultat d'un job réussi, ou None."""
+        job = self.get(job_id)
+        if job is None or job.status != SUCCEEDED:
+            return None
+        path = self._path(job_id, "bin")
+        return path if os.path.isfile(path) else None
+
+    def cleanup(self) -> None:
+        """Supprime les jobs terminés depuis plus longtemps que `retention`."""
+        now = time.time()
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished and now - (job.finishedAt or now) > self.retention
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+                self._futures.pop(job_id, None)
+        if not os.path.isdir(self.store_dir):
+            return
+        for name in os.listdir(self.store_dir):
+            path = os.path.join(self.store_dir, name)
+            try:
+                if now - os.path.getmtime(path) > self.retention:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Exécution
+    # ------------------------------------------------------------------
+
+    def pending(self) -> int:
+        """Nombre de jobs en attente ou en cours."""
+        with self._lock:
+            return sum(not job.finished for job in self._jobs.values())
+
+    def snapshot(self) -> dict:
+        """Retourne l'occupation des workers, sérialisable en JSON."""
+        with self._lock:
+            running = sum(job.status == RUNNING for job in self._jobs.values())
+            pending = sum(not job.finished for job in self._jobs.values())
+        return {
+            "workers": self.workers,
+            "running": running,
+            "queued": pending - running,
+            "max_pending": self.max_pending,
+        }
+
+    def submit(self, pointSetId: str, func: Callable[[Reporter], bytes]) -> Job:
+        """Soumet un job.
+
+        Args:
+            pointSetId: PointSet traité
+            func: Fonction exécutée par un worker; elle reçoit une fonction de
+                  rapport de progression et retourne le résultat binaire, ou
+                  lève `JobFailed`
+
+        Returns:
+            Job: État initial du job
+
+        Raises:
+            QueueFull: Si `max_pending` jobs sont déjà en attente ou en cours
+
+        """
+        self.cleanup()
+        job = Job(jobId=uuid.uuid4().hex, pointSetId=pointSetId)
+        with self._lock:
+            if sum(not j.finished for j in self._jobs.values()) >= self.max_pending:
+                raise QueueFull(f"{self.max_pending} jobs déjà en attente")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="triangulator-job"
+                )
+            self._jobs[job.jobId] = job
+            self._save(job)
+            self._futures[job.jobId] = self._executor.submit(self._run, job, func)
+        return job
+
+    def _run(self, job: Job, func: Callable[[Reporter], bytes]) -> None:
+        def report(stage: str, progress: float) -> None:
+            job.stage = stage
+            job.progress = progress
+            self._save(job)
+
+        job.status = RUNNING
+        job.startedAt = time.time()
+        report(RUNNING, 0.0)
+        try:
+            result = func(report)
+            self._write_atomic(self._path(job.jobId, "bin"), result)
+        except JobFailed as e:
+            job.status = job.stage = FAILED
+            job.errorStatus = e.status
+            job.error = e.body
+        except Exception as e:
+            job.status = job.stage = FAILED
+            job.errorStatus = 500
+            job.error = {"error": "Job failed", "details": str(e)}
+        else:
+            job.status = job.stage = SUCCEEDED
+            job.progress = 1.0
+            job.resultSize = len(result)
+        job.finishedAt = time.time()
+        self._save(job)
+
+    def wait(self, job_id: str, timeout: float | None = None) -> Job | None:
+        """Attend la fin d'un job soumis par ce processus et retourne son état."""
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout)
+        return self.get(job_id)
+
+    def shutdown(self) -> None:
+        """Arrête le pool de workers après les jobs en cours."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -0,0 +1,410 @@
+r"""Test de charge du service, avec un PointSetManager local simulé.
+
+Les tests de l'API simulent `requests.get` requête par requête: ils ne
+disent rien du débit ni des latences extrêmes du service réel. Ce module
+lance un PointSetManager simulé (`FakePointSetManager`), qui sert des
+PointSets générés de taille, latence et taux d'erreur configurables, puis
+envoie des requêtes `GET /triangulation/<pointSetId>` en parallèle, chaque
+client gardant sa connexion ouverte. Le rapport donne le débit (req/s),
+les latences p50/p95/p99, le taux d'erreur, et la répartition des codes
+de statut et des issues du cache (`X-Cache-Status`).
+
+Sans `--url`, le service est démarré dans le processus courant (serveur
+werkzeug multi-thread) et configuré pour interroger le PointSetManager
+simulé. Une instance existante doit avoir été configurée avec l'adresse
+du PointSetManager simulé (`--manager-port`).
+
+Usage:
+    python -m triangulator.loadtest --points 10000 --pointsets 20 \
+        --requests 2000 --concurrency 16
+    python -m triangulator.loadtest --latency 0.05 --error-rate 0.1 \
+        --output load.json --max-error-rate 0.2
+    python -m triangulator.loadtest --url http://localhost:5000 \
+        --manager-port 8001
+"""
+
+import argparse
+import http.client
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from triangulator.benchmark import DISTRIBUTIONS
+from triangulator.codec import encode_pointset
+
+DEFAULT_POINTS = 1_000
+DEFAULT_POINTSETS = 10
+DEFAULT_REQUESTS = 500
+DEFAULT_CONCURRENCY = 8
+REQUEST_TIMEOUT = 60
+
+# Identifiant sondé par le disjoncteur du service: toujours introuvable
+_PROBE_ID = str(uuid.UUID(int=0))
+
+
+# ============================================================================
+# 1. POINTSETMANAGER SIMULÉ
+# ============================================================================
+
+
+class FakePointSetManager:
+    """PointSetManager local servant des PointSets générés.
+
+    `GET /pointsets/<id>/binary` renvoie, après `latency` secondes, un
+    PointSet de `points` points tiré de la distribution choisie. Le
+    PointSet d'un identifiant est toujours le même (graine dérivée de
+    l'identifiant). Une fraction `error_rate` des requêtes reçoit une
+    erreur 503.
+    """
+
+    def __init__(
+        self,
+        points: int = DEFAULT_POINTS,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        distribution: str = "uniform",
+        seed: int = 42,
+        port: int = 0,
+    ) -> None:
+        """Prépare le serveur (démarré par `start`)."""
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Distribution inconnue: {distribution!r}")
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate doit être compris entre 0 et 1")
+        self.points = points
+        self.latency = latency
+        self.error_rate = error_rate
+        self.distribution = distribution
+        self.seed = seed
+        self.port = port
+        self.served = 0
+        self.injected_errors = 0
+        self._rng = random.Random(seed)
+        self._pointsets: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def url(self) -> str:
+        """Adresse du serveur démarré."""
+        if self._server is None:
+            raise RuntimeError("PointSetManager simulé non démarré")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def pointset(self, pointSetId: str) -> bytes:
+        """Binaire du PointSet servi pour un identifiant."""
+        with self._lock:
+            data = self._pointsets.get(pointSetId)
+        if data is None:
+            rng = random.Random(f"{self.seed}:{pointSetId}")
+            data = encode_pointset(DISTRIBUTIONS[self.distribution](self.points, rng))
+            with self._lock:
+                self._pointsets[pointSetId] = data
+        return data
+
+    def _respond(self, path: str) -> tuple[int, bytes]:
+        """Statut et corps de la réponse à `GET path`."""
+        parts = path.strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "pointsets" or parts[2] != "binary":
+            return 404, b""
+        if parts[1] == _PROBE_ID:
+            return 404, b""
+        if self.latency > 0:
+            time.sleep(self.latency)
+        with self._lock:
+            self.served += 1
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.injected_errors += 1
+        if fail:
+            return 503, b""
+        return 200, self.pointset(parts[1])
+
+    def start(self) -> "FakePointSetManager":
+        """Démarre le serveur dans un thread."""
+        manager = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                status, body = manager._respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, name="fake-pointset-manager",
+            daemon=True,
+        ).start()
+        return self
+
+    def stop(self) -> None:
+        """Arrête le serveur."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakePointSetManager":
+        """Démarre le serveur."""
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        """Arrête le serveur."""
+        self.stop()
+
+
+@contextmanager
+def local_service(manager_url: str) -> Iterator[str]:
+    """Démarre le service dans ce processus, branché sur `manager_url`.
+
+    Le cache des résultats est vidé au démarrage; l'adresse du
+    PointSetManager est restaurée à l'arrêt.
+
+    Yields:
+        str: Adresse du service
+
+    """
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    from triangulator import triangulator as service
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args: object) -> None:
+            pass
+
+    previous = service.POINTSET_MANAGER_URL
+    service.POINTSET_MANAGER_URL = manager_url
+    service.result_cache.clear()
+    server = make_server(
+        "127.0.0.1", 0, service.app, threaded=True, request_handler=QuietHandler
+    )
+    thread = threading.Thread(
+        target=server.serve_forever, name="triangulator-loadtest", daemon=True
+    )
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        thread.join()
+        service.POINTSET_MANAGER_URL = previous
+
+
+# ============================================================================
+# 2. GÉNÉRATION DE LA CHARGE
+# ============================================================================
+
+
+def pointset_ids(count: int, seed: int = 42) -> list[str]:
+    """Génère les identifiants (UUID) des PointSets demandés, reproductibles."""
+    rng = random.Random(seed)
+    return [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(count)]
+
+
+def run_load(
+    url: str,
+    ids: list[str],
+    requests: int = DEFAULT_REQUESTS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    seed: int = 42,
+) -> dict:
+    """Envoie `requests` requêtes de triangulation avec `concurrency` clients.
+
+    Chaque client garde sa connexion HTTP ouverte (keep-alive) et tire les
+    identifiants au hasard parmi `ids`; une erreur réseau est comptée avec
+    le statut 0, et la connexion est rouverte.
+
+    Returns:
+        dict: Rapport de `summarize`
+
+    """
+    target = urlsplit(url)
+    remaining = iter(range(requests))
+    lock = threading.Lock()
+    samples: list[tuple[float, int, str | None]] = []
+
+    def client(index: int) -> None:
+        rng = random.Random(f"{seed}:{index}")
+        connection = None
+        local = []
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    break
+            path = f"/triangulation/{rng.choice(ids)}"
+            start = time.perf_counter()
+            try:
+                if connection is None:
+                    connection = http.client.HTTPConnection(
+                        target.hostname, target.port, timeout=REQUEST_TIMEOUT
+                    )
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+                cache = response.getheader("X-Cache-Status")
+            except (OSError, http.client.HTTPException):
+                if connection is not None:
+                    connection.close()
+                connection = None
+                status, cache = 0, None
+            local.append((time.perf_counter() - start, status, cache))
+        if connection is not None:
+            connection.close()
+        with lock:
+            samples.extend(local)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(client, i) for i in range(concurrency)]:
+            future.result()
+    return summarize(samples, time.perf_counter() - start)
+
+
+# ============================================================================
+# 3. RAPPORT
+# ============================================================================
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Percentile par rang le plus proche d'une liste triée (0 si vide)."""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(values)))
+    return values[rank - 1]
+
+
+def summarize(samples: list[tuple[float, int, str | None]], seconds: float) -> dict:
+    """Rapport d'un test de charge.
+
+    Args:
+        samples: (latence en secondes, statut HTTP ou 0, X-Cache-Status)
+        seconds: Durée totale du test
+
+    Returns:
+        dict: requests, seconds, requests_per_second, error_rate, latency
+              (p50, p95, p99 et max, en secondes), statuses et cache
+
+    """
+    latencies = sorted(s[0] for s in samples)
+    errors = sum(1 for _, status, _ in samples if not 200 <= status < 400)
+    return {
+        "requests": len(samples),
+        "seconds": seconds,
+        "requests_per_second": len(samples) / seconds if seconds else 0.0,
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "latency": {
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+        "statuses": {
+            str(k): v for k, v in sorted(Counter(s[1] for s in samples).items())
+        },
+        "cache": dict(sorted(Counter(s[2] or "-" for s in samples).items())),
+    }
+
+
+def format_summary(summary: dict) -> str:
+    """Représentation lisible d'un rapport."""
+    latency = summary["latency"]
+    return "\n".join([
+        f"{summary['requests']} requêtes en {summary['seconds']:.2f} s "
+        f"({summary['requests_per_second']:.1f} req/s)",
+        "latence  p50 {:.1f} ms  p95 {:.1f} ms  p99 {:.1f} ms  max {:.1f} ms".format(
+            *(latency[k] * 1000 for k in ("p50", "p95", "p99", "max"))
+        ),
+        f"erreurs  {summary['error_rate']:.1%}",
+        "statuts  " + ", ".join(f"{k}: {v}" for k, v in summary["statuses"].items()),
+        "cache    " + ", ".join(f"{k}: {v}" for k, v in summary["cache"].items()),
+    ])
+
+
+# ============================================================================
+# 4. LIGNE DE COMMANDE
+# ============================================================================
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Point d'entrée: retourne 1 si le taux d'erreur dépasse le seuil, 0 sinon."""
+    parser = argparse.ArgumentParser(
+        prog="python -m triangulator.loadtest",
+        description="Test de charge du Triangulator.",
+    )
+    parser.add_argument("--url",
+                        help="instance à tester (défaut: service local démarré ici)")
+    parser.add_argument("--manager-port", type=int, default=0,
+                        help="port du PointSetManager simulé (défaut: libre)")
+    parser.add_argument("--points", type=int, default=DEFAULT_POINTS,
+                        help="nombre de points de chaque PointSet")
+    parser.add_argument("--distribution", choices=list(DISTRIBUTIONS),
+                        default="uniform")
+    parser.add_argument("--pointsets", type=int, default=DEFAULT_POINTSETS,
+                        help="nombre de PointSets distincts demandés")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="latence du PointSetManager simulé, en secondes")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction des appels au PointSetManager en erreur")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="fichier JSON où enregistrer le rapport")
+    parser.add_argument("--max-error-rate", type=float,
+                        help="taux d'erreur au-delà duquel le test échoue")
+    args = parser.parse_args(argv)
+
+    manager = FakePointSetManager(
+        args.points, args.latency, args.error_rate, args.distribution,
+        args.seed, args.manager_port,
+    )
+    ids = pointset_ids(args.pointsets, args.seed)
+    with manager:
+        print(f"PointSetManager simulé: {manager.url}", file=sys.stderr)
+        if args.url is not None:
+            summary = run_load(args.url, ids, args.requests, args.concurrency,
+                               args.seed)
+        else:
+            with local_service(manager.url) as url:
+                summary = run_load(url, ids, args.requests, args.concurrency,
+                                   args.seed)
+    summary["upstream"] = {
+        "served": manager.served, "injected_errors": manager.injected_errors
+    }
+
+    print(format_summary(summary))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    if args.max_error_rate is not None and summary["error_rate"] > args.max_error_rate:
+        print(
+            f"ÉCHEC taux d'erreur {summary['error_rate']:.1%} > "
+            f"{args.max_error_rate:.1%}",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Niveaux de détail: décimation d'un ensemble de points par grille.
+
+À faible zoom, une triangulation complète est plus détaillée que ce que le
+client peut afficher. La décimation regroupe les points par cellule d'une
+grille régulière couvrant leur boîte englobante et ne garde, pour chaque
+cellule occupée, que le point le plus proche du barycentre de la cellule:
+la forme du nuage est conservée avec au plus `max_vertices` points.
+
+Les budgets demandés sont arrondis à une puissance de deux (`level_budget`)
+pour que les résultats puissent être mis en cache par niveau.
+"""
+
+import math
+
+from triangulator.codec import Point
+
+# Plus petit budget de sommets d'un niveau de détail
+MIN_VERTICES = 4
+
+# Précision de la recherche de la taille des cellules: la taille retenue
+# est au plus _GROWTH fois plus grande que nécessaire
+_GROWTH = 1.1
+
+
+def level_budget(max_vertices: int) -> int:
+    """Budget du niveau de détail servant une demande de `max_vertices`.
+
+    Returns:
+        int: Plus grande puissance de deux inférieure ou égale à
+             `max_vertices`
+
+    Raises:
+        ValueError: Si `max_vertices` est inférieur à `MIN_VERTICES`
+
+    """
+    if max_vertices < MIN_VERTICES:
+        raise ValueError(
+            f"Budget de sommets trop petit: au minimum {MIN_VERTICES}, "
+            f"reçu {max_vertices}"
+        )
+    return 1 << (max_vertices.bit_length() - 1)
+
+
+def _cells(
+    points: list[Point], x0: float, y0: float, size: float
+) -> list[tuple[int, int]]:
+    """Cellule de chaque point, pour des cellules de côté `size`."""
+    return [
+        (math.floor((x - x0) / size), math.floor((y - y0) / size))
+        for x, y in points
+    ]
+
+
+def decimate(points: list[Point], max_vertices: int) -> list[int]:
+    """Choisit au plus `max_vertices` points représentatifs, par grille.
+
+    La taille des cellules part d'un minorant de celle qu'il faut (grille
+    de `max_vertices` cellules sur la boîte englobante, ou sur son plus
+    grand côté si elle est très allongée) et grandit par facteurs de
+    `_GROWTH`: recherche exponentielle, puis dichotomique, entre ce
+    minorant et une cellule couvrant toute la boîte. Le nombre de passes,
+    chacune en O(n), est ainsi en O(log log max_vertices), quelle que soit
+    la forme du nuage.
+
+    Args:
+        points: Points à décimer
+        max_vertices: Nombre maximal de points conservés
+
+    Returns:
+        list[int]: Indices croissants des points conservés
+
+    Raises:
+        ValueError: Si `max_vertices` est inférieur à 1
+
+    """
+    if max_vertices < 1:
+        raise ValueError("max_vertices doit être strictement positif")
+    if len(points) <= max_vertices:
+        return list(range(len(points)))
+
+    x0 = min(x for x, _ in points)
+    y0 = min(y for _, y in points)
+    width = max(x for x, _ in points) - x0
+    height = max(y for _, y in points) - y0
+    side = max(width, height)
+    if side == 0:
+        # Tous les points sont confondus
+        return [0]
+    start = max(math.sqrt(width * height / max_vertices), side / max_vertices)
+
+    # Taille start * _GROWTH**k; au-delà de `last`, les cellules dépassent
+    # deux fois la boîte et tous les points tombent dans la même
+    last = max(1, math.ceil(math.log(2 * side / start, _GROWTH)))
+
+    def fits(k: int) -> list[tuple[int, int]] | None:
+        keys = _cells(points, x0, y0, start * _GROWTH ** k)
+        return keys if len(set(keys)) <= max_vertices else None
+
+    keys = fits(0)
+    if keys is None:
+        low, high, step = 0, last, 1
+        while step < last:
+            keys = fits(step)
+            if keys is not None:
+                high = step
+                break
+            low, step = step, 2 * step
+        if keys is None:
+            keys = fits(high)
+        while high - low > 1:
+            middle = (low + high) // 2
+            candidate = fits(middle)
+            if candidate is None:
+                low = middle
+            else:
+                high, keys = middle, candidate
+
+    sums: dict[tuple[int, int], list[float]] = {}
+    for key, (x, y) in zip(keys, points, strict=True):
+        cell = sums.get(key)
+        if cell is None:
+            sums[key] = [x, y, 1]
+        else:
+            cell[0] += x
+            cell[1] += y
+            cell[2] += 1
+
+    best: dict[tuple[int, int], tuple[float, int]] = {}
+    for i, (key, (x, y)) in enumerate(zip(keys, points, strict=True)):
+        sx, sy, count = sums[key]
+        d = (x - sx / count) ** 2 + (y - sy / count) ** 2
+        if key not in best or d < best[key][0]:
+            best[key] = (d, i)
+    return sorted(i for _, i in best.values())
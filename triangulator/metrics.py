@@ -0,0 +1,262 @@
+"""Métriques du service au format d'exposition texte de Prometheus.
+
+Implémentation minimale, sans dépendance, des trois types de métriques
+utilisés par le Triangulator: compteurs, jauges et histogrammes, avec
+étiquettes. Chaque série est protégée par son propre verrou, ce qui limite
+le coût d'une observation sur le chemin critique à quelques opérations.
+
+Exemple:
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requêtes", ["status"])
+    requests.labels("200").inc()
+    print(registry.render())
+"""
+
+import bisect
+import math
+import threading
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+DEFAULT_SIZE_BUCKETS = tuple(float(1024 * 4 ** i) for i in range(11))
+
+
+def _escape(value: str) -> str:
+    """Échappe une valeur d'étiquette."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """Valeur numérique formatée (entiers sans décimale, infinis)."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    """Ensemble d'étiquettes formaté `{nom="valeur",...}`."""
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True))
+    return "{" + pairs + "}"
+
+
+class _Value:
+    """Série simple (compteur ou jauge) protégée par un verrou."""
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Incrémente la série."""
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Décrémente la série."""
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        """Remplace la valeur de la série."""
+        with self._lock:
+            self.value = value
+
+
+class _HistogramValue:
+    """Série d'histogramme: compte par intervalle, somme et nombre."""
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Enregistre une observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @property
+    def count(self) -> int:
+        """Nombre total d'observations."""
+        return sum(self.counts)
+
+
+class _Metric:
+    """Métrique nommée, déclinée en une série par combinaison d'étiquettes."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_series(self) -> object:
+        raise NotImplementedError
+
+    def labels(self, *values: object):
+        """Retourne la série associée aux valeurs d'étiquettes données."""
+        key = tuple(str(v) for v in values)
+        series = self._series.get(key)
+        if series is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name}: {len(self.labelnames)} étiquettes attendues, "
+                    f"{len(key)} reçues"
+                )
+            with self._lock:
+                series = self._series.setdefault(key, self._new_series())
+        return series
+
+    def clear(self) -> None:
+        """Supprime toutes les séries."""
+        with self._lock:
+            self._series.clear()
+
+    def _samples(self):
+        """Énumère les échantillons (suffixe, noms, valeurs, valeur)."""
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        """Lignes d'exposition de la métrique."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for suffix, names, values, value in self._samples():
+            lines.append(
+                f"{self.name}{suffix}{_format_labels(names, values)} "
+                f"{_format_value(value)}"
+            )
+        return lines
+
+
+class Counter(_Metric):
+    """Compteur monotone."""
+
+    type_name = "counter"
+
+    def _new_series(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Incrémente la série sans étiquette."""
+        self.labels().inc(amount)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._series.items())
+        for key, series in items:
+            yield "", self.labelnames, key, series.value
+
+
+class Gauge(Counter):
+    """Valeur instantanée, qui peut augmenter ou diminuer."""
+
+    type_name = "gauge"
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Décrémente la série sans étiquette."""
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        """Remplace la valeur de la série sans étiquette."""
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    """Distribution d'observations par intervalles cumulés."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames=(),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        """Déclare un histogramme aux bornes `buckets` (triées, sans +Inf)."""
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_series(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Enregistre une observation dans la série sans étiquette."""
+        self.labels().observe(value)
+
+    def _samples(self):
+        names = self.labelnames + ("le",)
+        with self._lock:
+            items = sorted(self._series.items())
+        for key, series in items:
+            with series._lock:
+                counts = list(series.counts)
+                total = series.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts, strict=False):
+                cumulative += count
+                yield "_bucket", names, key + (_format_value(bound),), cumulative
+            cumulative += counts[-1]
+            yield "_bucket", names, key + ("+Inf",), cumulative
+            yield "_sum", self.labelnames, key, total
+            yield "_count", self.labelnames, key, cumulative
+
+
+class Registry:
+    """Ensemble de métriques exposées ensemble."""
+
+    def __init__(self) -> None:
+        """Initialise un registre vide."""
+        self._metrics: list[_Metric] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if any(m.name == metric.name for m in self._metrics):
+            raise ValueError(f"Métrique déjà déclarée: {metric.name}")
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        """Déclare un compteur."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        """Déclare une jauge."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames=(),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Déclare un histogramme."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def reset(self) -> None:
+        """Remet toutes les métriques à zéro (utile pour les tests)."""
+        for metric in self._metrics:
+            metric.clear()
+
+    def render(self) -> str:
+        """Exposition texte de toutes les métriques."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
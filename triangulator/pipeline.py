@@ -0,0 +1,258 @@
+"""Pipeline fusionné: binaire PointSet → binaire Triangles.
+
+L'enchaînement `decode_pointset` → `triangulate` → `encode_triangles`
+matérialise une liste de points, puis une liste de triangles, avant de
+construire le binaire de sortie. Ce pipeline va directement d'un tampon
+à l'autre:
+
+- la section des sommets du format Triangles est identique au format
+  PointSet: le binaire reçu y est recopié tel quel;
+- les indices de l'éventail sont écrits par blocs de `CHUNK_TRIANGLES`
+  triangles dans un `array('I')`, puis dans le `bytearray` de sortie
+  alloué une seule fois à sa taille finale.
+
+La mémoire de travail est donc la sortie plus un bloc d'indices, quelle
+que soit la taille du PointSet; `peak_bytes` en donne la borne, utilisée
+pour dimensionner les workers.
+"""
+
+import math
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+
+from triangulator.codec import (
+    BYTES_PER_INDEX,
+    BYTES_PER_POINT,
+    BYTES_PER_TRIANGLE,
+    HEADER_SIZE,
+    non_finite_message,
+    read_point_count,
+)
+from triangulator.geometry import spans_area
+
+# Triangles écrits par bloc d'indices
+CHUNK_TRIANGLES = 1 << 14
+
+# Petits objets de travail (vues, itérateurs), comptés dans `peak_bytes`
+_OVERHEAD_BYTES = 4096
+
+
+def check_length(data: bytes) -> int:
+    """Nombre de points d'un PointSet dont la longueur a été vérifiée.
+
+    Raises:
+        ValueError: Si le binaire est plus court que l'en-tête ou si sa
+                    longueur ne correspond pas au nombre de points annoncé
+
+    """
+    count = read_point_count(data)
+    expected_length = HEADER_SIZE + count * BYTES_PER_POINT
+    if len(data) != expected_length:
+        raise ValueError(
+            f"Longueur invalide: attendu {expected_length} bytes pour "
+            f"{count} points, reçu {len(data)} bytes"
+        )
+    return count
+
+
+def _check_finite(data: bytes, count: int) -> None:
+    """Vérifie que toutes les coordonnées sont finies, comme `decode_pointset`.
+
+    Les coordonnées sont lues par blocs dans un `array('d')` et sommées: la
+    somme d'un bloc n'est finie que si toutes ses coordonnées le sont (nan
+    et ±inf se propagent). Un bloc de somme non finie, par débordement ou
+    par une coordonnée non finie, est vérifié point par point.
+
+    Raises:
+        ValueError: Si une coordonnée n'est pas finie
+
+    """
+    block = array("d")
+    with memoryview(data) as view:
+        for start in range(0, count, CHUNK_TRIANGLES):
+            end = min(count, start + CHUNK_TRIANGLES)
+            del block[:]
+            with view[HEADER_SIZE + start * BYTES_PER_POINT:
+                      HEADER_SIZE + end * BYTES_PER_POINT] as points:
+                block.frombytes(points)
+            if sys.byteorder == "big":
+                block.byteswap()
+            if math.isfinite(sum(block)):
+                continue
+            for i in range(end - start):
+                x, y = block[2 * i], block[2 * i + 1]
+                if not (math.isfinite(x) and math.isfinite(y)):
+                    raise ValueError(non_finite_message(start + i, x, y))
+
+
+def triangle_count(data: bytes, hull: Sequence[int] | None = None) -> int:
+    """Nombre de triangles de l'éventail d'un PointSet binaire.
+
+    La colinéarité est décidée comme par `geometry.triangulate`: par la
+    taille de l'enveloppe fournie, sinon par `geometry.spans_area`. Un
+    PointSet aux coordonnées non finies est refusé, comme au décodage.
+
+    Args:
+        data: Binaire PointSet
+        hull: Enveloppe convexe déjà calculée (optionnel; seule sa taille
+              est utilisée)
+
+    Raises:
+        ValueError: Si le binaire est invalide
+
+    """
+    count = check_length(data)
+    _check_finite(data, count)
+    if count < 3:
+        return 0
+    if hull is not None:
+        has_area = len(hull) >= 3
+    else:
+        # Points lus un à un dans le binaire, sans liste intermédiaire
+        has_area = spans_area(
+            struct.iter_unpack("<dd", memoryview(data)[HEADER_SIZE:])
+        )
+    return count - 2 if has_area else 0
+
+
+def peak_bytes(data: bytes) -> int:
+    """Borne de la mémoire allouée par `triangulate_pointset` pour `data`.
+
+    Sortie (entrée recopiée, puis triangles), bloc d'indices, colonne
+    d'indices en cours d'écriture et petits objets de travail, hors binaire
+    d'entrée. La borne suppose un éventail complet, sans lire les points.
+
+    Raises:
+        ValueError: Si le binaire est plus court que l'en-tête
+
+    """
+    count = read_point_count(data)
+    triangles = max(0, count - 2)
+    chunk = min(triangles, CHUNK_TRIANGLES)
+    return (
+        HEADER_SIZE + count * BYTES_PER_POINT
+        + HEADER_SIZE + triangles * BYTES_PER_TRIANGLE
+        + chunk * (BYTES_PER_TRIANGLE + BYTES_PER_INDEX)
+        + _OVERHEAD_BYTES
+    )
+
+
+def fan_output_size(data: bytes) -> int:
+    """Taille du binaire Triangles d'un éventail complet, sans lire les points.
+
+    C'est la taille exacte du résultat si les points ne sont pas tous
+    alignés, un majorant sinon: de quoi allouer la sortie avant de décider
+    la colinéarité.
+
+    Raises:
+        ValueError: Si le binaire est invalide
+
+    """
+    count = check_length(data)
+    return _output_size(count, max(0, count - 2))
+
+
+def output_size(data: bytes, hull: Sequence[int] | None = None) -> int:
+    """Taille du binaire Triangles produit pour le PointSet `data`.
+
+    Raises:
+        ValueError: Si le binaire est invalide
+
+    """
+    return _output_size(check_length(data), triangle_count(data, hull))
+
+
+def _output_size(count: int, tcount: int) -> int:
+    return (
+        HEADER_SIZE + count * BYTES_PER_POINT
+        + HEADER_SIZE + tcount * BYTES_PER_TRIANGLE
+    )
+
+
+def triangulate_pointset(
+    data: bytes, hull: Sequence[int] | None = None
+) -> bytearray:
+    """Triangule un PointSet binaire et encode le résultat, sans intermédiaire.
+
+    Produit le même binaire que `encode_triangles(triangulate(points),
+    points)` pour `points = decode_pointset(data)`.
+
+    Args:
+        data: Binaire PointSet (bytes, bytearray, memoryview ou mmap)
+        hull: Enveloppe convexe déjà calculée par `convex_hull` (optionnel;
+              seule sa taille est utilisée)
+
+    Returns:
+        bytearray: Binaire Triangles
+
+    Raises:
+        ValueError: Si le binaire est invalide
+
+    """
+    count = check_length(data)
+    tcount = triangle_count(data, hull)
+    out = bytearray(_output_size(count, tcount))
+    _write(data, out, count, tcount)
+    return out
+
+
+def triangulate_into(
+    data: bytes, out: bytearray | memoryview, hull: Sequence[int] | None = None
+) -> int:
+    """Comme `triangulate_pointset`, mais écrit dans un tampon existant.
+
+    Le tampon peut être une vue sur un segment de mémoire partagée: aucune
+    vue n'est conservée après le retour, le segment peut être fermé.
+
+    Args:
+        data: Binaire PointSet
+        out: Tampon inscriptible d'au moins `output_size(data)` bytes
+        hull: Enveloppe convexe déjà calculée (optionnel; seule sa taille
+              est utilisée)
+
+    Returns:
+        int: Nombre de bytes écrits au début de `out`
+
+    Raises:
+        ValueError: Si le binaire est invalide ou le tampon trop petit
+
+    """
+    count = check_length(data)
+    tcount = triangle_count(data, hull)
+    size = _output_size(count, tcount)
+    if len(out) < size:
+        raise ValueError(
+            f"Tampon de sortie trop petit: {size} bytes attendus, "
+            f"{len(out)} disponibles"
+        )
+    _write(data, out, count, tcount)
+    return size
+
+
+def _write(
+    data: bytes, out: bytearray | memoryview, count: int, tcount: int
+) -> None:
+    """Écrit le binaire Triangles de `data` au début de `out`."""
+    offset = HEADER_SIZE + count * BYTES_PER_POINT
+    block = array("I", [0]) * (3 * min(tcount, CHUNK_TRIANGLES))
+    # Écritures via memoryview: une affectation de tranche de bytearray
+    # recopierait d'abord la source dans un bytearray temporaire. Les vues
+    # sont libérées en sortie, même en cas d'erreur.
+    with memoryview(out) as view, memoryview(block).cast("B") as block_bytes:
+        view[:offset] = data
+        struct.pack_into("<I", view, offset, tcount)
+        offset += HEADER_SIZE
+
+        # Triangle i (à partir de 1): (0, i, i + 1). Le bloc est réutilisé:
+        # sa première colonne reste nulle, les deux autres sont réécrites.
+        for start in range(1, tcount + 1, CHUNK_TRIANGLES):
+            size = min(CHUNK_TRIANGLES, tcount + 1 - start)
+            block[1:3 * size:3] = array("I", range(start, start + size))
+            block[2:3 * size:3] = array("I", range(start + 1, start + size + 1))
+            if sys.byteorder == "big":
+                block.byteswap()
+            end = offset + size * BYTES_PER_TRIANGLE
+            view[offset:end] = block_bytes[:size * BYTES_PER_TRIANGLE]
+            offset = end
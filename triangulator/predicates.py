@@ -0,0 +1,164 @@
+"""Prédicats géométriques robustes.
+
+Les tests d'orientation et d'appartenance au cercle circonscrit sont d'abord
+évalués en flottants, puis validés par une borne d'erreur statique (filtre de
+Shewchuk). Lorsque le filtre ne permet pas de conclure, c'est-à-dire pour des
+points quasi dégénérés ou quand le résultat flottant est nul ou non fini
+(produit arrondi à zéro, dépassement de capacité), le calcul est refait en
+arithmétique exacte avec `fractions.Fraction`: le signe du résultat est
+alors toujours exact, quelle que soit l'échelle des coordonnées.
+"""
+
+import math
+import sys
+from fractions import Fraction
+
+Point = tuple[float, float]
+
+_EPSILON = 2.0 ** -53
+_ORIENT2D_ERRBOUND = (3.0 + 16.0 * _EPSILON) * _EPSILON
+_INCIRCLE_ERRBOUND = (10.0 + 96.0 * _EPSILON) * _EPSILON
+_SMALLEST = 5e-324
+# Erreur absolue des produits passés sous les flottants normaux (2^-1075
+# par produit), qui échappe à la borne relative du filtre
+_UNDERFLOW_ERRBOUND = 2.0 ** -1073
+
+
+def _exact_to_float(value: Fraction) -> float:
+    """Convertit un résultat exact en flottant sans perdre son signe."""
+    try:
+        result = float(value)
+    except OverflowError:
+        return sys.float_info.max if value > 0 else -sys.float_info.max
+    if result == 0.0 and value != 0:
+        return math.copysign(_SMALLEST, value)
+    return result
+
+
+def orient2d(a: Point, b: Point, c: Point) -> float:
+    """Orientation du triplet (a, b, c).
+
+    Args:
+        a: Premier point
+        b: Deuxième point
+        c: Troisième point
+
+    Returns:
+        float: Valeur positive si a, b, c tournent dans le sens
+               trigonométrique, négative dans le sens horaire, nulle s'ils
+               sont colinéaires. Le signe est exact pour des coordonnées
+               finies, même si des produits intermédiaires débordent ou
+               passent sous les flottants normaux; la valeur approche le
+               double de l'aire signée.
+
+    """
+    detleft = (a[0] - c[0]) * (b[1] - c[1])
+    detright = (a[1] - c[1]) * (b[0] - c[0])
+    det = detleft - detright
+
+    if detleft > 0.0 >= detright or detleft < 0.0 <= detright:
+        # Produits de signes opposés: pas d'élimination
+        errbound = _UNDERFLOW_ERRBOUND
+    else:
+        detsum = abs(detleft) + abs(detright)
+        errbound = _ORIENT2D_ERRBOUND * detsum + _UNDERFLOW_ERRBOUND
+    # Un résultat nul ou non fini (produit sous-normal arrondi à zéro,
+    # dépassement de capacité) ne permet pas de conclure
+    if errbound < abs(det) < math.inf:
+        return det
+    if det == 0.0 and (a[0] == c[0] or b[1] == c[1]) and (
+        a[1] == c[1] or b[0] == c[0]
+    ):
+        # Deux produits exactement nuls
+        return 0.0
+    try:
+        return _orient2d_exact(a, b, c)
+    except (OverflowError, ValueError):
+        # Coordonnées non finies (inf, nan): pas d'évaluation exacte possible
+        return det
+
+
+def _orient2d_exact(a: Point, b: Point, c: Point) -> float:
+    """Évalue `orient2d` en arithmétique exacte."""
+    ax, ay = Fraction(a[0]), Fraction(a[1])
+    bx, by = Fraction(b[0]), Fraction(b[1])
+    cx, cy = Fraction(c[0]), Fraction(c[1])
+    return _exact_to_float((ax - cx) * (by - cy) - (ay - cy) * (bx - cx))
+
+
+def incircle(a: Point, b: Point, c: Point, d: Point) -> float:
+    """Position de d par rapport au cercle circonscrit au triangle (a, b, c).
+
+    Args:
+        a: Premier sommet du triangle, orienté dans le sens trigonométrique
+        b: Deuxième sommet
+        c: Troisième sommet
+        d: Point testé
+
+    Returns:
+        float: Valeur positive si d est strictement à l'intérieur du cercle,
+               négative s'il est à l'extérieur, nulle s'il est sur le cercle.
+               Le signe est inversé si (a, b, c) est orienté dans le sens
+               horaire. Le signe est exact pour des coordonnées finies,
+               même si des produits intermédiaires débordent ou passent
+               sous les flottants normaux.
+
+    """
+    adx, ady = a[0] - d[0], a[1] - d[1]
+    bdx, bdy = b[0] - d[0], b[1] - d[1]
+    cdx, cdy = c[0] - d[0], c[1] - d[1]
+
+    bdxcdy = bdx * cdy
+    cdxbdy = cdx * bdy
+    alift = adx * adx + ady * ady
+
+    cdxady = cdx * ady
+    adxcdy = adx * cdy
+    blift = bdx * bdx + bdy * bdy
+
+    adxbdy = adx * bdy
+    bdxady = bdx * ady
+    clift = cdx * cdx + cdy * cdy
+
+    det = (
+        alift * (bdxcdy - cdxbdy)
+        + blift * (cdxady - adxcdy)
+        + clift * (adxbdy - bdxady)
+    )
+
+    permanent = (
+        (abs(bdxcdy) + abs(cdxbdy)) * alift
+        + (abs(cdxady) + abs(adxcdy)) * blift
+        + (abs(adxbdy) + abs(bdxady)) * clift
+    )
+    # Erreur absolue des produits passés sous les flottants normaux: au plus
+    # 2^-1075 par produit, propagée par les facteurs de degré 2
+    underflow = _UNDERFLOW_ERRBOUND * (
+        alift + blift + clift
+        + abs(bdxcdy) + abs(cdxbdy)
+        + abs(cdxady) + abs(adxcdy)
+        + abs(adxbdy) + abs(bdxady)
+        + 3.0
+    )
+    errbound = _INCIRCLE_ERRBOUND * permanent + underflow
+    if det != 0.0 and math.isfinite(det) and (det > errbound or -det > errbound):
+        return det
+    try:
+        return _incircle_exact(a, b, c, d)
+    except (OverflowError, ValueError):
+        # Coordonnées non finies (inf, nan): pas d'évaluation exacte possible
+        return det
+
+
+def _incircle_exact(a: Point, b: Point, c: Point, d: Point) -> float:
+    """Évalue `incircle` en arithmétique exacte."""
+    dx, dy = Fraction(d[0]), Fraction(d[1])
+    adx, ady = Fraction(a[0]) - dx, Fraction(a[1]) - dy
+    bdx, bdy = Fraction(b[0]) - dx, Fraction(b[1]) - dy
+    cdx, cdy = Fraction(c[0]) - dx, Fraction(c[1]) - dy
+    det = (
+        (adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+        + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+        + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady)
+    )
+    return _exact_to_float(det)
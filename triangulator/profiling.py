@@ -0,0 +1,236 @@
+"""Profilage à la demande du traitement d'un PointSet.
+
+Le profilage est désactivé par défaut. Une fois activé (interrupteur
+d'administration), il s'applique aux requêtes qui le demandent par un
+en-tête, ainsi qu'à une fraction tirée au hasard des autres requêtes.
+
+Chaque capture est enregistrée dans son propre répertoire:
+    meta.json      Identifiant, PointSet, durée, pic mémoire, statut HTTP
+    profile.pstats Profil `cProfile` (lisible avec `pstats`)
+    memory.txt     Principales allocations relevées par `tracemalloc`
+    pointset.bin   Binaire du PointSet reçu, pour rejouer la requête
+
+Rejouer une capture hors ligne:
+    python -m triangulator.profiling <répertoire de capture>
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import shutil
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+MEMORY_TOP_LINES = 25
+
+
+class ProfileCapture:
+    """Profil d'une requête, en cours de capture puis enregistré sur disque."""
+
+    def __init__(self, profiler: "Profiler", pointSetId: str) -> None:
+        """Prépare une capture pour le PointSet `pointSetId`."""
+        self.profiler = profiler
+        self.pointSetId = pointSetId
+        self.id = f"{datetime.now():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+        self.input_data: bytes | None = None
+        self.status: int | None = None
+        self.seconds = 0.0
+        self.peak_bytes: int | None = None
+        self._profile = cProfile.Profile()
+        self._snapshot = None
+        self._owns_tracemalloc = False
+
+    def __enter__(self) -> "ProfileCapture":
+        """Démarre `tracemalloc` (s'il n'est pas déjà actif) et `cProfile`."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Arrête les mesures et libère le profileur."""
+        try:
+            self._profile.disable()
+            self.seconds = time.perf_counter() - self._start
+            _, self.peak_bytes = tracemalloc.get_traced_memory()
+            self._snapshot = tracemalloc.take_snapshot()
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+        finally:
+            self.profiler._release()
+
+    def save(self) -> str:
+        """Enregistre la capture et retourne son répertoire."""
+        path = os.path.join(self.profiler.output_dir, self.id)
+        os.makedirs(path, exist_ok=True)
+
+        self._profile.dump_stats(os.path.join(path, "profile.pstats"))
+
+        if self._snapshot is not None:
+            stats = self._snapshot.statistics("lineno")[:MEMORY_TOP_LINES]
+            with open(os.path.join(path, "memory.txt"), "w", encoding="utf-8") as f:
+                f.write("\n".join(str(stat) for stat in stats) + "\n")
+
+        if self.input_data is not None:
+            with open(os.path.join(path, "pointset.bin"), "wb") as f:
+                f.write(self.input_data)
+
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "id": self.id,
+                "pointSetId": self.pointSetId,
+                "status": self.status,
+                "seconds": self.seconds,
+                "peak_bytes": self.peak_bytes,
+                "input_bytes": (
+                    len(self.input_data) if self.input_data is not None else None
+                ),
+            }, f, indent=2)
+
+        self.profiler._prune()
+        return path
+
+
+class Profiler:
+    """Décide quelles requêtes profiler et où enregistrer les captures.
+
+    Une seule capture peut être active à la fois: `cProfile` ne supporte
+    pas plusieurs profileurs simultanés, et profiler en parallèle fausserait
+    les mesures. Une requête qui arrive pendant une capture n'est pas profilée.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        enabled: bool = False,
+        sample_rate: float = 0.0,
+        max_captures: int = 50,
+    ) -> None:
+        """Configure le profileur (désactivé par défaut)."""
+        self.output_dir = output_dir
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.max_captures = max_captures
+        self._busy = threading.Lock()
+
+    def start(self, pointSetId: str, requested: bool = False) -> ProfileCapture | None:
+        """Retourne une capture si la requête doit être profilée, sinon None.
+
+        Args:
+            pointSetId: PointSet traité par la requête
+            requested: La requête demande explicitement à être profilée
+
+        """
+        if not self.enabled:
+            return None
+        if not requested and random.random() >= self.sample_rate:
+            return None
+        if not self._busy.acquire(blocking=False):
+            return None
+        return ProfileCapture(self, pointSetId)
+
+    def _release(self) -> None:
+        self._busy.release()
+
+    def captures(self) -> list[str]:
+        """Retourne les identifiants des captures, par ordre chronologique."""
+        if not os.path.isdir(self.output_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.output_dir)
+            if os.path.isfile(os.path.join(self.output_dir, name, "meta.json"))
+        )
+
+    def _prune(self) -> None:
+        """Supprime les captures les plus anciennes au-delà de `max_captures`."""
+        captures = self.captures()
+        for name in captures[:max(0, len(captures) - self.max_captures)]:
+            shutil.rmtree(os.path.join(self.output_dir, name), ignore_errors=True)
+
+    def settings(self) -> dict:
+        """Retourne la configuration courante, sérialisable en JSON."""
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "max_captures": self.max_captures,
+            "output_dir": self.output_dir,
+        }
+
+    def configure(self, settings: dict) -> None:
+        """Met à jour la configuration à partir d'un dictionnaire.
+
+        Raises:
+            ValueError: Si une clé est inconnue ou une valeur invalide
+
+        """
+        unknown = set(settings) - {"enabled", "sample_rate", "max_captures"}
+        if unknown:
+            raise ValueError(f"Paramètres inconnus: {', '.join(sorted(unknown))}")
+
+        enabled = settings.get("enabled", self.enabled)
+        sample_rate = settings.get("sample_rate", self.sample_rate)
+        max_captures = settings.get("max_captures", self.max_captures)
+        if not isinstance(enabled, bool):
+            raise ValueError("enabled doit être un booléen")
+        if (
+            isinstance(sample_rate, bool)
+            or not isinstance(sample_rate, (int, float))
+            or not 0.0 <= sample_rate <= 1.0
+        ):
+            raise ValueError("sample_rate doit être compris entre 0 et 1")
+        if (
+            isinstance(max_captures, bool)
+            or not isinstance(max_captures, int)
+            or max_captures < 1
+        ):
+            raise ValueError("max_captures doit être un entier positif")
+
+        self.enabled = enabled
+        self.sample_rate = float(sample_rate)
+        self.max_captures = max_captures
+
+
+def replay(capture_dir: str, limit: int = 30) -> str:
+    """Rejoue une capture sous `cProfile` et retourne le rapport.
+
+    Args:
+        capture_dir: Répertoire d'une capture contenant `pointset.bin`
+        limit: Nombre de fonctions affichées dans le rapport
+
+    Returns:
+        str: Statistiques triées par temps cumulé
+
+    """
+    from triangulator.codec import decode_pointset, encode_triangles
+    from triangulator.geometry import convex_hull, triangulate
+
+    with open(os.path.join(capture_dir, "pointset.bin"), "rb") as f:
+        data = f.read()
+
+    profile = cProfile.Profile()
+    profile.enable()
+    points = decode_pointset(data)
+    hull = convex_hull(points)
+    encode_triangles(triangulate(points, hull), points)
+    profile.disable()
+
+    out = io.StringIO()
+    pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m triangulator.profiling <répertoire>", file=sys.stderr)
+        sys.exit(2)
+    print(replay(sys.argv[1]))
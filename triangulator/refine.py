@@ -0,0 +1,538 @@
+"""Triangulation de Delaunay et raffinement de qualité (Ruppert).
+
+La triangulation en éventail de `geometry.triangulate` produit des triangles
+très aplatis, inutilisables tels quels par un calcul par éléments finis. Ce
+module construit la triangulation de Delaunay de l'enveloppe convexe, puis
+insère des points de Steiner à la manière de l'algorithme de Ruppert:
+
+- une arête de l'enveloppe dont le cercle diamétral contient un sommet est
+  coupée en son milieu;
+- un triangle dont le plus petit angle est inférieur à `min_angle`, ou dont
+  l'aire dépasse `max_area`, reçoit un sommet en son centre circonscrit (ou,
+  si ce centre empiète sur une arête de l'enveloppe, c'est l'arête qui est
+  coupée).
+
+Le nombre de points insérés est plafonné par `max_points`, ce qui borne le
+temps de calcul même lorsque la qualité demandée est inaccessible (angles
+aigus de l'enveloppe, `min_angle` au-delà des ~20.7° garantis par Ruppert).
+
+Les sommets d'origine conservent leurs indices; les points de Steiner sont
+ajoutés à la suite. Les tests géométriques utilisent les prédicats robustes
+de `predicates`, la triangulation reste donc cohérente même pour des points
+quasi dégénérés.
+"""
+
+import math
+from collections import deque
+
+from triangulator.codec import Point, Triangle
+from triangulator.predicates import incircle, orient2d
+
+DEFAULT_MIN_ANGLE = 20.0
+DEFAULT_MAX_POINTS = 10_000
+
+# Nombre maximal de triangles visités par la recherche d'un point avant de
+# basculer sur un parcours exhaustif
+_WALK_LIMIT = 10_000
+
+
+class _Mesh:
+    """Triangulation avec adjacences, modifiable par insertion de points.
+
+    `tris[t]` contient les sommets du triangle t dans le sens trigonométrique
+    (None si l'emplacement est libre), `adj[t][i]` le triangle voisin par
+    l'arête opposée au sommet `tris[t][i]` (-1 sur l'enveloppe).
+    """
+
+    def __init__(self, points: list[Point]) -> None:
+        self.points = list(points)
+        self.tris: list[list[int] | None] = []
+        self.adj: list[list[int]] = []
+        self.free: list[int] = []
+
+    # ------------------------------------------------------------------
+    # Structure
+    # ------------------------------------------------------------------
+
+    def _new(self, a: int, b: int, c: int) -> int:
+        if self.free:
+            t = self.free.pop()
+            self.tris[t] = [a, b, c]
+            self.adj[t] = [-1, -1, -1]
+        else:
+            t = len(self.tris)
+            self.tris.append([a, b, c])
+            self.adj.append([-1, -1, -1])
+        return t
+
+    def _link(self, t: int, a: int, b: int, n: int) -> None:
+        """Déclare `n` voisin de `t` par l'arête (a, b) de `t`."""
+        tri = self.tris[t]
+        for i in range(3):
+            if tri[i] != a and tri[i] != b:
+                self.adj[t][i] = n
+                return
+
+    def _relink(self, n: int, old: int, new: int) -> None:
+        """Remplace le voisin `old` de `n` par `new`."""
+        if n < 0:
+            return
+        neighbors = self.adj[n]
+        for i in range(3):
+            if neighbors[i] == old:
+                neighbors[i] = new
+                return
+
+    def triangles(self) -> list[Triangle]:
+        """Triangles de la triangulation."""
+        return [(t[0], t[1], t[2]) for t in self.tris if t is not None]
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    def build(self) -> None:
+        """Triangule l'enveloppe convexe des points, puis la rend Delaunay.
+
+        Les points sont ajoutés par abscisse croissante: chaque nouveau point
+        est hors de l'enveloppe courante et se relie aux arêtes qu'il voit.
+        Les arêtes sont ensuite basculées (Lawson) jusqu'à obtenir la
+        triangulation de Delaunay. Les points confondus ne sont utilisés
+        qu'une fois.
+        """
+        pts = self.points
+        order = sorted(
+            {p: i for i, p in reversed(list(enumerate(pts)))}.values(),
+            key=pts.__getitem__,
+        )
+        if len(order) < 3:
+            return
+
+        # Premier point non colinéaire aux deux premiers
+        k = 2
+        a, b = pts[order[0]], pts[order[1]]
+        while k < len(order) and orient2d(a, b, pts[order[k]]) == 0:
+            k += 1
+        if k == len(order):
+            return
+
+        # Éventail du point order[k] sur la chaîne colinéaire order[:k]
+        apex = order[k]
+        chain = order[:k]
+        if orient2d(pts[chain[0]], pts[chain[1]], pts[apex]) < 0:
+            chain.reverse()
+        # Enveloppe: liste doublement chaînée dans le sens trigonométrique,
+        # avec le triangle bordant chaque arête (u, nxt[u])
+        nxt: dict[int, int] = {}
+        prv: dict[int, int] = {}
+        edge_tri: dict[int, int] = {}
+        previous = -1
+        for u, v in zip(chain, chain[1:], strict=False):
+            t = self._new(u, v, apex)
+            if previous >= 0:
+                self._link(t, u, apex, previous)
+                self._link(previous, u, apex, t)
+            previous = t
+            nxt[u], prv[v], edge_tri[u] = v, u, t
+        first, last = chain[0], chain[-1]
+        nxt[last], prv[apex] = apex, last
+        edge_tri[last] = previous
+        nxt[apex], prv[first] = first, apex
+        edge_tri[apex] = self.tris.index([first, chain[1], apex])
+
+        start = apex
+        for q in order[k + 1:]:
+            p = pts[q]
+            # Le dernier point ajouté est le plus à droite de l'enveloppe: q,
+            # plus à droite encore, voit au moins une de ses deux arêtes
+            lo = start
+            while orient2d(pts[prv[lo]], pts[lo], p) < 0:
+                lo = prv[lo]
+            hi = start
+            while orient2d(pts[hi], pts[nxt[hi]], p) < 0:
+                hi = nxt[hi]
+            previous = first_new = -1
+            u = lo
+            while u != hi:
+                v = nxt[u]
+                t = self._new(v, u, q)
+                outer = edge_tri[u]
+                self._link(t, u, v, outer)
+                self._link(outer, u, v, t)
+                if previous >= 0:
+                    self._link(t, u, q, previous)
+                    self._link(previous, u, q, t)
+                else:
+                    first_new = t
+                previous = t
+                if u != lo:
+                    del nxt[u], prv[u], edge_tri[u]
+                u = v
+            nxt[lo], prv[q], edge_tri[lo] = q, lo, first_new
+            nxt[q], prv[hi], edge_tri[q] = hi, q, previous
+            start = q
+
+        self._legalize([
+            (t, i) for t in range(len(self.tris)) for i in range(3)
+            if self.adj[t][i] > t
+        ])
+
+    def _legalize(self, edges: list[tuple[int, int]]) -> None:
+        """Bascule les arêtes non Delaunay (Lawson) jusqu'à stabilité."""
+        pts = self.points
+        stack = [(t, self.tris[t][(i + 1) % 3], self.tris[t][(i + 2) % 3])
+                 for t, i in edges]
+        while stack:
+            t, b, c = stack.pop()
+            tri = self.tris[t]
+            if tri is None or b not in tri or c not in tri:
+                continue
+            i = next(j for j in range(3) if tri[j] != b and tri[j] != c)
+            u = self.adj[t][i]
+            if u < 0:
+                continue
+            a, b, c = tri[i], tri[(i + 1) % 3], tri[(i + 2) % 3]
+            other = self.tris[u]
+            d = next(v for v in other if v != b and v != c)
+            if incircle(pts[a], pts[b], pts[c], pts[d]) <= 0:
+                continue
+
+            n_ab = self.adj[t][(i + 2) % 3]
+            n_ca = self.adj[t][(i + 1) % 3]
+            # `other` vaut (d, c, b) à rotation près
+            j = other.index(d)
+            n_bd = self.adj[u][(j + 1) % 3]
+            n_dc = self.adj[u][(j + 2) % 3]
+
+            self.tris[t] = [a, b, d]
+            self.adj[t] = [n_bd, u, n_ab]
+            self.tris[u] = [a, d, c]
+            self.adj[u] = [n_dc, n_ca, t]
+            self._relink(n_bd, u, t)
+            self._relink(n_ca, t, u)
+            stack.extend([(t, b, d), (t, a, b), (u, d, c), (u, c, a)])
+
+    # ------------------------------------------------------------------
+    # Insertion de points
+    # ------------------------------------------------------------------
+
+    def locate(self, p: Point, start: int) -> tuple[int, int]:
+        """Triangle contenant `p`, par marche depuis le triangle `start`.
+
+        Returns:
+            tuple: (triangle, -1) si `p` est dans la triangulation (ou sur
+                   son bord), (triangle, i) si `p` est hors de l'enveloppe,
+                   au-delà de l'arête opposée au sommet i de ce triangle
+
+        """
+        pts = self.points
+        t = start
+        for _ in range(_WALK_LIMIT):
+            tri = self.tris[t]
+            for i in range(3):
+                u, v = tri[(i + 1) % 3], tri[(i + 2) % 3]
+                if orient2d(pts[u], pts[v], p) < 0:
+                    if self.adj[t][i] < 0:
+                        return t, i
+                    t = self.adj[t][i]
+                    break
+            else:
+                return t, -1
+        # Marche trop longue: parcours exhaustif
+        outside = (start, -1)
+        for t, tri in enumerate(self.tris):
+            if tri is None:
+                continue
+            sides = [
+                orient2d(pts[tri[(i + 1) % 3]], pts[tri[(i + 2) % 3]], p)
+                for i in range(3)
+            ]
+            if min(sides) >= 0:
+                return t, -1
+            for i in range(3):
+                if sides[i] < 0 and self.adj[t][i] < 0:
+                    outside = (t, i)
+        return outside
+
+    def cavity(
+        self, p: Point, t: int, split: tuple[int, int] | None = None
+    ) -> list[int]:
+        """Triangles à remplacer pour insérer `p`, situé dans le triangle `t`.
+
+        Ce sont les triangles dont le cercle circonscrit contient `p`
+        (Bowyer-Watson), à l'exception de ceux qui rendraient la cavité non
+        étoilée depuis `p` (points alignés sur l'enveloppe): chaque arête du
+        bord doit voir `p` strictement à sa gauche, sauf l'arête d'enveloppe
+        `split` que `p` coupe.
+
+        Returns:
+            list[int]: Triangles de la cavité; vide si `p` ne peut pas être
+                       inséré sans créer de triangle dégénéré
+
+        """
+        pts = self.points
+        cavity = {t}
+        queue = deque([t])
+        while queue:
+            for n in self.adj[queue.popleft()]:
+                if n < 0 or n in cavity:
+                    continue
+                a, b, c = self.tris[n]
+                if incircle(pts[a], pts[b], pts[c], p) > 0:
+                    cavity.add(n)
+                    queue.append(n)
+
+        while True:
+            blocking = {
+                owner for u, v, n, owner in self._boundary(cavity)
+                if (u, v) != split and orient2d(pts[u], pts[v], p) <= 0
+            }
+            if not blocking:
+                return list(cavity)
+            if t in blocking:
+                return []
+            cavity -= blocking
+
+    def _boundary(self, cavity: set[int]) -> list[tuple[int, int, int, int]]:
+        """Arêtes (u, v, voisin extérieur, triangle) du bord d'une cavité."""
+        edges = []
+        for t in cavity:
+            tri = self.tris[t]
+            for i in range(3):
+                n = self.adj[t][i]
+                if n not in cavity:
+                    edges.append((tri[(i + 1) % 3], tri[(i + 2) % 3], n, t))
+        return edges
+
+    def insert(
+        self, p: Point, cavity: list[int], split: tuple[int, int] | None = None
+    ) -> list[int]:
+        """Insère `p` en retriangulant la cavité (étoilée depuis `p`).
+
+        Si `split` est donnée, `p` est le milieu de cette arête d'enveloppe,
+        qui est remplacée par les deux demi-arêtes (le milieu arrondi peut
+        être très légèrement hors de l'arête).
+
+        Returns:
+            list[int]: Triangles créés
+
+        """
+        if not cavity:
+            return []
+        pts = self.points
+        q = len(pts)
+        pts.append(p)
+        edges = self._boundary(set(cavity))
+        for t in cavity:
+            self.tris[t] = None
+            self.free.append(t)
+
+        by_start: dict[int, int] = {}
+        by_end: dict[int, int] = {}
+        created = []
+        for u, v, n, _ in edges:
+            if (u, v) == split:
+                continue
+            t = self._new(u, v, q)
+            self.adj[t][2] = n
+            if n >= 0:
+                self._link(n, u, v, t)
+            by_start[u], by_end[v] = t, t
+            created.append(t)
+        for t in created:
+            u, v, _ = self.tris[t]
+            self.adj[t][0] = by_start.get(v, -1)
+            self.adj[t][1] = by_end.get(u, -1)
+        return created
+
+
+# ============================================================================
+# Qualité des triangles
+# ============================================================================
+
+
+def _area(a: Point, b: Point, c: Point) -> float:
+    return abs(orient2d(a, b, c)) / 2.0
+
+
+def _circumcenter(a: Point, b: Point, c: Point) -> Point | None:
+    """Centre du cercle circonscrit, ou None si le triangle est dégénéré."""
+    bx, by = b[0] - a[0], b[1] - a[1]
+    cx, cy = c[0] - a[0], c[1] - a[1]
+    d = 2.0 * (bx * cy - by * cx)
+    if d == 0.0:
+        return None
+    b2, c2 = bx * bx + by * by, cx * cx + cy * cy
+    x = a[0] + (cy * b2 - by * c2) / d
+    y = a[1] + (bx * c2 - cx * b2) / d
+    if not (math.isfinite(x) and math.isfinite(y)):
+        return None
+    return (x, y)
+
+
+def _dist2(a: Point, b: Point) -> float:
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2
+
+
+def _encroaches(p: Point, a: Point, b: Point) -> bool:
+    """Indique si `p` est strictement dans le cercle diamétral de [a, b]."""
+    return (a[0] - p[0]) * (b[0] - p[0]) + (a[1] - p[1]) * (b[1] - p[1]) < 0
+
+
+def min_angle(a: Point, b: Point, c: Point) -> float:
+    """Plus petit angle du triangle (a, b, c), en degrés."""
+    la, lb, lc = (math.sqrt(_dist2(b, c)), math.sqrt(_dist2(c, a)),
+                  math.sqrt(_dist2(a, b)))
+    angles = []
+    for opposite, s1, s2 in ((la, lb, lc), (lb, lc, la), (lc, la, lb)):
+        if s1 == 0 or s2 == 0:
+            return 0.0
+        cos = (s1 * s1 + s2 * s2 - opposite * opposite) / (2 * s1 * s2)
+        angles.append(math.degrees(math.acos(max(-1.0, min(1.0, cos)))))
+    return min(angles)
+
+
+# ============================================================================
+# Raffinement
+# ============================================================================
+
+
+def delaunay(points: list[Point]) -> list[Triangle]:
+    """Triangulation de Delaunay de l'enveloppe convexe des points.
+
+    Returns:
+        list[Triangle]: Triangles dans le sens trigonométrique; liste vide si
+                        les points sont moins de 3 ou tous colinéaires
+
+    """
+    mesh = _Mesh(points)
+    mesh.build()
+    return mesh.triangles()
+
+
+def refine(
+    points: list[Point],
+    min_angle: float = DEFAULT_MIN_ANGLE,
+    max_area: float | None = None,
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> tuple[list[Point], list[Triangle]]:
+    """Triangulation de Delaunay raffinée par insertion de points de Steiner.
+
+    Args:
+        points: Points à trianguler
+        min_angle: Plus petit angle visé, en degrés (0 pour l'ignorer)
+        max_area: Aire maximale d'un triangle (None pour l'ignorer)
+        max_points: Nombre maximal de points de Steiner insérés
+
+    Returns:
+        tuple: (sommets, triangles): les sommets d'origine, à leurs indices,
+               suivis des points insérés
+
+    Raises:
+        ValueError: Si un paramètre est invalide
+
+    """
+    if not 0.0 <= min_angle < 60.0:
+        raise ValueError("min_angle doit être compris entre 0 et 60 degrés")
+    if max_area is not None and not max_area > 0:
+        raise ValueError("max_area doit être strictement positive")
+    if max_points < 0:
+        raise ValueError("max_points doit être positif")
+
+    mesh = _Mesh(points)
+    mesh.build()
+    pts = mesh.points
+    # Rapport rayon circonscrit / plus petite arête au-delà duquel le plus
+    # petit angle est inférieur à min_angle
+    ratio2 = (
+        1.0 / (2.0 * math.sin(math.radians(min_angle))) ** 2 if min_angle > 0
+        else math.inf
+    )
+    budget = len(pts) + max_points
+
+    def is_bad(tri: list[int]) -> bool:
+        a, b, c = (pts[v] for v in tri)
+        area = _area(a, b, c)
+        if max_area is not None and area > max_area:
+            return True
+        if ratio2 == math.inf:
+            return False
+        shortest2 = min(_dist2(a, b), _dist2(b, c), _dist2(c, a))
+        if area == 0.0 or shortest2 == 0.0:
+            return False
+        radius2 = _dist2(a, b) * _dist2(b, c) * _dist2(c, a) / (16.0 * area * area)
+        return radius2 > ratio2 * shortest2
+
+    def encroached_segments(triangles: list[int]) -> list[tuple[int, int, int]]:
+        """Arêtes de l'enveloppe de ces triangles empiétées par leur sommet opposé."""
+        found = []
+        for t in triangles:
+            tri = mesh.tris[t]
+            if tri is None:
+                continue
+            for i in range(3):
+                if mesh.adj[t][i] < 0:
+                    u, v = tri[(i + 1) % 3], tri[(i + 2) % 3]
+                    if _encroaches(pts[tri[i]], pts[u], pts[v]):
+                        found.append((t, u, v))
+        return found
+
+    def split_segment(t: int, u: int, v: int) -> list[int]:
+        tri = mesh.tris[t]
+        if tri is None or u not in tri or v not in tri:
+            return []
+        middle = ((pts[u][0] + pts[v][0]) / 2.0, (pts[u][1] + pts[v][1]) / 2.0)
+        if middle == pts[u] or middle == pts[v]:
+            return []
+        return mesh.insert(middle, mesh.cavity(middle, t, (u, v)), (u, v))
+
+    def snapshot(t: int) -> tuple[int, tuple[int, ...]]:
+        return t, tuple(mesh.tris[t])
+
+    segments = deque(encroached_segments(range(len(mesh.tris))))
+    bad = deque(snapshot(t) for t, tri in enumerate(mesh.tris) if tri and is_bad(tri))
+    # Nombre de reports d'un triangle dont le centre empiète sur l'enveloppe
+    deferred: dict[tuple[int, ...], int] = {}
+
+    def enqueue(created: list[int]) -> None:
+        segments.extend(encroached_segments(created))
+        bad.extend(snapshot(t) for t in created if is_bad(mesh.tris[t]))
+
+    def defer(t: int, vertices: tuple[int, ...], blocking: list) -> None:
+        """Coupe d'abord les arêtes d'enveloppe, puis retente le triangle."""
+        segments.extend(blocking)
+        deferred[vertices] = deferred.get(vertices, 0) + 1
+        if deferred[vertices] <= 2:
+            bad.append((t, vertices))
+
+    while len(pts) < budget:
+        if segments:
+            enqueue(split_segment(*segments.popleft()))
+            continue
+        if not bad:
+            break
+        t, vertices = bad.popleft()
+        if mesh.tris[t] is None or tuple(mesh.tris[t]) != vertices:
+            continue
+        center = _circumcenter(*(pts[v] for v in vertices))
+        if center is None:
+            continue
+        located, outside = mesh.locate(center, t)
+        if outside >= 0:
+            tri = mesh.tris[located]
+            edge = (located, tri[(outside + 1) % 3], tri[(outside + 2) % 3])
+            defer(t, vertices, [edge])
+            continue
+        if center in (pts[v] for v in mesh.tris[located]):
+            continue
+        cavity = mesh.cavity(center, located)
+        blocking = [
+            (owner, u, v) for u, v, n, owner in mesh._boundary(set(cavity))
+            if n < 0 and _encroaches(center, pts[u], pts[v])
+        ]
+        if blocking:
+            defer(t, vertices, blocking)
+            continue
+        enqueue(mesh.insert(center, cavity))
+
+    return pts, mesh.triangles()
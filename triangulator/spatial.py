@@ -0,0 +1,146 @@
+"""Réordonnancement des points le long d'une courbe remplissant l'espace.
+
+Des points consécutifs le long d'une courbe de Hilbert (ou de Morton) sont
+proches dans le plan: les parcourir dans cet ordre garde les données
+utilisées ensemble proches en mémoire. Les points sont quantifiés sur une
+grille de 2^16 × 2^16 cases couvrant leur boîte englobante; la clé de
+chaque point est son rang le long de la courbe, calculée par tables
+(octets pour Morton, quartets pour Hilbert) et rangée dans un `array`.
+
+`triangulate_along` triangule les points dans l'ordre de la courbe, puis
+renvoie les triangles dans les indices d'origine.
+"""
+
+from array import array
+
+from triangulator.codec import Point, Triangle
+from triangulator.geometry import triangulate
+
+CURVES = ("hilbert", "morton")
+
+# Bits par coordonnée après quantification
+BITS = 16
+_SIDE = (1 << BITS) - 1
+
+# Morton: bits d'un octet intercalés avec des zéros (0b1011 → 0b1000101)
+_SPREAD = array("I", [
+    sum(((byte >> i) & 1) << (2 * i) for i in range(8)) for byte in range(256)
+])
+
+
+def _hilbert_table() -> tuple[array, array]:
+    """Tables de Hilbert par quartet: (état, x, y) → (rang, état suivant).
+
+    L'état code les transformations accumulées par les niveaux supérieurs:
+    bit 0, coordonnées complémentées; bit 1, coordonnées échangées.
+    """
+    ranks, states = array("H", bytes(2 * 1024)), array("B", bytes(1024))
+    for state in range(4):
+        for xn in range(16):
+            for yn in range(16):
+                x, y = (xn ^ 15, yn ^ 15) if state & 1 else (xn, yn)
+                if state & 2:
+                    x, y = y, x
+                inverted, swapped = state & 1, state & 2
+                d = 0
+                s = 8
+                while s:
+                    rx, ry = int(x & s > 0), int(y & s > 0)
+                    d += s * s * ((3 * rx) ^ ry)
+                    if ry == 0:
+                        if rx == 1:
+                            x, y = 15 - x, 15 - y
+                            inverted ^= 1
+                        x, y = y, x
+                        swapped ^= 2
+                    s >>= 1
+                index = (state << 8) | (xn << 4) | yn
+                ranks[index] = d
+                states[index] = inverted | swapped
+    return ranks, states
+
+
+_HILBERT_RANKS, _HILBERT_STATES = _hilbert_table()
+
+
+def morton_index(x: int, y: int) -> int:
+    """Rang de la case (x, y) le long de la courbe de Morton (ordre Z)."""
+    return (
+        _SPREAD[x & 0xFF] | (_SPREAD[x >> 8] << 16)
+        | (_SPREAD[y & 0xFF] << 1) | (_SPREAD[y >> 8] << 17)
+    )
+
+
+def hilbert_index(x: int, y: int) -> int:
+    """Rang de la case (x, y) le long de la courbe de Hilbert."""
+    d = 0
+    state = 0
+    for shift in range(BITS - 4, -1, -4):
+        index = (state << 8) | (((x >> shift) & 15) << 4) | ((y >> shift) & 15)
+        d = (d << 8) | _HILBERT_RANKS[index]
+        state = _HILBERT_STATES[index]
+    return d
+
+
+def curve_keys(points: list[Point], curve: str = "hilbert") -> array:
+    """Rang de chaque point le long de la courbe.
+
+    Raises:
+        ValueError: Si la courbe est inconnue
+
+    """
+    if curve not in CURVES:
+        raise ValueError(f"Courbe inconnue: {curve!r} (attendu: {', '.join(CURVES)})")
+    keys = array("Q")
+    if not points:
+        return keys
+    x0 = min(x for x, _ in points)
+    y0 = min(y for _, y in points)
+    extent = max(max(x for x, _ in points) - x0, max(y for _, y in points) - y0)
+    scale = _SIDE / extent if extent > 0 else 0.0
+    index = hilbert_index if curve == "hilbert" else morton_index
+    keys.extend(
+        index(int((x - x0) * scale), int((y - y0) * scale)) for x, y in points
+    )
+    return keys
+
+
+def curve_order(points: list[Point], curve: str = "hilbert") -> array:
+    """Permutation des points le long de la courbe.
+
+    Returns:
+        array: `order[i]` est l'indice d'origine du i-ème point parcouru
+
+    Raises:
+        ValueError: Si la courbe est inconnue
+
+    """
+    keys = curve_keys(points, curve)
+    return array("I", sorted(range(len(points)), key=keys.__getitem__))
+
+
+def triangulate_along(
+    points: list[Point], curve: str = "hilbert", hull: list[int] | None = None
+) -> list[Triangle]:
+    """Triangule les points parcourus le long de la courbe.
+
+    Args:
+        points: Points à trianguler
+        curve: "hilbert" ou "morton"
+        hull: Enveloppe convexe déjà calculée par `convex_hull` (optionnel)
+
+    Returns:
+        list[Triangle]: Triangles, dans les indices d'origine des points
+
+    Raises:
+        ValueError: Si la courbe est inconnue
+
+    """
+    order = curve_order(points, curve)
+    if hull is not None:
+        rank = array("I", bytes(4 * len(order)))
+        for i, original in enumerate(order):
+            rank[original] = i
+        hull = [rank[v] for v in hull]
+    triangles = triangulate([points[i] for i in order], hull)
+    return [(order[a], order[b], order[c]) for a, b, c in triangles]
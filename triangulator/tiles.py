@@ -0,0 +1,150 @@
+"""Index spatial des triangles, pour les requêtes par fenêtre.
+
+Une grille régulière couvre la boîte englobante des points; chaque case
+(tuile) liste les triangles dont la boîte englobante la recouvre. Une
+requête ne parcourt que les tuiles recouvertes par la fenêtre, puis teste
+exactement les triangles candidats: son coût est proportionnel au résultat
+plutôt qu'à la taille de la triangulation.
+
+La résolution de la grille vise `TRIANGLES_PER_TILE` triangles par tuile,
+mais est réduite tant que les triangles allongés (éventail) produiraient
+plus de `MAX_ENTRIES_PER_TRIANGLE` entrées par triangle en moyenne.
+
+Limite: le coût proportionnel au résultat suppose des triangles locaux
+(Delaunay, maillage raffiné). Dans la triangulation en éventail que sert
+le service, tous les triangles partent du point 0 et traversent la plupart
+des tuiles: la grille est réduite à quelques tuiles (2 × 2 pour 100 000
+points uniformes) et une requête teste alors presque tous les triangles,
+en O(n). Seules les fenêtres hors de la boîte englobante des points sont
+alors écartées sans parcours.
+"""
+
+import math
+from array import array
+
+from triangulator.codec import Point, Triangle
+from triangulator.predicates import orient2d
+
+# Fenêtre (min_x, min_y, max_x, max_y), bornes incluses
+Box = tuple[float, float, float, float]
+
+TRIANGLES_PER_TILE = 16
+MAX_ENTRIES_PER_TRIANGLE = 8
+
+
+class TileIndex:
+    """Grille de tuiles listant les triangles qui les recouvrent."""
+
+    def __init__(self, points: list[Point], triangles: list[Triangle]) -> None:
+        """Construit l'index des `triangles` (indices dans `points`)."""
+        self.points = points
+        self.triangles = triangles
+        boxes = [_triangle_box(points, t) for t in triangles]
+        if boxes:
+            self.x0 = min(b[0] for b in boxes)
+            self.y0 = min(b[1] for b in boxes)
+            width = max(b[2] for b in boxes) - self.x0
+            height = max(b[3] for b in boxes) - self.y0
+        else:
+            self.x0 = self.y0 = width = height = 0.0
+
+        side = max(1, math.isqrt(max(1, len(triangles) // TRIANGLES_PER_TILE)))
+        while True:
+            self.nx = self.ny = side
+            self.dx = width / side or 1.0
+            self.dy = height / side or 1.0
+            ranges = [self._cells(box) for box in boxes]
+            entries = sum((i1 - i0 + 1) * (j1 - j0 + 1)
+                          for i0, j0, i1, j1 in ranges)
+            if side == 1 or entries <= MAX_ENTRIES_PER_TRIANGLE * len(triangles):
+                break
+            side //= 2
+
+        self.tiles = [array("I") for _ in range(self.nx * self.ny)]
+        for t, (i0, j0, i1, j1) in enumerate(ranges):
+            for j in range(j0, j1 + 1):
+                row = j * self.nx
+                for i in range(i0, i1 + 1):
+                    self.tiles[row + i].append(t)
+
+    def _cells(self, box: Box) -> tuple[int, int, int, int]:
+        """Plage (i0, j0, i1, j1) des tuiles recouvertes par `box`."""
+        def clamp(value: float, count: int) -> int:
+            return min(count - 1, max(0, math.floor(value)))
+
+        return (
+            clamp((box[0] - self.x0) / self.dx, self.nx),
+            clamp((box[1] - self.y0) / self.dy, self.ny),
+            clamp((box[2] - self.x0) / self.dx, self.nx),
+            clamp((box[3] - self.y0) / self.dy, self.ny),
+        )
+
+    def query(self, window: Box) -> list[int]:
+        """Retourne les indices croissants des triangles qui intersectent `window`."""
+        x0, y0 = self.x0, self.y0
+        if (
+            not self.triangles
+            or window[2] < x0 or window[0] > x0 + self.dx * self.nx
+            or window[3] < y0 or window[1] > y0 + self.dy * self.ny
+        ):
+            return []
+        i0, j0, i1, j1 = self._cells(window)
+        candidates: set[int] = set()
+        for j in range(j0, j1 + 1):
+            row = j * self.nx
+            for i in range(i0, i1 + 1):
+                candidates.update(self.tiles[row + i])
+        points, triangles = self.points, self.triangles
+        return sorted(
+            t for t in candidates
+            if intersects(points, triangles[t], window)
+        )
+
+    def clip(self, window: Box) -> tuple[list[Point], list[Triangle]]:
+        """Triangles qui intersectent `window`, avec leurs seuls sommets.
+
+        Returns:
+            tuple: (sommets, triangles): les sommets utilisés, dans l'ordre
+                   de leurs indices d'origine, et les triangles réindexés
+
+        """
+        selected = [self.triangles[t] for t in self.query(window)]
+        used = sorted({v for tri in selected for v in tri})
+        index = {v: i for i, v in enumerate(used)}
+        return (
+            [self.points[v] for v in used],
+            [(index[a], index[b], index[c]) for a, b, c in selected],
+        )
+
+
+def _triangle_box(points: list[Point], triangle: Triangle) -> Box:
+    """Boîte englobante d'un triangle."""
+    (ax, ay), (bx, by), (cx, cy) = (points[v] for v in triangle)
+    return min(ax, bx, cx), min(ay, by, cy), max(ax, bx, cx), max(ay, by, cy)
+
+
+def intersects(points: list[Point], triangle: Triangle, window: Box) -> bool:
+    """Indique si un triangle et une fenêtre ont au moins un point commun.
+
+    Test des axes séparateurs: boîtes englobantes, puis arêtes du triangle
+    (la fenêtre est-elle entièrement du côté extérieur de l'une d'elles?).
+    Un triangle dégénéré n'est testé que par sa boîte englobante.
+    """
+    box = _triangle_box(points, triangle)
+    if (
+        box[2] < window[0] or box[0] > window[2]
+        or box[3] < window[1] or box[1] > window[3]
+    ):
+        return False
+    a, b, c = (points[v] for v in triangle)
+    sign = orient2d(a, b, c)
+    if sign == 0:
+        return True
+    corners = (
+        (window[0], window[1]), (window[2], window[1]),
+        (window[2], window[3]), (window[0], window[3]),
+    )
+    for p, q in ((a, b), (b, c), (c, a)):
+        if all(orient2d(p, q, corner) * sign < 0 for corner in corners):
+            return False
+    return True
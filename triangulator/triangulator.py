@@ -7,277 +7,1327 @@ Composant responsable de:
 4. Exposer l'API REST
 """
 
-import struct
-
-import requests
-from flask import Flask, Response, jsonify
-
-# Types
-Point = tuple[float, float]
-Triangle = tuple[int, int, int]
-
-BYTES_PER_POINT = 16  
-BYTES_PER_TRIANGLE = 12  
-HEADER_SIZE = 4  
+import hashlib
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+
+from flask import (
+    Flask,
+    Response,
+    g,
+    has_request_context,
+    jsonify,
+    make_response,
+    request,
+    send_file,
+)
+
+from triangulator import metrics
+from triangulator.admission import AdmissionController, JobClass, Overloaded
+from triangulator.breaker import CLOSED, CircuitBreaker, CircuitOpen
+from triangulator.codec import (  # noqa: F401 (réexportés)
+    BYTES_PER_INDEX,
+    BYTES_PER_POINT,
+    BYTES_PER_TRIANGLE,
+    HEADER_SIZE,
+    Edge,
+    Point,
+    Triangle,
+    decode_constraints,
+    decode_hull,
+    decode_pointset,
+    decode_triangles,
+    encode_hull,
+    encode_pointset,
+    encode_triangles,
+    read_point_count,
+)
+from triangulator.constrained import constrained_triangulation
+from triangulator.geometry import convex_hull, triangulate
+from triangulator.jobs import FAILED, JobFailed, JobManager, QueueFull, Reporter
+from triangulator.lod import MIN_VERTICES, decimate, level_budget
+from triangulator.pipeline import check_length, peak_bytes, triangulate_pointset
+from triangulator.profiling import Profiler
+from triangulator.refine import DEFAULT_MIN_ANGLE, refine
+from triangulator.spatial import triangulate_along
+from triangulator.tiles import TileIndex
+from triangulator.warmup import Warmup, read_ids
+from triangulator.workers import ComputePool, SharedBuffer
 
 app = Flask(__name__)
 
 POINTSET_MANAGER_URL = "http://pointsetmanager.local"
 REQUEST_TIMEOUT = 5
+# Taille des blocs lus dans le corps des réponses du PointSetManager
+FETCH_CHUNK_BYTES = 1 << 16
+CACHE_MAX_ENTRIES = 128
+# Au-delà de CACHE_TTL secondes, une entrée est revalidée en arrière-plan
+# auprès du PointSetManager; jusqu'à CACHE_MAX_STALE secondes elle reste
+# servie pendant la revalidation ou une panne du PointSetManager.
+CACHE_TTL = 3600
+CACHE_MAX_STALE = 24 * 3600
+
+# Disjoncteur du PointSetManager
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30
+PROFILE_DIR = os.path.join(tempfile.gettempdir(), "triangulator-profiles")
+PROFILE_HEADER = "X-Triangulator-Profile"
+
+# Contrôle d'admission: au-delà de LARGE_POINTSET_THRESHOLD points, un calcul
+# passe dans la classe « large », de concurrence et de file plus réduites.
+LARGE_POINTSET_THRESHOLD = 100_000
+SMALL_JOBS_CONCURRENCY = 8
+SMALL_JOBS_QUEUE = 64
+LARGE_JOBS_CONCURRENCY = 1
+LARGE_JOBS_QUEUE = 2
+ADMISSION_TIMEOUT = 30
+
+# Jobs asynchrones: workers dédiés et résultats stockés sur disque
+JOBS_DIR = os.path.join(tempfile.gettempdir(), "triangulator-jobs")
+JOB_WORKERS = 2
+JOBS_MAX_PENDING = 100
+# Attente maximale, en secondes, d'un job refusé par le contrôle d'admission
+# avant de redemander un créneau
+JOB_ADMISSION_RETRY_MAX = 5
+
+# Préchauffage du cache: PointSets traités simultanément, et fichier de
+# pointSetIds (un par ligne) préchauffés au lancement du serveur
+WARMUP_CONCURRENCY = 4
+WARMUP_IDS_FILE: str | None = None
+
+# Raffinement de maillage (/triangulation?refine=true): nombre maximal de
+# points de Steiner insérés par requête, et variantes gardées par PointSet
+REFINE_MAX_POINTS = 10_000
+ENTRY_MAX_VARIANTS = 8
+
+# Parcours des points le long d'une courbe ("hilbert" ou "morton") avant la
+# triangulation; None triangule dans l'ordre du PointSet. Les triangles
+# produits dépendent de l'ordre de parcours, d'où une option désactivée par
+# défaut.
+SPATIAL_ORDER: str | None = None
+
+# Pipeline fusionné (binaire PointSet → binaire Triangles sans liste de
+# triangles intermédiaire), utilisé pour les PointSets d'au moins
+# FUSED_PIPELINE_THRESHOLD points
+FUSED_PIPELINE_THRESHOLD = LARGE_POINTSET_THRESHOLD
+
+# Processus de calcul du pipeline fusionné, alimentés par mémoire partagée
+# (voir `triangulator.workers`); 0 calcule dans le processus web
+COMPUTE_WORKERS = 0
+# Nombre maximal de points d'un PointSet reçu dans un segment partagé: le
+# segment est alloué d'après l'en-tête, avant la lecture du corps
+MAX_POINTSET_POINTS = 50_000_000
+
+# Disponibilité (/health): au-delà de ces seuils, l'instance se déclare non
+# prête pour que le répartiteur de charge oriente le trafic ailleurs.
+# HEALTH_MAX_QUEUE_FILL est la fraction occupée de la file d'une classe de
+# calcul; avec un circuit ouvert, seules les réponses en cache sont servies.
+HEALTH_MAX_QUEUE_FILL = 0.5
+HEALTH_MAX_JOBS_PENDING = JOBS_MAX_PENDING // 2
+HEALTH_FAIL_ON_CIRCUIT_OPEN = False
 
 
 # ============================================================================
-# 1. DÉCODAGE/ENCODAGE BINAIRE - POINTSET
+# 1-3. FORMATS BINAIRES ET TRIANGULATION
 # ============================================================================
+# Définis dans `triangulator.codec` et `triangulator.geometry`, qui
+# n'importent que la bibliothèque standard, et réexportés par ce module.
 
 
-def decode_pointset(binary_data: bytes) -> list[Point]:
-    """Décode un ensemble de points depuis un format binaire.
-
-    Format attendu:
-        uint32 N = nombre de points
-        N * (float64 x, float64 y)
+# ============================================================================
+# 4. CACHE DES RÉSULTATS
+# ============================================================================
 
-    Args:
-        binary_data: bytes contenant les données encodées
 
-    Returns:
-        list[Point]: Liste de tuples (x, y) où x, y sont des float64
+@dataclass
+class PointSetEntry:
+    """Résultats calculés pour un PointSet, conservés ensemble en cache.
 
-    Raises:
-        ValueError: Si le format binaire est invalide ou corrompu
+    L'enveloppe convexe est calculée une seule fois au chargement du
+    PointSet, puis réutilisée par la triangulation et par `/hull`. Les
+    binaires des triangulations dérivées (raffinement, domaine contraint...)
+    sont conservés dans `variants`, indexés par la clé de leurs paramètres;
+    l'index des triangles par tuile (`tiles`) sert les requêtes par fenêtre.
 
+    Un PointSet triangulé par le pipeline fusionné (voir `uses_pipeline`)
+    n'est ni décodé ni enveloppé au chargement: `points` et `hull` restent
+    None et le binaire reçu est conservé dans `pointset`, jusqu'à ce que le
+    binaire Triangles, qui commence par ce même binaire, le remplace.
+    `entry_points` et `entry_hull` les calculent à la demande.
     """
-    if len(binary_data) < HEADER_SIZE:
-        raise ValueError(
-            f"Binaire trop court: au minimum {HEADER_SIZE} bytes attendus "
-            f"pour le header, reçu {len(binary_data)} bytes"
+
+    points: list[Point] | None
+    hull: list[int] | None
+    triangles: list[Triangle] | None = None
+    payload: bytes | SharedBuffer | None = None
+    digest: bytes = b""
+    fetched_at: float = field(default_factory=time.monotonic)
+    variants: dict = field(default_factory=dict)
+    tiles: TileIndex | None = None
+    pointset: bytes | SharedBuffer | None = None
+
+    @property
+    def point_count(self) -> int:
+        """Nombre de points du PointSet, sans le décoder."""
+        if self.points is not None:
+            return len(self.points)
+        with self.binary() as data:
+            return read_point_count(data)
+
+    @contextmanager
+    def binary(self) -> Iterator[memoryview]:
+        """Binaire du PointSet d'une entrée non décodée.
+
+        C'est le binaire reçu ou, une fois la triangulation calculée, le
+        début du binaire Triangles. La vue est libérée en sortie du bloc.
+        """
+        source = self.pointset
+        if source is None:
+            source = self.payload
+        view = (
+            source.view() if isinstance(source, SharedBuffer)
+            else memoryview(source)
         )
+        with view, view[:HEADER_SIZE] as head:
+            size = HEADER_SIZE + read_point_count(head) * BYTES_PER_POINT
+            with view[:size] as data:
+                yield data
+
+    def age(self) -> float:
+        """Temps écoulé depuis la récupération du PointSet, en secondes."""
+        return time.monotonic() - self.fetched_at
+
+    def put_variant(self, key: object, payload: bytes) -> None:
+        """Conserve le binaire d'une variante, au plus `ENTRY_MAX_VARIANTS`."""
+        self.variants[key] = payload
+        while len(self.variants) > ENTRY_MAX_VARIANTS:
+            del self.variants[next(iter(self.variants))]
+
+
+class ResultCache:
+    """Cache LRU thread-safe des résultats, indexé par pointSetId.
+
+    Les PointSets sont immuables côté PointSetManager (enregistrement et
+    lecture seulement), un pointSetId désigne donc toujours les mêmes points.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        """Initialise un cache vide d'au plus `max_entries` entrées."""
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, PointSetEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> PointSetEntry | None:
+        """Retourne l'entrée associée à `key`, ou None si absente."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: PointSetEntry) -> None:
+        """Ajoute une entrée, en évinçant la moins récemment utilisée."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def remove(self, key: str) -> None:
+        """Retire une entrée du cache, si elle est présente."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Vide le cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Nombre d'entrées en cache."""
+        return len(self._entries)
+
 
-    offset = 0
+result_cache = ResultCache(CACHE_MAX_ENTRIES)
 
+
+# ============================================================================
+# 5. MÉTRIQUES
+# ============================================================================
+
+
+registry = metrics.Registry()
+
+STAGE_SECONDS = registry.histogram(
+    "triangulator_stage_duration_seconds",
+    "Durée de chaque étape du traitement d'un PointSet.",
+    ["stage"],
+)
+PAYLOAD_BYTES = registry.histogram(
+    "triangulator_payload_size_bytes",
+    "Taille des binaires reçus du PointSetManager et renvoyés aux clients.",
+    ["kind"],
+    buckets=metrics.DEFAULT_SIZE_BUCKETS,
+)
+REQUEST_SECONDS = registry.histogram(
+    "triangulator_http_request_duration_seconds",
+    "Durée totale de traitement des requêtes HTTP.",
+    ["endpoint"],
+)
+RESPONSES = registry.counter(
+    "triangulator_http_responses_total",
+    "Réponses HTTP par endpoint et code de statut.",
+    ["endpoint", "status"],
+)
+IN_FLIGHT = registry.gauge(
+    "triangulator_http_requests_in_flight",
+    "Requêtes HTTP en cours de traitement.",
+    ["endpoint"],
+)
+CACHE_LOOKUPS = registry.counter(
+    "triangulator_cache_lookups_total",
+    "Consultations du cache des résultats, par issue (hit, stale, miss).",
+    ["result"],
+)
+UPSTREAM_CIRCUIT_OPEN = registry.gauge(
+    "triangulator_upstream_circuit_open",
+    "1 si le disjoncteur du PointSetManager est ouvert, 0 sinon.",
+)
+ADMISSION_REJECTED = registry.counter(
+    "triangulator_admission_rejected_total",
+    "Calculs refusés faute de capacité, par classe de calcul.",
+    ["job_class"],
+)
+PIPELINE_PEAK_BYTES = registry.histogram(
+    "triangulator_pipeline_peak_bytes",
+    "Borne de la mémoire occupée par chaque calcul du pipeline fusionné, "
+    "binaire reçu compris.",
+    buckets=metrics.DEFAULT_SIZE_BUCKETS,
+)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Chronomètre une étape du traitement.
+
+    La durée est enregistrée dans `STAGE_SECONDS` et, pendant une requête,
+    ajoutée à l'en-tête `Server-Timing` de la réponse. Une étape interrompue
+    par une exception est tout de même mesurée.
+    """
+    start = time.perf_counter()
     try:
-        (count,) = struct.unpack_from("<I", binary_data, offset)
-    except struct.error as e:
-        raise ValueError(f"Erreur lors de la lecture du nombre de points: {e}") from e
-
-    offset += HEADER_SIZE
-    expected_length = HEADER_SIZE + count * BYTES_PER_POINT
-    if len(binary_data) != expected_length:
-        raise ValueError(
-            f"Longueur invalide: attendu {expected_length} bytes pour "
-            f"{count} points, reçu {len(binary_data)} bytes"
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - start)
+
+
+def record_stage(name: str, elapsed: float) -> None:
+    """Enregistre la durée d'une étape chronométrée hors de `stage`."""
+    STAGE_SECONDS.labels(name).observe(elapsed)
+    if has_request_context():
+        g.setdefault("server_timing", []).append((name, elapsed))
+
+
+def _endpoint_label() -> str:
+    """Route Flask de la requête courante, utilisée comme étiquette."""
+    return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+
+@app.before_request
+def _start_request_metrics() -> None:
+    g.request_start = time.perf_counter()
+    g.metrics_endpoint = _endpoint_label()
+    IN_FLIGHT.labels(g.metrics_endpoint).inc()
+
+
+@app.after_request
+def _record_response_metrics(response: Response) -> Response:
+    endpoint = g.get("metrics_endpoint", _endpoint_label())
+    RESPONSES.labels(endpoint, response.status_code).inc()
+    timings = list(g.get("server_timing", []))
+    start = g.get("request_start")
+    if start is not None:
+        total = time.perf_counter() - start
+        REQUEST_SECONDS.labels(endpoint).observe(total)
+        timings.append(("total", total))
+    if timings:
+        response.headers["Server-Timing"] = ", ".join(
+            f"{name};dur={seconds * 1000:.3f}" for name, seconds in timings
         )
+    return response
 
-    points = []
-    for i in range(count):
-        try:
-            x, y = struct.unpack_from("<dd", binary_data, offset)
-        except struct.error as e:
-            raise ValueError(f"Erreur lors de la lecture du point {i}: {e}") from e
-        offset += BYTES_PER_POINT
-        points.append((x, y))
 
-    return points
+@app.teardown_request
+def _end_request_metrics(exc: BaseException | None) -> None:
+    endpoint = g.pop("metrics_endpoint", None)
+    if endpoint is not None:
+        IN_FLIGHT.labels(endpoint).dec()
 
 
-def encode_pointset(points: list[Point]) -> bytes:
-    """Encode un ensemble de points au format binaire.
+profiler = Profiler(PROFILE_DIR)
 
-    Format:
-        uint32 N = nombre de points
-        N * (float64 x, float64 y)
+admission = AdmissionController(
+    LARGE_POINTSET_THRESHOLD,
+    small=JobClass("small", SMALL_JOBS_CONCURRENCY, SMALL_JOBS_QUEUE,
+                   ADMISSION_TIMEOUT, initial_seconds=0.1),
+    large=JobClass("large", LARGE_JOBS_CONCURRENCY, LARGE_JOBS_QUEUE,
+                   ADMISSION_TIMEOUT, initial_seconds=60.0),
+)
 
-    Args:
-        points: Liste de tuples (x, y)
+jobs = JobManager(JOBS_DIR, workers=JOB_WORKERS, max_pending=JOBS_MAX_PENDING)
 
-    Returns:
-        bytes: Données encodées au format binaire
+warmup = Warmup()
+
+compute_pool = ComputePool(COMPUTE_WORKERS)
 
-    Raises:
-        ValueError: Si les points ne sont pas du format correct
 
+def _http_client():
+    """Client HTTP `requests`, importé au premier appel au PointSetManager.
+
+    Son import (urllib3, certifi, ...) est l'un des plus coûteux du service:
+    il est différé pour accélérer le démarrage des processus qui chargent ce
+    module sans contacter le PointSetManager.
     """
-    try:
-        out = [struct.pack("<I", len(points))]
-        for x, y in points:
-            out.append(struct.pack("<dd", float(x), float(y)))
-        return b"".join(out)
-    except (TypeError, ValueError) as e:
-        raise ValueError(f"Erreur lors de l'encodage des points: {e}") from e
+    global requests
+    import requests
+
+    return requests
+
+
+def __getattr__(name: str) -> object:
+    """Attribut `requests` du module, chargé à la demande (PEP 562)."""
+    if name == "requests":
+        return _http_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _probe_pointset_manager() -> bool:
+    """Sonde du disjoncteur: vérifie que le PointSetManager répond sans 5xx.
+
+    Un identifiant inexistant suffit: une 404 prouve que le service répond.
+    """
+    url = f"{POINTSET_MANAGER_URL}/pointsets/{uuid.UUID(int=0)}/binary"
+    return _http_client().get(url, timeout=REQUEST_TIMEOUT).status_code < 500
+
+
+breaker = CircuitBreaker(
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    probe=_probe_pointset_manager,
+    on_change=lambda state: UPSTREAM_CIRCUIT_OPEN.set(int(state != CLOSED)),
+)
 
 
 # ============================================================================
-# 2. DÉCODAGE/ENCODAGE BINAIRE - TRIANGLES
+# 6. ENDPOINTS REST
 # ============================================================================
 
 
-def decode_triangles(data: bytes) -> tuple[list[Point], list[Triangle]]:
-    """Décode les points et triangles depuis un format binaire complet.
+class ServiceError(Exception):
+    """Erreur d'une étape du traitement, convertie en réponse JSON."""
 
-    Format:
-        uint32 N (nombre de points)
-        N * (float64 x, float64 y)
-        uint32 T (nombre de triangles)
-        T * (uint32 a, uint32 b, uint32 c)
+    def __init__(
+        self, status: int, body: dict, headers: dict | None = None
+    ) -> None:
+        """Associe un code HTTP (et des en-têtes) au corps JSON de l'erreur."""
+        super().__init__(body.get("error"))
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
 
-    Args:
-        data: bytes contenant les données encodées
+    def to_response(self) -> tuple[Response, int, dict]:
+        """Construit la réponse Flask correspondant à l'erreur."""
+        return jsonify(self.body), self.status, self.headers
 
-    Returns:
-        tuple[list[Point], list[Triangle]]: Points et triangles décodés
+
+def _upstream_error(e: Exception) -> ServiceError:
+    """Erreur renvoyée pour un échec réseau vers le PointSetManager."""
+    requests = _http_client()
+    if isinstance(e, requests.Timeout):
+        return ServiceError(502, {
+            "error": "PointSetManager timeout",
+            "details": (
+                f"Requête vers {POINTSET_MANAGER_URL} expirée après "
+                f"{REQUEST_TIMEOUT}s"
+            )
+        })
+    if isinstance(e, requests.ConnectionError):
+        return ServiceError(502, {
+            "error": "PointSetManager unreachable",
+            "details": (
+                f"Impossible de se connecter à {POINTSET_MANAGER_URL}: {str(e)}"
+            )
+        })
+    return ServiceError(502, {
+        "error": "PointSetManager request failed",
+        "details": str(e)
+    })
+
+
+class PointSetDownload:
+    """Réponse du PointSetManager dont seul l'en-tête du PointSet est lu.
+
+    Le nombre de points annoncé (`point_count`) permet d'admettre le calcul
+    avant de télécharger le reste du binaire par `read`: un PointSet refusé
+    ne coûte ni son transfert ni sa mémoire. `close` abandonne le corps non
+    lu. L'étape "fetch" mesure la requête et la lecture du corps, sans
+    l'attente d'admission entre les deux.
+    """
+
+    def __init__(self, response: object, started: float) -> None:
+        """Prend en charge une réponse 200 lue en flux."""
+        self._response = response
+        self._chunks = response.iter_content(chunk_size=FETCH_CHUNK_BYTES)
+        self._head = bytearray()
+        self._started = started
+        self._elapsed = 0.0
+        self._closed = False
+
+    def read_head(self) -> None:
+        """Lit le début du corps, jusqu'à l'en-tête du PointSet compris.
+
+        Raises:
+            ServiceError: 502 si la lecture échoue
+
+        """
+        while len(self._head) < HEADER_SIZE:
+            chunk = self._next_chunk()
+            if chunk is None:
+                break
+            self._head += chunk
+        self._elapsed += time.perf_counter() - self._started
+
+    @property
+    def point_count(self) -> int:
+        """Nombre de points annoncé, ou 0 si l'en-tête est illisible."""
+        return _estimated_point_count(self._head)
+
+    def _next_chunk(self) -> bytes | None:
+        """Bloc suivant du corps, ou None à la fin."""
+        requests = _http_client()
+        try:
+            return next(self._chunks, None)
+        except requests.RequestException as e:
+            breaker.record_failure()
+            raise _upstream_error(e) from e
+
+    def read(self) -> bytearray:
+        """Lit le reste du corps et retourne le binaire complet du PointSet.
+
+        Raises:
+            ServiceError: 502 si la lecture échoue
+
+        """
+        start = time.perf_counter()
+        data, self._head = self._head, bytearray()
+        try:
+            while (chunk := self._next_chunk()) is not None:
+                data += chunk
+        finally:
+            self._elapsed += time.perf_counter() - start
+            self.close()
+
+        if has_request_context() and "profile_capture" in g:
+            g.profile_capture.input_data = data
+        return data
+
+    def read_shared(self) -> SharedBuffer:
+        """Comme `read`, mais écrit le binaire dans un segment partagé.
+
+        Le segment est alloué d'après le nombre de points annoncé, et le
+        corps y est écrit bloc par bloc, sans autre copie: le binaire peut
+        être transmis tel quel au pool `compute_pool`. L'en-tête n'étant
+        pas sûr, le nombre annoncé est d'abord comparé à
+        `MAX_POINTSET_POINTS` et à l'en-tête HTTP `Content-Length`.
+
+        Raises:
+            ServiceError: 400 si la taille annoncée est refusée ou si le
+                          corps la dépasse, 502 si la lecture échoue
+
+        """
+        try:
+            expected = self._announced_size()
+        except ServiceError:
+            self.close()
+            raise
+        buffer = SharedBuffer(expected)
+        start = time.perf_counter()
+        chunk, self._head = bytes(self._head), bytearray()
+        size = 0
+        try:
+            with buffer.view() as view:
+                while chunk is not None:
+                    if size + len(chunk) > expected:
+                        raise ServiceError(400, {
+                            "error": "Invalid PointSet binary format",
+                            "details": (
+                                f"Longueur invalide: plus de {expected} bytes "
+                                f"reçus pour {self.point_count} points"
+                            )
+                        })
+                    view[size:size + len(chunk)] = chunk
+                    size += len(chunk)
+                    chunk = self._next_chunk()
+        except BaseException:
+            buffer.close()
+            raise
+        finally:
+            self._elapsed += time.perf_counter() - start
+            self.close()
+        buffer.size = size
+
+        if has_request_context() and "profile_capture" in g:
+            g.profile_capture.input_data = bytes(buffer)
+        return buffer
+
+    def _announced_size(self) -> int:
+        """Taille du binaire annoncée par l'en-tête du PointSet, vérifiée.
+
+        Raises:
+            ServiceError: 400 si le nombre de points dépasse
+                          `MAX_POINTSET_POINTS` ou si la taille ne correspond
+                          pas au `Content-Length` de la réponse
+
+        """
+        count = self.point_count
+        expected = HEADER_SIZE + count * BYTES_PER_POINT
+        if count > MAX_POINTSET_POINTS:
+            details = (
+                f"{count} points annoncés, au plus {MAX_POINTSET_POINTS} "
+                f"acceptés"
+            )
+        else:
+            headers = self._response.headers
+            try:
+                length = int(headers.get("Content-Length"))
+            except (TypeError, ValueError):
+                length = None
+            # Un corps compressé a une longueur différente du binaire
+            if (
+                length is None
+                or headers.get("Content-Encoding", "identity") != "identity"
+                or length == expected
+            ):
+                return expected
+            details = (
+                f"Longueur invalide: attendu {expected} bytes pour {count} "
+                f"points, Content-Length {length}"
+            )
+        raise ServiceError(400, {
+            "error": "Invalid PointSet binary format",
+            "details": details
+        })
+
+    def close(self) -> None:
+        """Ferme la réponse et enregistre la durée de l'étape "fetch"."""
+        if self._closed:
+            return
+        self._closed = True
+        self._response.close()
+        record_stage("fetch", self._elapsed)
+
+    def __enter__(self) -> "PointSetDownload":
+        """Retourne le téléchargement."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Ferme la réponse."""
+        self.close()
+
+
+def open_pointset(pointSetId: str) -> PointSetDownload:
+    """Demande un PointSet au PointSetManager et lit seulement son en-tête.
+
+    L'appel passe par le disjoncteur `breaker`: les timeouts, erreurs réseau
+    et erreurs 5xx comptent comme des échecs.
 
     Raises:
-        ValueError: Si le format binaire est invalide ou corrompu
+        ServiceError: 404 si le PointSet est introuvable, 502 si le
+                      PointSetManager est injoignable ou en erreur, 503 si le
+                      disjoncteur est ouvert
 
     """
-    if len(data) < HEADER_SIZE:
-        raise ValueError("Binaire trop court: au minimum 4 bytes attendus")
+    try:
+        breaker.before_call()
+    except CircuitOpen as e:
+        raise ServiceError(503, {
+            "error": "PointSetManager unavailable",
+            "details": "Trop d'échecs récents, appels suspendus"
+        }, headers={"Retry-After": str(e.retry_after)}) from e
+
+    requests = _http_client()
+    url = f"{POINTSET_MANAGER_URL}/pointsets/{pointSetId}/binary"
+    start = time.perf_counter()
+    try:
+        response = requests.get(url, timeout=REQUEST_TIMEOUT, stream=True)
+    except requests.RequestException as e:
+        record_stage("fetch", time.perf_counter() - start)
+        breaker.record_failure()
+        raise _upstream_error(e) from e
+
+    download = PointSetDownload(response, start)
+    if response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
 
-    offset = 0
+    if response.status_code == 404:
+        download.close()
+        raise ServiceError(404, {
+            "error": "PointSet not found",
+            "pointSetId": pointSetId
+        })
+
+    if response.status_code != 200:
+        download.close()
+        raise ServiceError(502, {
+            "error": "PointSetManager error",
+            "status_code": response.status_code
+        })
 
     try:
-        (count,) = struct.unpack_from("<I", data, offset)
-    except struct.error as e:
-        raise ValueError(f"Erreur lors de la lecture du nombre de points: {e}") from e
-
-    offset += HEADER_SIZE
-    points = []
-    for i in range(count):
-        if offset + BYTES_PER_POINT > len(data):
-            raise ValueError(
-                f"Données corrompues: point {i} incomplet, "
-                f"offset={offset}, len={len(data)}"
-            )
-        try:
-            x, y = struct.unpack_from("<dd", data, offset)
-        except struct.error as e:
-            raise ValueError(f"Erreur lors de la lecture du point {i}: {e}") from e
-        offset += BYTES_PER_POINT
-        points.append((x, y))
+        download.read_head()
+    except ServiceError:
+        download.close()
+        raise
+    return download
+
 
-    # Décoder les triangles
-    if offset + HEADER_SIZE > len(data):
-        raise ValueError("Données corrompues: nombre de triangles manquant")
+def fetch_pointset(pointSetId: str) -> bytes:
+    """Récupère le binaire complet d'un PointSet auprès du PointSetManager.
 
+    Raises:
+        ServiceError: Voir `open_pointset`
+
+    """
+    with open_pointset(pointSetId) as download:
+        return download.read()
+
+
+def _estimated_point_count(data: bytes) -> int:
+    """Nombre de points annoncé, ou 0 si l'en-tête est illisible.
+
+    Un binaire invalide est admis comme un petit calcul: son décodage
+    échouera aussitôt avec une erreur 400.
+    """
     try:
-        (tcount,) = struct.unpack_from("<I", data, offset)
-    except struct.error as e:
-        raise ValueError(
-            f"Erreur lors de la lecture du nombre de triangles: {e}"
-        ) from e
-    offset += HEADER_SIZE
-    triangles = []
-    for i in range(tcount):
-        if offset + BYTES_PER_TRIANGLE > len(data):
-            raise ValueError(
-                f"Données corrompues: triangle {i} incomplet, "
-                f"offset={offset}, len={len(data)}"
-            )
-        try:
-            a, b, c = struct.unpack_from("<III", data, offset)
-        except struct.error as e:
-            raise ValueError(f"Erreur lors de la lecture du triangle {i}: {e}") from e
-        offset += BYTES_PER_TRIANGLE
-        triangles.append((a, b, c))
-
-    if offset != len(data):
-        raise ValueError(
-            f"Données excédentaires: {len(data) - offset} bytes non lus après "
-            f"la fin des données attendues"
-        )
+        return read_point_count(data)
+    except (TypeError, ValueError):
+        return 0
 
-    return points, triangles
 
+@contextmanager
+def compute_slot(point_count: int) -> Iterator[None]:
+    """Exécute le bloc dans un créneau de calcul adapté à `point_count`.
 
-def encode_triangles(triangles: list[Triangle], vertices: list[Point]) -> bytes:
-    """Encode les points et triangles au format binaire complet.
+    Raises:
+        ServiceError: 503 avec `Retry-After` si la classe de calcul est saturée
 
-    Format:
-        uint32 N (nombre de points)
-        N * (float64 x, float64 y)
-        uint32 T (nombre de triangles)
-        T * (uint32 i, uint32 j, uint32 k)
+    """
+    try:
+        with admission.admit(point_count):
+            yield
+    except Overloaded as e:
+        ADMISSION_REJECTED.labels(e.job_class).inc()
+        raise ServiceError(503, {
+            "error": "Service overloaded",
+            "details": str(e),
+            "job_class": e.job_class,
+        }, headers={"Retry-After": str(e.retry_after)}) from e
+
+
+def load_pointset(pointSetId: str, refresh: bool = False) -> PointSetEntry:
+    """Retourne l'entrée en cache d'un PointSet, avec son enveloppe convexe.
+
+    Au premier accès, le PointSet est récupéré, décodé, et son enveloppe
+    convexe calculée avant d'être mis en cache. Le calcul est admis sur le
+    nombre de points annoncé par l'en-tête, avant le transfert du reste du
+    binaire. Une entrée en cache dont l'enveloppe manque (PointSet triangulé
+    par le pipeline fusionné) est admise sur son nombre de points.
 
     Args:
-        triangles: Liste de tuples (a, b, c) représentant les indices de points
-        vertices: Liste de points (x, y)
+        pointSetId: UUID du PointSet
+        refresh: Ignorer l'entrée en cache et tout recalculer
+
+    Raises:
+        ServiceError: En cas d'échec de récupération, de décodage ou de calcul
+
+    """
+    entry = None
+    if not refresh:
+        entry, _ = lookup_entry(pointSetId)
+        if entry is not None and entry.hull is not None:
+            return entry
+
+    with (
+        open_pointset(pointSetId) if entry is None else nullcontext()
+    ) as download:
+        point_count = entry.point_count if download is None else download.point_count
+        with compute_slot(point_count):
+            if entry is None:
+                entry = receive_entry(pointSetId, download)
+            entry_hull(entry)
+    return entry
+
+
+def lookup_entry(pointSetId: str) -> tuple[PointSetEntry | None, str]:
+    """Consulte le cache des résultats.
+
+    Une entrée plus ancienne que `CACHE_TTL` reste servie tant qu'elle a
+    moins de `CACHE_MAX_STALE` secondes, mais sa revalidation est lancée en
+    arrière-plan (stale-while-revalidate). Si le PointSetManager est en
+    panne, elle est simplement servie telle quelle.
 
     Returns:
-        bytes: Données encodées au format binaire
+        tuple: (entrée ou None, issue: "hit", "stale" ou "miss")
+
+    """
+    entry = result_cache.get(pointSetId)
+    if entry is None:
+        status = "miss"
+    elif entry.age() <= CACHE_TTL:
+        status = "hit"
+    elif entry.age() <= CACHE_MAX_STALE:
+        status = "stale"
+        schedule_revalidation(pointSetId)
+    else:
+        entry, status = None, "miss"
+    CACHE_LOOKUPS.labels(status).inc()
+    return entry, status
+
+
+_revalidation_pool = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="triangulator-revalidate"
+)
+_revalidating: set[str] = set()
+_revalidating_lock = threading.Lock()
+
+
+def schedule_revalidation(pointSetId: str) -> None:
+    """Lance la revalidation d'une entrée, sauf si le circuit est ouvert."""
+    if not breaker.allow():
+        return
+    with _revalidating_lock:
+        if pointSetId in _revalidating:
+            return
+        _revalidating.add(pointSetId)
+    _revalidation_pool.submit(revalidate, pointSetId)
+
+
+def revalidate(pointSetId: str) -> None:
+    """Vérifie une entrée en cache auprès du PointSetManager.
+
+    Si le binaire est inchangé, les résultats sont conservés et l'entrée
+    redevient fraîche. S'il a changé, l'entrée est reconstruite; si le
+    PointSet n'existe plus, elle est retirée du cache. En cas d'échec du
+    PointSetManager, l'entrée périmée est conservée.
+    """
+    try:
+        try:
+            data = fetch_pointset(pointSetId)
+        except ServiceError as e:
+            if e.status == 404:
+                result_cache.remove(pointSetId)
+            return
+
+        entry = result_cache.get(pointSetId)
+        if entry is not None and entry.digest == _digest(data):
+            entry.fetched_at = time.monotonic()
+            return
+        try:
+            with compute_slot(_estimated_point_count(data)):
+                build_entry(pointSetId, data)
+        except ServiceError:
+            result_cache.remove(pointSetId)
+    finally:
+        with _revalidating_lock:
+            _revalidating.discard(pointSetId)
+
+
+def _digest(data: bytes) -> bytes:
+    """Empreinte d'un binaire de PointSet, pour détecter un changement."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def uses_pipeline(point_count: int) -> bool:
+    """Indique si un PointSet de `point_count` points passe par le pipeline fusionné."""
+    return point_count >= FUSED_PIPELINE_THRESHOLD and SPATIAL_ORDER is None
+
+
+def receive_entry(pointSetId: str, download: PointSetDownload) -> PointSetEntry:
+    """Lit le corps d'un PointSet admis et construit son entrée.
+
+    Un PointSet destiné au pipeline fusionné est reçu directement dans un
+    segment partagé si le pool `compute_pool` est actif.
+
+    Raises:
+        ServiceError: En cas d'échec de lecture, de décodage ou de calcul
+
+    """
+    if compute_pool.workers and uses_pipeline(download.point_count):
+        return build_entry(pointSetId, download.read_shared())
+    return build_entry(pointSetId, download.read())
+
+
+def build_entry(pointSetId: str, data: bytes | SharedBuffer) -> PointSetEntry:
+    """Décode un PointSet, calcule son enveloppe convexe et le met en cache.
+
+    Un PointSet destiné au pipeline fusionné n'est ni décodé ni enveloppé:
+    seule la longueur de son binaire est vérifiée, et le binaire est
+    conservé dans l'entrée (voir `PointSetEntry`).
+
+    Raises:
+        ServiceError: En cas d'échec de décodage ou de calcul
+
+    """
+    shared = isinstance(data, SharedBuffer)
+    with (data.view() if shared else nullcontext(data)) as binary:
+        if not uses_pipeline(_estimated_point_count(binary)):
+            points = decode_points(binary)
+            PAYLOAD_BYTES.labels("pointset").observe(len(binary))
+            entry = PointSetEntry(
+                points=points, hull=compute_hull(points), digest=_digest(binary)
+            )
+        else:
+            try:
+                check_length(binary)
+            except ValueError as e:
+                raise ServiceError(400, {
+                    "error": "Invalid PointSet binary format",
+                    "details": str(e)
+                }) from e
+            PAYLOAD_BYTES.labels("pointset").observe(len(binary))
+            entry = PointSetEntry(
+                points=None, hull=None, digest=_digest(binary), pointset=data
+            )
+    result_cache.put(pointSetId, entry)
+    return entry
+
+
+def decode_points(data: bytes) -> list[Point]:
+    """Décode un PointSet binaire, sous l'étape "decode".
 
     Raises:
-        ValueError: Si les données ne sont pas du format correct
+        ServiceError: 400 si le binaire est invalide
 
     """
     try:
-        out = [struct.pack("<I", len(vertices))]
-        for x, y in vertices:
-            out.append(struct.pack("<dd", float(x), float(y)))
-        out.append(struct.pack("<I", len(triangles)))
-        for a, b, c in triangles:
-            out.append(struct.pack("<III", int(a), int(b), int(c)))
-        return b"".join(out)
-    except (TypeError, ValueError) as e:
-        raise ValueError(f"Erreur lors de l'encodage des triangles: {e}") from e
+        with stage("decode"):
+            return decode_pointset(data)
+    except ValueError as e:
+        raise ServiceError(400, {
+            "error": "Invalid PointSet binary format",
+            "details": str(e)
+        }) from e
+    except Exception as e:
+        raise ServiceError(400, {
+            "error": "PointSet decode failed",
+            "details": str(e)
+        }) from e
 
 
-# ============================================================================
-# 3. TRIANGULATION
-# ============================================================================
+def compute_hull(points: list[Point]) -> list[int]:
+    """Enveloppe convexe de points, calculée sous l'étape "hull".
 
+    Raises:
+        ServiceError: 500 en cas d'échec du calcul
+
+    """
+    try:
+        with stage("hull"):
+            return convex_hull(points)
+    except Exception as e:
+        raise ServiceError(500, {
+            "error": "Convex hull failed",
+            "details": str(e)
+        }) from e
 
-def triangulate(points: list[Point]) -> list[Triangle]:
-    """Calculate fan triangulation from a list of points.
 
-    Algorithme:
-    - Si < 3 points: retourne liste vide
-    - Si tous les points sont colinéaires: retourne liste vide
-    - Sinon: crée une triangulation en éventail à partir du point 0
+def entry_points(entry: PointSetEntry) -> list[Point]:
+    """Retourne les points de l'entrée, décodés s'ils manquent.
 
-    La triangulation en éventail connecte le premier point à toutes les
-    arêtes de la chaîne des autres points.
+    Raises:
+        ServiceError: 400 si le binaire conservé est invalide
 
-    Exemple avec 4 points [0, 1, 2, 3]:
-        Triangles: (0,1,2), (0,2,3)
+    """
+    if entry.points is None:
+        with entry.binary() as data:
+            entry.points = decode_points(data)
+    return entry.points
 
-    Args:
-        points: Liste de points à trianguler
 
-    Returns:
-        list[Triangle]: Liste de triangles (a, b, c) où a, b, c sont des indices
+def entry_hull(entry: PointSetEntry) -> list[int]:
+    """Retourne l'enveloppe convexe de l'entrée, calculée si elle manque.
 
     Raises:
-        ValueError: En cas d'erreur interne de calcul
+        ServiceError: En cas d'échec du décodage ou du calcul
+
+    """
+    if entry.hull is None:
+        source = entry.pointset if entry.pointset is not None else entry.payload
+        if (
+            entry.points is None
+            and isinstance(source, SharedBuffer)
+            and compute_pool.workers
+        ):
+            # Points décodés et enveloppe calculée par le pool, sur le segment
+            try:
+                with stage("hull"):
+                    entry.hull = compute_pool.hull(source)
+            except Exception as e:
+                raise ServiceError(500, {
+                    "error": "Convex hull failed",
+                    "details": str(e)
+                }) from e
+        else:
+            entry.hull = compute_hull(entry_points(entry))
+    return entry.hull
+
+
+class Variant:
+    """Triangulation dérivée de celle d'un PointSet (raffinée, contrainte...).
+
+    Une variante expose `key`, la clé de son binaire dans
+    `PointSetEntry.variants` (None s'il n'y est pas conservé),
+    `extra_points`, le nombre de points qu'elle peut ajouter (pour le
+    contrôle d'admission), et `compute(entry)` → (sommets, triangles), ou
+    None si elle est identique à la triangulation complète.
+    """
+
+    extra_points = 0
 
+    def cached(self, entry: PointSetEntry) -> bytes | None:
+        """Binaire de la variante, s'il peut être servi sans calcul."""
+        return entry.variants.get(self.key)
+
+
+@dataclass(frozen=True)
+class Refinement(Variant):
+    """Paramètres du raffinement de maillage demandé (`?refine=true`)."""
+
+    min_angle: float = DEFAULT_MIN_ANGLE
+    max_area: float | None = None
+    max_points: int = REFINE_MAX_POINTS
+
+    @property
+    def key(self) -> object:
+        """Clé du maillage raffiné dans `PointSetEntry.variants`."""
+        return self
+
+    @property
+    def extra_points(self) -> int:
+        """Nombre maximal de points de Steiner insérés."""
+        return self.max_points
+
+    def compute(self, entry: PointSetEntry) -> tuple[list[Point], list[Triangle]]:
+        """Maillage raffiné des points de l'entrée.
+
+        Raises:
+            ServiceError: 500 en cas d'échec du raffinement
+
+        """
+        points = entry_points(entry)
+        try:
+            with stage("refine"):
+                return refine(
+                    points,
+                    min_angle=self.min_angle,
+                    max_area=self.max_area,
+                    max_points=self.max_points,
+                )
+        except Exception as e:
+            raise ServiceError(500, {
+                "error": "Refinement failed",
+                "details": str(e)
+            }) from e
+
+
+@dataclass(frozen=True, eq=False)
+class Constraints(Variant):
+    """Domaine d'une triangulation contrainte: arêtes du bord et des trous."""
+
+    boundary: list[Edge]
+    holes: list[Edge]
+    digest: bytes
+
+    @property
+    def key(self) -> object:
+        """Clé de la triangulation contrainte dans `PointSetEntry.variants`."""
+        return ("constrained", self.digest)
+
+    def compute(self, entry: PointSetEntry) -> tuple[list[Point], list[Triangle]]:
+        """Triangles intérieurs au domaine, sur les points de l'entrée.
+
+        Raises:
+            ServiceError: 400 si les arêtes sont invalides pour ce PointSet,
+                          500 en cas d'échec de la triangulation
+
+        """
+        points = entry_points(entry)
+        try:
+            with stage("constrain"):
+                triangles = constrained_triangulation(
+                    points, self.boundary, self.holes
+                )
+        except ValueError as e:
+            raise ServiceError(400, {
+                "error": "Invalid constraints",
+                "details": str(e)
+            }) from e
+        except Exception as e:
+            raise ServiceError(500, {
+                "error": "Constrained triangulation failed",
+                "details": str(e)
+            }) from e
+        return points, triangles
+
+
+@dataclass(frozen=True)
+class LevelOfDetail(Variant):
+    """Niveau de détail demandé: triangulation d'au plus `max_vertices` sommets."""
+
+    max_vertices: int
+
+    @property
+    def key(self) -> object:
+        """Clé du niveau dans `PointSetEntry.variants`."""
+        return ("lod", self.max_vertices)
+
+    def compute(
+        self, entry: PointSetEntry
+    ) -> tuple[list[Point], list[Triangle]] | None:
+        """Triangulation des points représentatifs de l'entrée.
+
+        Returns:
+            tuple | None: (sommets, triangles), ou None si le PointSet tient
+                          déjà dans le budget
+
+        Raises:
+            ServiceError: 500 en cas d'échec de la décimation
+
+        """
+        if entry.point_count <= self.max_vertices:
+            return None
+        points = entry_points(entry)
+        try:
+            with stage("decimate"):
+                vertices = [points[i]
+                            for i in decimate(points, self.max_vertices)]
+            with stage("triangulate"):
+                triangles = triangulate(vertices, convex_hull(vertices))
+        except Exception as e:
+            raise ServiceError(500, {
+                "error": "Decimation failed",
+                "details": str(e)
+            }) from e
+        return vertices, triangles
+
+
+@dataclass(frozen=True)
+class Window(Variant):
+    """Fenêtre demandée (`?bbox=`): seuls les triangles qui l'intersectent.
+
+    Les sélections ne sont pas conservées: une fois l'index des tuiles de
+    l'entrée construit, elles sont servies directement depuis celui-ci.
     """
-    n = len(points)
-    if n < 3:
-        return []
 
-    def are_collinear(p1: Point, p2: Point, p3: Point) -> bool:
-        """Vérifie si trois points sont colinéaires via le produit vectoriel."""
-        cross_product = (
-            (p2[0] - p1[0]) * (p3[1] - p1[1]) -
-            (p2[1] - p1[1]) * (p3[0] - p1[0])
+    min_x: float
+    min_y: float
+    max_x: float
+    max_y: float
+
+    key = None
+
+    def cached(self, entry: PointSetEntry) -> bytes | None:
+        """Sélection servie par l'index des tuiles, s'il est construit."""
+        if entry.tiles is None:
+            return None
+        with stage("clip"):
+            vertices, triangles = entry.tiles.clip(self._box())
+        with stage("encode"):
+            return encode_triangles(triangles, vertices)
+
+    def compute(self, entry: PointSetEntry) -> tuple[list[Point], list[Triangle]]:
+        """Triangule l'entrée si besoin, construit son index, puis sélectionne.
+
+        Raises:
+            ServiceError: En cas d'échec de la triangulation ou de l'index
+
+        """
+        complete_triangulation(entry)
+        triangles = entry_triangles(entry)
+        if entry.tiles is None:
+            points = entry_points(entry)
+            try:
+                with stage("index"):
+                    entry.tiles = TileIndex(points, triangles)
+            except Exception as e:
+                raise ServiceError(500, {
+                    "error": "Tile index failed",
+                    "details": str(e)
+                }) from e
+        with stage("clip"):
+            return entry.tiles.clip(self._box())
+
+    def _box(self) -> tuple[float, float, float, float]:
+        return self.min_x, self.min_y, self.max_x, self.max_y
+
+
+def parse_variant(args: dict) -> Variant | None:
+    """Lit la variante demandée dans la query string de `/triangulation`.
+
+    Raises:
+        ServiceError: 400 si un paramètre est invalide, ou si plusieurs
+                      variantes sont demandées ensemble
+
+    """
+    requested = [
+        variant for variant in (
+            parse_refinement(args),
+            parse_level_of_detail(args),
+            parse_window(args),
         )
-        return abs(cross_product) < 1e-12
+        if variant is not None
+    ]
+    if len(requested) > 1:
+        raise ServiceError(400, {
+            "error": "Invalid triangulation options",
+            "details": "refine, maxVertices/maxTriangles et bbox ne peuvent "
+                       "pas être combinés"
+        })
+    return requested[0] if requested else None
 
-    all_collinear = True
-    for i in range(2, n):
-        if not are_collinear(points[0], points[1], points[i]):
-            all_collinear = False
-            break
 
-    if all_collinear:
-        return []
+def parse_window(args: dict) -> Window | None:
+    """Lit la fenêtre `bbox=minX,minY,maxX,maxY` de la query string.
 
-    return [(0, i, i + 1) for i in range(1, n - 1)]
+    Returns:
+        Window | None: None si aucune fenêtre n'est demandée
 
+    Raises:
+        ServiceError: 400 si la fenêtre est invalide
 
-# ============================================================================
-# 4. ENDPOINT REST
-# ============================================================================
+    """
+    if "bbox" not in args:
+        return None
+    try:
+        bounds = [float(value) for value in args["bbox"].split(",")]
+    except ValueError:
+        bounds = []
+    if (
+        len(bounds) != 4
+        or not all(math.isfinite(value) for value in bounds)
+        or bounds[0] > bounds[2]
+        or bounds[1] > bounds[3]
+    ):
+        raise ServiceError(400, {
+            "error": "Invalid bounding box",
+            "details": "bbox attendu sous la forme minX,minY,maxX,maxY"
+        })
+    return Window(*bounds)
+
+
+def parse_level_of_detail(args: dict) -> LevelOfDetail | None:
+    """Lit le budget du niveau de détail de la query string.
+
+    Le budget est donné en sommets (`maxVertices`) ou en triangles
+    (`maxTriangles`, une triangulation de n sommets en éventail ayant n - 2
+    triangles); avec les deux, le plus restrictif l'emporte. Il est arrondi
+    à la puissance de deux inférieure (`lod.level_budget`).
+
+    Returns:
+        LevelOfDetail | None: None si aucun budget n'est demandé
+
+    Raises:
+        ServiceError: 400 si un paramètre est invalide
+
+    """
+    budgets = []
+    try:
+        if "maxVertices" in args:
+            budgets.append(int(args["maxVertices"]))
+        if "maxTriangles" in args:
+            budgets.append(int(args["maxTriangles"]) + 2)
+        if not budgets:
+            return None
+        return LevelOfDetail(level_budget(min(budgets)))
+    except ValueError as e:
+        raise ServiceError(400, {
+            "error": "Invalid level of detail parameters",
+            "details": (
+                f"{e}; maxVertices doit valoir au moins {MIN_VERTICES}, "
+                f"maxTriangles au moins {MIN_VERTICES - 2}"
+            )
+        }) from e
+
+
+def parse_refinement(args: dict) -> Refinement | None:
+    """Lit les paramètres de raffinement de la query string.
+
+    Args:
+        args: Paramètres de la requête (`refine`, `minAngle`, `maxArea`,
+              `maxPoints`)
+
+    Returns:
+        Refinement | None: None si le raffinement n'est pas demandé
+
+    Raises:
+        ServiceError: 400 si un paramètre est invalide
+
+    """
+    if args.get("refine", "false").lower() not in ("true", "1"):
+        return None
+    try:
+        min_angle = float(args.get("minAngle", DEFAULT_MIN_ANGLE))
+        max_area = args.get("maxArea")
+        max_area = float(max_area) if max_area is not None else None
+        max_points = int(args.get("maxPoints", REFINE_MAX_POINTS))
+    except ValueError as e:
+        raise ServiceError(400, {
+            "error": "Invalid refinement parameters",
+            "details": str(e)
+        }) from e
+    if (
+        not 0 <= min_angle < 60
+        or (max_area is not None and not max_area > 0)
+        or not 0 <= max_points <= REFINE_MAX_POINTS
+    ):
+        raise ServiceError(400, {
+            "error": "Invalid refinement parameters",
+            "details": (
+                "minAngle doit être compris entre 0 et 60, maxArea strictement "
+                f"positive et maxPoints entre 0 et {REFINE_MAX_POINTS}"
+            )
+        })
+    return Refinement(min_angle, max_area, max_points)
+
+
+def parse_constraints(data: bytes) -> Constraints:
+    """Décode le binaire de contraintes envoyé par le client.
+
+    Raises:
+        ServiceError: 400 si le binaire est invalide
+
+    """
+    try:
+        boundary, holes = decode_constraints(data)
+    except ValueError as e:
+        raise ServiceError(400, {
+            "error": "Invalid constraints binary format",
+            "details": str(e)
+        }) from e
+    PAYLOAD_BYTES.labels("constraints").observe(len(data))
+    return Constraints(boundary, holes, _digest(data))
 
 
 @app.route("/triangulation/<pointSetId>", methods=["GET"])
@@ -288,10 +1338,42 @@ def get_triangulation(pointSetId: str) -> Response:
 
     Procédure:
     1. Appelle le PointSetManager pour obtenir le PointSet en binaire
-    2. Décode les points
+    2. Décode les points et calcule leur enveloppe convexe
     3. Calcule la triangulation
     4. Encode et renvoie le résultat
 
+    Les étapes 1 à 4 ne sont exécutées qu'une fois par PointSet: les
+    résultats intermédiaires sont conservés dans `result_cache`.
+
+    Raffinement:
+        Avec `?refine=true`, la triangulation renvoyée est un maillage de
+        Delaunay raffiné (voir `triangulator.refine`): des points de Steiner
+        sont ajoutés jusqu'à ce que chaque triangle ait un angle minimal
+        d'au moins `minAngle` degrés (20 par défaut) et une aire d'au plus
+        `maxArea`, dans la limite de `maxPoints` points insérés (au plus
+        `REFINE_MAX_POINTS`). Les sommets ajoutés suivent ceux du PointSet
+        dans le binaire renvoyé. Le résultat est conservé en cache pour ces
+        paramètres.
+
+    Niveau de détail:
+        Avec `?maxVertices=n` (ou `?maxTriangles=t`), la triangulation
+        renvoyée porte sur au plus n points représentatifs du PointSet,
+        choisis par regroupement sur une grille (voir `triangulator.lod`).
+        Le budget est arrondi à la puissance de deux inférieure: chaque
+        niveau est calculé une fois, puis servi depuis le cache. Un PointSet
+        qui tient dans le budget est renvoyé complet.
+
+    Fenêtre:
+        Avec `?bbox=minX,minY,maxX,maxY`, seuls les triangles qui
+        intersectent la fenêtre sont renvoyés, avec leurs seuls sommets
+        (réindexés dans l'ordre du PointSet). Un index des triangles par
+        tuile est construit à la première requête par fenêtre sur le
+        PointSet, puis conservé avec lui. Les triangles de l'éventail
+        partent tous du point 0 et traversent presque toutes les tuiles:
+        une requête teste alors la plupart des triangles (voir
+        `triangulator.tiles`). Ces options (raffinement, niveau de détail,
+        fenêtre) ne se combinent pas.
+
     Args:
         pointSetId: UUID du PointSet (passé en route param)
 
@@ -301,79 +1383,615 @@ def get_triangulation(pointSetId: str) -> Response:
 
     Status codes:
         200: Succès, contient les triangles encodés
-        400: Erreur de décodage/encodage des données
+        400: Erreur de décodage/encodage des données, ou paramètres de
+             raffinement, de niveau de détail ou de fenêtre invalides
         404: PointSet introuvable (PointSetManager)
         405: Méthode HTTP non autorisée (Flask automatique)
         500: Erreur interne lors de la triangulation
         502: PointSetManager injoignable ou en erreur
+        503: Capacité de calcul épuisée pour cette taille de PointSet, ou
+             PointSetManager suspendu par le disjoncteur (en-tête
+             `Retry-After`)
+
+    Profilage:
+        Si le profilage est activé (`/admin/profiling`), une requête portant
+        l'en-tête `X-Triangulator-Profile` (ou tirée au hasard selon le taux
+        d'échantillonnage) est entièrement recalculée sous `cProfile` et
+        `tracemalloc`. L'identifiant de la capture est renvoyé dans l'en-tête
+        de réponse `X-Triangulator-Profile-Id`.
 
     """
     try:
-        url = f"{POINTSET_MANAGER_URL}/pointsets/{pointSetId}/binary"
-        response = requests.get(url, timeout=REQUEST_TIMEOUT)
-    except requests.Timeout:
-        return jsonify({
-            "error": "PointSetManager timeout",
-            "details": (
-                f"Requête vers {POINTSET_MANAGER_URL} expirée après "
-                f"{REQUEST_TIMEOUT}s"
+        variant = parse_variant(request.args)
+    except ServiceError as e:
+        return e.to_response()
+
+    capture = profiler.start(pointSetId, requested=PROFILE_HEADER in request.headers)
+    if capture is None:
+        return _triangulation_response(pointSetId, variant=variant)
+
+    with capture:
+        g.profile_capture = capture
+        response = make_response(
+            _triangulation_response(pointSetId, refresh=True, variant=variant)
+        )
+    capture.status = response.status_code
+    try:
+        capture.save()
+    except OSError as e:
+        app.logger.warning("Échec de l'enregistrement du profil %s: %s", capture.id, e)
+    else:
+        response.headers[f"{PROFILE_HEADER}-Id"] = capture.id
+    return response
+
+
+def _triangulation_response(
+    pointSetId: str,
+    refresh: bool = False,
+    variant: Variant | None = None,
+) -> Response:
+    """Construit la réponse de `get_triangulation`, depuis le cache si possible.
+
+    Seul le calcul est soumis au contrôle d'admission: une réponse déjà en
+    cache est servie immédiatement, quelle que soit sa taille. Un PointSet
+    absent du cache est admis sur le nombre de points annoncé par son
+    en-tête, avant le transfert du reste du binaire. Une
+    variante est admise selon le nombre de points qu'elle peut atteindre,
+    points ajoutés compris. L'en-tête
+    `X-Cache-Status` indique si elle provient du cache (hit), d'une entrée
+    périmée (stale, avec l'en-tête `Warning`) ou d'un calcul (miss).
+    """
+    if refresh:
+        entry, cache_status = None, "miss"
+    else:
+        entry, cache_status = lookup_entry(pointSetId)
+    try:
+        payload = None
+        if entry is not None:
+            payload = (
+                entry.payload if variant is None else variant.cached(entry)
             )
-        }), 502
-    except requests.ConnectionError as e:
-        return jsonify({
-            "error": "PointSetManager unreachable",
-            "details": f"Impossible de se connecter à {POINTSET_MANAGER_URL}: {str(e)}"
-        }), 502
-    except requests.RequestException as e:
-        return jsonify({
-            "error": "PointSetManager request failed",
-            "details": str(e)
-        }), 502
+        if payload is None:
+            with (
+                open_pointset(pointSetId) if entry is None else nullcontext()
+            ) as download:
+                if entry is None:
+                    point_count = download.point_count
+                else:
+                    point_count = entry.point_count
+                if variant is not None:
+                    point_count += variant.extra_points
+                with compute_slot(point_count):
+                    if entry is None:
+                        entry = receive_entry(pointSetId, download)
+                    if variant is None:
+                        complete_triangulation(entry)
+                        payload = entry.payload
+                    else:
+                        payload = complete_variant(entry, variant)
+    except ServiceError as e:
+        return e.to_response()
+
+    PAYLOAD_BYTES.labels("triangles").observe(len(payload))
+    if isinstance(payload, SharedBuffer):
+        # Diffusé depuis le segment partagé, sans copie complète
+        response = Response(
+            payload.chunks(), content_type="application/octet-stream",
+            direct_passthrough=True,
+        )
+        response.headers["Content-Length"] = str(len(payload))
+    else:
+        response = Response(payload, content_type="application/octet-stream")
+    response.headers["X-Cache-Status"] = cache_status
+    if "peak_memory_bound" in g:
+        response.headers["X-Triangulator-Peak-Memory-Bound"] = str(
+            g.peak_memory_bound
+        )
+    if cache_status == "stale":
+        response.headers["Warning"] = '110 - "Response is Stale"'
+    return response
+
+
+def complete_triangulation(entry: PointSetEntry) -> None:
+    """Complète une entrée avec sa triangulation et son binaire, s'ils manquent.
+
+    Si l'entrée a conservé le binaire de son PointSet (voir `build_entry`),
+    le binaire de la triangulation en est directement construit par le
+    pipeline fusionné (voir `triangulator.pipeline`), sans liste de points
+    ni de triangles intermédiaire. Une borne supérieure de la mémoire
+    occupée, binaire reçu compris, est calculée d'après la taille du binaire
+    (elle n'est pas mesurée). Elle est enregistrée dans `PIPELINE_PEAK_BYTES`
+    et, pendant une requête, renvoyée dans l'en-tête
+    `X-Triangulator-Peak-Memory-Bound`, absent des réponses calculées par
+    étapes séparées (sous `FUSED_PIPELINE_THRESHOLD` points). Les triangles
+    sont alors calculés à la demande, par `entry_triangles`. Si le pool
+    `compute_pool` est actif, le calcul y est exécuté et le binaire reste
+    dans un segment de mémoire partagée (`SharedBuffer`).
 
-    if response.status_code == 404:
-        return jsonify({"error": "PointSet not found", "pointSetId": pointSetId}), 404
+    Args:
+        entry: Entrée à compléter
 
-    if response.status_code != 200:
-        return jsonify({
-            "error": "PointSetManager error",
-            "status_code": response.status_code
-        }), 502
+    Raises:
+        ServiceError: En cas d'échec de la triangulation ou de l'encodage
 
+    """
+    if entry.payload is not None:
+        return
+
+    data = entry.pointset
+    if data is not None and entry.triangles is None and SPATIAL_ORDER is None:
+        # Binaire reçu tel qu'alloué (marge de croissance d'un bytearray
+        # comprise), plus la mémoire de travail du pipeline
+        with entry.binary() as binary:
+            peak = peak_bytes(binary)
+        if isinstance(data, SharedBuffer):
+            peak += len(data)
+        else:
+            peak += sys.getsizeof(data)
+        try:
+            with stage("pipeline"):
+                if compute_pool.workers:
+                    entry.payload = compute_pool.triangulate(data, entry.hull)
+                else:
+                    with entry.binary() as binary:
+                        entry.payload = triangulate_pointset(binary, entry.hull)
+        except ValueError as e:
+            # Coordonnées non finies: refusées comme par `decode_pointset`
+            raise ServiceError(400, {
+                "error": "Invalid PointSet binary format",
+                "details": str(e)
+            }) from e
+        except Exception as e:
+            raise ServiceError(500, {
+                "error": "Triangulation failed",
+                "details": str(e)
+            }) from e
+        entry.pointset = None
+        PIPELINE_PEAK_BYTES.observe(peak)
+        if has_request_context():
+            g.peak_memory_bound = peak
+        return
+
+    triangles = entry_triangles(entry)
     try:
-        points = decode_pointset(response.content)
+        with stage("encode"):
+            entry.payload = encode_triangles(triangles, entry_points(entry))
     except ValueError as e:
-        return jsonify({
-            "error": "Invalid PointSet binary format",
+        raise ServiceError(400, {
+            "error": "Triangle encoding failed",
             "details": str(e)
-        }), 400
+        }) from e
     except Exception as e:
-        return jsonify({"error": "PointSet decode failed", "details": str(e)}), 400
+        raise ServiceError(500, {"error": "Encoding failed", "details": str(e)}) from e
+
+
+def entry_triangles(entry: PointSetEntry) -> list[Triangle]:
+    """Retourne les triangles de l'entrée, calculés s'ils manquent.
+
+    Raises:
+        ServiceError: En cas d'échec de la triangulation
 
+    """
+    if entry.triangles is None:
+        points = entry_points(entry)
+        try:
+            if SPATIAL_ORDER is None:
+                with stage("triangulate"):
+                    entry.triangles = triangulate(points, entry.hull)
+            else:
+                with stage("reorder"):
+                    entry.triangles = triangulate_along(
+                        points, SPATIAL_ORDER, entry.hull
+                    )
+        except Exception as e:
+            raise ServiceError(500, {
+                "error": "Triangulation failed",
+                "details": str(e)
+            }) from e
+    return entry.triangles
+
+
+def complete_variant(entry: PointSetEntry, variant: Variant) -> bytes:
+    """Retourne le binaire d'une variante de l'entrée, calculée si besoin.
+
+    Raises:
+        ServiceError: En cas d'échec du calcul ou de l'encodage
+
+    """
+    payload = entry.variants.get(variant.key)
+    if payload is not None:
+        return payload
+
+    result = variant.compute(entry)
+    if result is None:
+        complete_triangulation(entry)
+        return entry.payload
+    vertices, triangles = result
     try:
-        triangles = triangulate(points)
+        with stage("encode"):
+            payload = encode_triangles(triangles, vertices)
     except Exception as e:
-        return jsonify({"error": "Triangulation failed", "details": str(e)}), 500
+        raise ServiceError(500, {"error": "Encoding failed", "details": str(e)}) from e
+
+    if variant.key is not None:
+        entry.put_variant(variant.key, payload)
+    return payload
+
+
+@app.route("/triangulation/<pointSetId>/constrained", methods=["POST"])
+def post_constrained_triangulation(pointSetId: str) -> Response:
+    """Triangule l'intérieur d'un domaine à trous défini sur un PointSet.
+
+    Endpoint: POST /triangulation/{pointSetId}/constrained
+
+    Le corps de la requête contient, au format binaire Contraintes (voir
+    `encode_constraints`), les arêtes des polygones du bord extérieur et des
+    trous, par indices de points du PointSet. Les arêtes sont imposées dans
+    la triangulation de Delaunay et seuls les triangles intérieurs au bord
+    et extérieurs aux trous sont renvoyés, au format Triangles, avec tous
+    les points du PointSet. Le résultat est conservé en cache pour ces
+    contraintes.
 
+    Args:
+        pointSetId: UUID du PointSet (passé en route param)
+
+    Returns:
+        Response: Fichier binaire encodé avec status HTTP 200
+                  ou erreur JSON avec status HTTP approprié
+
+    Status codes:
+        200: Succès, contient les triangles intérieurs encodés
+        400: Binaire de contraintes invalide, arêtes hors du PointSet, non
+             fermées ou sécantes, ou PointSet invalide
+        404: PointSet introuvable (PointSetManager)
+        500: Erreur interne lors de la triangulation
+        502: PointSetManager injoignable ou en erreur
+        503: Capacité de calcul épuisée, ou PointSetManager suspendu par le
+             disjoncteur (en-tête `Retry-After`)
+
+    """
     try:
-        result = encode_triangles(triangles, points)
-    except ValueError as e:
-        return jsonify({"error": "Triangle encoding failed", "details": str(e)}), 400
-    except Exception as e:
-        return jsonify({"error": "Encoding failed", "details": str(e)}), 500
+        constraints = parse_constraints(request.get_data())
+    except ServiceError as e:
+        return e.to_response()
+    return _triangulation_response(pointSetId, variant=constraints)
+
+
+@app.route("/hull/<pointSetId>", methods=["GET"])
+def get_hull(pointSetId: str) -> Response:
+    """Récupère l'enveloppe convexe d'un PointSet.
+
+    Endpoint: GET /hull/{pointSetId}
+
+    Le résultat est encodé par `encode_hull`: les indices des sommets de
+    l'enveloppe dans le PointSet, dans l'ordre trigonométrique.
+
+    Args:
+        pointSetId: UUID du PointSet (passé en route param)
+
+    Returns:
+        Response: Indices encodés avec status HTTP 200
+                  ou erreur JSON avec status HTTP approprié
+
+    Status codes:
+        200: Succès, contient les indices encodés
+        400: Erreur de décodage des données
+        404: PointSet introuvable (PointSetManager)
+        500: Erreur interne lors du calcul de l'enveloppe
+        502: PointSetManager injoignable ou en erreur
+        503: Capacité de calcul épuisée pour cette taille de PointSet
+
+    """
+    try:
+        entry = load_pointset(pointSetId)
+    except ServiceError as e:
+        return e.to_response()
+
+    payload = encode_hull(entry_hull(entry))
+    PAYLOAD_BYTES.labels("hull").observe(len(payload))
+    return Response(payload, content_type="application/octet-stream")
+
+
+# ============================================================================
+# 7. JOBS ASYNCHRONES
+# ============================================================================
+
+
+def run_triangulation_job(pointSetId: str, report: Reporter) -> bytes:
+    """Exécute la triangulation d'un PointSet pour un job asynchrone.
+
+    Les étapes sont celles de `get_triangulation`, et le calcul occupe un
+    créneau de la même classe d'admission qu'une requête synchrone. Un job
+    n'est pas refusé quand sa classe est saturée: il libère la connexion au
+    PointSetManager, patiente à l'étape "admission" le délai estimé (au plus
+    `JOB_ADMISSION_RETRY_MAX` secondes), puis redemande un créneau.
+
+    Raises:
+        JobFailed: En cas d'échec d'une étape, avec le code HTTP associé
+
+    """
+    try:
+        while True:
+            entry = result_cache.get(pointSetId)
+            if entry is not None and entry.payload is not None:
+                break
+            try:
+                if entry is None:
+                    report("fetch", 0.0)
+                with (
+                    open_pointset(pointSetId) if entry is None else nullcontext()
+                ) as download:
+                    if entry is None:
+                        point_count = download.point_count
+                    else:
+                        point_count = entry.point_count
+                    with admission.admit(point_count):
+                        if entry is None:
+                            report("decode", 0.25)
+                            entry = receive_entry(pointSetId, download)
+                        report("triangulate", 0.6)
+                        complete_triangulation(entry)
+                break
+            except Overloaded as e:
+                report("admission", 0.0)
+                time.sleep(min(e.retry_after, JOB_ADMISSION_RETRY_MAX))
+        if isinstance(entry.payload, SharedBuffer):
+            return bytes(entry.payload)
+        return entry.payload
+    except ServiceError as e:
+        raise JobFailed(e.status, e.body) from e
+
+
+@app.route("/jobs", methods=["POST"])
+def submit_job() -> Response:
+    """Soumet le calcul asynchrone de la triangulation d'un PointSet.
+
+    Endpoint: POST /jobs
+
+    Corps JSON attendu: `{"pointSetId": "<uuid>"}`. La réponse contient
+    l'état initial du job; l'en-tête `Location` indique où le suivre.
+
+    Status codes:
+        202: Job accepté
+        400: Corps JSON invalide
+        503: Trop de jobs en attente
+    """
+    body = request.get_json(silent=True)
+    pointSetId = body.get("pointSetId") if isinstance(body, dict) else None
+    if not isinstance(pointSetId, str) or not pointSetId:
+        return jsonify({
+            "error": "Invalid job request",
+            "details": "Objet JSON attendu avec un champ pointSetId"
+        }), 400
+
+    try:
+        job = jobs.submit(
+            pointSetId, lambda report: run_triangulation_job(pointSetId, report)
+        )
+    except QueueFull as e:
+        return jsonify({"error": "Job queue full", "details": str(e)}), 503
+
+    return jsonify(asdict(job)), 202, {"Location": f"/jobs/{job.jobId}"}
+
 
-    return Response(result, content_type="application/octet-stream")
+@app.route("/jobs/<jobId>", methods=["GET"])
+def get_job(jobId: str) -> Response:
+    """Retourne l'état et la progression d'un job.
+
+    Status codes:
+        200: État du job
+        404: Job inconnu ou expiré
+    """
+    job = jobs.get(jobId)
+    if job is None:
+        return jsonify({"error": "Job not found", "jobId": jobId}), 404
+    return jsonify(asdict(job)), 200
+
+
+@app.route("/jobs/<jobId>/result", methods=["GET"])
+def get_job_result(jobId: str) -> Response:
+    """Télécharge le résultat binaire d'un job terminé.
+
+    Status codes:
+        200: Triangles encodés (même format que /triangulation)
+        404: Job inconnu ou expiré
+        409: Job pas encore terminé
+        4xx/5xx: Job en échec, avec le code de l'étape en erreur
+    """
+    job = jobs.get(jobId)
+    if job is None:
+        return jsonify({"error": "Job not found", "jobId": jobId}), 404
+    if job.status == FAILED:
+        return jsonify(job.error), job.errorStatus or 500
+    path = jobs.result_path(jobId)
+    if path is None:
+        return jsonify({
+            "error": "Job not finished",
+            "status": job.status,
+            "progress": job.progress
+        }), 409
+    return send_file(path, mimetype="application/octet-stream")
 
 
 # ============================================================================
-# 5. AUTRES ENDPOINTS / INFO
+# 8. AUTRES ENDPOINTS / INFO
 # ============================================================================
 
 
+def capacity() -> dict:
+    """Occupation courante de l'instance, sérialisable en JSON."""
+    admission_state = admission.snapshot()
+    return {
+        "in_flight": sum(
+            admission_state[name]["running"] for name in ("small", "large")
+        ),
+        "admission": admission_state,
+        "jobs": jobs.snapshot(),
+        "cache": {
+            "entries": len(result_cache),
+            "max_entries": result_cache.max_entries,
+        },
+        "upstream": breaker.snapshot(),
+        "warmup": warmup.snapshot(),
+    }
+
+
+def readiness_problems(state: dict) -> list[str]:
+    """Raisons pour lesquelles l'instance ne doit pas recevoir de trafic."""
+    problems = []
+    if state["warmup"]["status"] == "running":
+        problems.append("warming_up")
+    for name in ("small", "large"):
+        job_class = state["admission"][name]
+        if job_class["queued"] > HEALTH_MAX_QUEUE_FILL * job_class["max_queued"]:
+            problems.append(f"{name}_queue_saturated")
+    if state["jobs"]["running"] + state["jobs"]["queued"] > HEALTH_MAX_JOBS_PENDING:
+        problems.append("jobs_queue_saturated")
+    if HEALTH_FAIL_ON_CIRCUIT_OPEN and state["upstream"]["state"] != CLOSED:
+        problems.append("upstream_unavailable")
+    return problems
+
+
 @app.route("/health", methods=["GET"])
 def health() -> Response:
-    """Healthcheck endpoint."""
+    """Disponibilité de l'instance et capacité restante.
+
+    Endpoint: GET /health
+
+    La réponse décrit l'occupation de l'instance: calculs en cours et en
+    attente par classe, workers des jobs, remplissage du cache, état du
+    disjoncteur du PointSetManager et du préchauffage. Au-delà des seuils
+    `HEALTH_*`, l'instance se déclare non prête, avec les raisons dans
+    `reasons`.
+
+    Status codes:
+        200: Instance prête
+        503: Instance saturée ou en cours de préchauffage
+    """
+    state = capacity()
+    problems = readiness_problems(state)
+    if not problems:
+        return jsonify({"status": "ok", **state}), 200
+    status = "warming_up" if problems == ["warming_up"] else "not_ready"
+    return jsonify({"status": status, "reasons": problems, **state}), 503
+
+
+@app.route("/health/live", methods=["GET"])
+def liveness() -> Response:
+    """Vivacité du processus, indépendante de la charge.
+
+    Une instance saturée reste vivante: elle ne doit pas être redémarrée,
+    seulement retirée temporairement de la répartition (voir `/health`).
+    """
     return jsonify({"status": "ok"}), 200
 
 
+def warm_pointset(pointSetId: str) -> None:
+    """Récupère et triangule un PointSet pour le placer en cache.
+
+    Le calcul passe par le contrôle d'admission, comme une requête normale:
+    le préchauffage ne peut pas priver le trafic réel de créneaux de calcul.
+
+    Raises:
+        ServiceError: En cas d'échec d'une étape
+
+    """
+    entry = result_cache.get(pointSetId)
+    if entry is not None and entry.payload is not None:
+        return
+    with (
+        open_pointset(pointSetId) if entry is None else nullcontext()
+    ) as download:
+        point_count = entry.point_count if download is None else download.point_count
+        with compute_slot(point_count):
+            if entry is None:
+                entry = receive_entry(pointSetId, download)
+            complete_triangulation(entry)
+
+
+@app.route("/admin/warmup", methods=["GET", "POST"])
+def admin_warmup() -> Response:
+    """Lance ou suit le préchauffage du cache.
+
+    Endpoint: GET|POST /admin/warmup
+
+    Le corps JSON d'un POST contient `pointSetIds` (liste, par ordre de
+    priorité) et éventuellement `concurrency`. Seuls les premiers
+    `CACHE_MAX_ENTRIES` PointSets sont retenus: au-delà, ils évinceraient
+    ceux qui viennent d'être préchauffés. Pendant le préchauffage,
+    `/health` répond 503.
+
+    Status codes:
+        200: État du préchauffage (GET)
+        202: Préchauffage lancé
+        400: Corps JSON invalide
+        409: Un préchauffage est déjà en cours
+    """
+    if request.method == "GET":
+        return jsonify(warmup.snapshot()), 200
+
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        body = {}
+    ids = body.get("pointSetIds")
+    concurrency = body.get("concurrency", WARMUP_CONCURRENCY)
+    if (
+        not isinstance(ids, list)
+        or not all(isinstance(i, str) and i for i in ids)
+        or isinstance(concurrency, bool)
+        or not isinstance(concurrency, int)
+        or concurrency < 1
+    ):
+        return jsonify({
+            "error": "Invalid warmup request",
+            "details": "Objet JSON attendu avec une liste pointSetIds "
+                       "et une concurrence entière positive"
+        }), 400
+
+    ids = list(dict.fromkeys(ids))[:result_cache.max_entries]
+    if not warmup.start(ids, warm_pointset, concurrency):
+        return jsonify({"error": "Warmup already running",
+                        "warmup": warmup.snapshot()}), 409
+    return jsonify(warmup.snapshot()), 202
+
+
+@app.route("/admin/profiling", methods=["GET", "PUT"])
+def admin_profiling() -> Response:
+    """Consulte ou modifie la configuration du profilage.
+
+    Endpoint: GET|PUT /admin/profiling
+
+    Le corps JSON d'un PUT peut contenir `enabled` (bool), `sample_rate`
+    (fraction des requêtes profilées, entre 0 et 1) et `max_captures`.
+    La réponse décrit la configuration et les captures enregistrées.
+
+    Status codes:
+        200: Configuration courante
+        400: Corps JSON invalide
+    """
+    if request.method == "PUT":
+        settings = request.get_json(silent=True)
+        if not isinstance(settings, dict):
+            return jsonify({"error": "Invalid profiling settings",
+                            "details": "Objet JSON attendu"}), 400
+        try:
+            profiler.configure(settings)
+        except ValueError as e:
+            return jsonify({"error": "Invalid profiling settings",
+                            "details": str(e)}), 400
+
+    return jsonify({**profiler.settings(), "captures": profiler.captures()}), 200
+
+
+@app.route("/metrics", methods=["GET"])
+def get_metrics() -> Response:
+    """Expose les métriques du service au format texte de Prometheus."""
+    return Response(registry.render(), content_type=metrics.CONTENT_TYPE)
+
+
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=5000)
\ No newline at end of file
+    if WARMUP_IDS_FILE is not None:
+        with open(WARMUP_IDS_FILE, encoding="utf-8") as f:
+            ids = read_ids(f)[:result_cache.max_entries]
+        warmup.start(ids, warm_pointset, WARMUP_CONCURRENCY)
+    app.run(debug=True, host="0.0.0.0", port=5000)
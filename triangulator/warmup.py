@@ -0,0 +1,264 @@
+r"""Préchauffage du cache des résultats après un déploiement.
+
+Au démarrage, le cache est vide et les premières requêtes paient le coût
+complet de la triangulation. Le préchauffage récupère et triangule à
+l'avance une liste de PointSets « chauds », en parallèle avec une
+concurrence bornée; tant qu'il est en cours, `/health` signale que
+l'instance n'est pas prête à recevoir du trafic.
+
+La liste peut être donnée explicitement ou extraite d'un journal d'accès
+(format « common log » de werkzeug, nginx ou Apache): les PointSets les plus
+demandés passent en premier.
+
+Préchauffer une instance en cours d'exécution:
+    python -m triangulator.warmup --url http://localhost:5000 --ids ids.txt
+    python -m triangulator.warmup --url http://localhost:5000 \
+        --access-log access.log --limit 100 --concurrency 4
+"""
+
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+IDLE = "idle"
+RUNNING = "running"
+DONE = "done"
+
+# Chemins d'une requête de triangulation ou d'enveloppe dans un journal d'accès
+_ACCESS_LOG_PATH = re.compile(r'"GET /(?:triangulation|hull)/([^/\s?"]+)')
+
+# Nombre maximal d'erreurs conservées dans l'état du préchauffage
+MAX_REPORTED_ERRORS = 20
+
+
+def read_ids(lines: Iterable[str]) -> list[str]:
+    """Lit une liste de pointSetIds, un par ligne.
+
+    Les lignes vides et les commentaires (`#`) sont ignorés, ainsi que les
+    doublons.
+    """
+    ids = []
+    for line in lines:
+        pointSetId = line.split("#", 1)[0].strip()
+        if pointSetId:
+            ids.append(pointSetId)
+    return list(dict.fromkeys(ids))
+
+
+def hot_ids_from_access_log(
+    lines: Iterable[str], limit: int | None = None
+) -> list[str]:
+    """Extrait les PointSets les plus demandés d'un journal d'accès.
+
+    Args:
+        lines: Lignes du journal
+        limit: Nombre maximal de PointSets retournés
+
+    Returns:
+        list[str]: pointSetIds par nombre d'accès décroissant; à égalité,
+                   le plus récemment demandé d'abord
+
+    """
+    hits: Counter[str] = Counter()
+    last_seen: dict[str, int] = {}
+    for number, line in enumerate(lines):
+        match = _ACCESS_LOG_PATH.search(line)
+        if match:
+            hits[match.group(1)] += 1
+            last_seen[match.group(1)] = number
+    ranked = sorted(hits, key=lambda i: (-hits[i], -last_seen[i]))
+    return ranked[:limit] if limit is not None else ranked
+
+
+class Warmup:
+    """Préchauffage en arrière-plan, avec son état courant.
+
+    Un seul préchauffage peut être en cours à la fois.
+    """
+
+    def __init__(self) -> None:
+        """Initialise un préchauffage inactif."""
+        self.status = IDLE
+        self.total = 0
+        self.completed = 0
+        self.failed = 0
+        self.concurrency = 0
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.errors: list[dict] = []
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._done.set()
+
+    @property
+    def ready(self) -> bool:
+        """Indique si aucun préchauffage n'est en cours."""
+        return self._done.is_set()
+
+    def start(
+        self,
+        pointSetIds: list[str],
+        warm: Callable[[str], None],
+        concurrency: int = 4,
+    ) -> bool:
+        """Lance le préchauffage en arrière-plan.
+
+        Args:
+            pointSetIds: PointSets à préchauffer, par ordre de priorité
+            warm: Fonction récupérant et triangulant un PointSet; une
+                  exception compte comme un échec sans interrompre les autres
+            concurrency: Nombre de PointSets traités simultanément
+
+        Returns:
+            bool: False si un préchauffage est déjà en cours
+
+        """
+        with self._lock:
+            if not self._done.is_set():
+                return False
+            self._done.clear()
+            self.status = RUNNING
+            self.total = len(pointSetIds)
+            self.completed = self.failed = 0
+            self.concurrency = concurrency
+            self.started_at = time.time()
+            self.finished_at = None
+            self.errors = []
+
+        threading.Thread(
+            target=self._run, args=(list(pointSetIds), warm, concurrency),
+            name="triangulator-warmup", daemon=True,
+        ).start()
+        return True
+
+    def _run(
+        self, pointSetIds: list[str], warm: Callable[[str], None], concurrency: int
+    ) -> None:
+        def warm_one(pointSetId: str) -> None:
+            try:
+                warm(pointSetId)
+            except Exception as e:
+                with self._lock:
+                    self.failed += 1
+                    if len(self.errors) < MAX_REPORTED_ERRORS:
+                        self.errors.append(
+                            {"pointSetId": pointSetId, "error": str(e)}
+                        )
+            else:
+                with self._lock:
+                    self.completed += 1
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=max(1, concurrency), thread_name_prefix="triangulator-warm"
+            ) as executor:
+                executor.map(warm_one, pointSetIds)
+        finally:
+            with self._lock:
+                self.status = DONE
+                self.finished_at = time.time()
+            self._done.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Attend la fin du préchauffage en cours; False si `timeout` expire."""
+        return self._done.wait(timeout)
+
+    def snapshot(self) -> dict:
+        """Retourne l'état courant, sérialisable en JSON."""
+        with self._lock:
+            return {
+                "status": self.status,
+                "total": self.total,
+                "completed": self.completed,
+                "failed": self.failed,
+                "concurrency": self.concurrency,
+                "startedAt": self.started_at,
+                "finishedAt": self.finished_at,
+                "errors": list(self.errors),
+            }
+
+
+# ============================================================================
+# Ligne de commande
+# ============================================================================
+
+
+def _request(url: str, body: dict | None = None) -> dict:
+    """Appelle l'API d'administration et retourne la réponse JSON."""
+    import urllib.error
+    import urllib.request
+
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(
+        url, data=data, headers={"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as e:
+        details = e.read().decode(errors="replace")
+        raise RuntimeError(f"{url}: HTTP {e.code} {details}") from e
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Point d'entrée: déclenche le préchauffage d'une instance et le suit."""
+    parser = argparse.ArgumentParser(
+        prog="python -m triangulator.warmup",
+        description="Préchauffe le cache d'une instance du Triangulator.",
+    )
+    parser.add_argument("--url", default="http://localhost:5000",
+                        help="adresse de l'instance à préchauffer")
+    parser.add_argument("--ids", action="append", default=[],
+                        help="fichier de pointSetIds, un par ligne ('-' pour stdin)")
+    parser.add_argument("--access-log", action="append", default=[],
+                        help="journal d'accès dont rejouer les PointSets chauds")
+    parser.add_argument("--limit", type=int,
+                        help="nombre maximal de PointSets préchauffés")
+    parser.add_argument("--concurrency", type=int,
+                        help="PointSets traités simultanément par l'instance")
+    parser.add_argument("--no-wait", action="store_true",
+                        help="ne pas attendre la fin du préchauffage")
+    args = parser.parse_args(argv)
+
+    ids: list[str] = []
+    for path in args.ids:
+        if path == "-":
+            ids += read_ids(sys.stdin)
+        else:
+            with open(path, encoding="utf-8") as f:
+                ids += read_ids(f)
+    for path in args.access_log:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            ids += hot_ids_from_access_log(f)
+    ids = list(dict.fromkeys(ids))[:args.limit]
+    if not ids:
+        parser.error("aucun pointSetId: utiliser --ids ou --access-log")
+
+    body: dict = {"pointSetIds": ids}
+    if args.concurrency is not None:
+        body["concurrency"] = args.concurrency
+    endpoint = args.url.rstrip("/") + "/admin/warmup"
+    try:
+        state = _request(endpoint, body)
+        print(f"Préchauffage de {state['total']} PointSets lancé", file=sys.stderr)
+        while not args.no_wait and state["status"] == RUNNING:
+            time.sleep(1.0)
+            state = _request(endpoint)
+            print(f"  {state['completed'] + state['failed']}/{state['total']}",
+                  file=sys.stderr)
+    except (OSError, RuntimeError) as e:
+        print(f"Échec du préchauffage: {e}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(state, indent=2))
+    return 1 if state["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
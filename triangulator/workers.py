@@ -0,0 +1,232 @@
+"""Processus de calcul alimentés par mémoire partagée.
+
+Transmettre un PointSet de plusieurs centaines de mégaoctets à un autre
+processus par pickle le copie deux fois (sérialisation, puis
+désérialisation) et double la mémoire occupée. Ici, le binaire reçu est
+écrit une seule fois, dès sa réception, dans un segment
+`multiprocessing.shared_memory`; le processus web n'en lit que l'en-tête.
+Le processus de calcul le lit en place, via une `memoryview`: il décide
+la colinéarité des points et écrit le binaire Triangles dans un second
+segment, alloué par le processus web à la taille d'un éventail complet
+(pages non écrites jamais allouées), puis renvoie la taille effective.
+L'enveloppe convexe est de même calculée par le pool, qui décode les
+points depuis le segment. Seuls les noms des segments et quelques entiers
+transitent par le pool.
+
+Le segment de sortie est renvoyé sous forme de `SharedBuffer`, que le
+service conserve en cache et diffuse par blocs dans ses réponses. Il est
+libéré quand plus rien ne le référence.
+
+Ce module ne dépend que de la bibliothèque standard et du cœur du paquet:
+les processus de calcul ne chargent pas la couche web.
+"""
+
+import contextlib
+import multiprocessing
+import threading
+import weakref
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from triangulator.codec import (
+    BYTES_PER_POINT,
+    HEADER_SIZE,
+    decode_pointset,
+    read_point_count,
+)
+from triangulator.geometry import convex_hull
+from triangulator.pipeline import fan_output_size, triangulate_into
+
+# Taille des blocs diffusés depuis un segment partagé
+STREAM_CHUNK_BYTES = 1 << 20
+
+
+def _release(shm: SharedMemory) -> None:
+    """Ferme et supprime un segment."""
+    shm.close()
+    with contextlib.suppress(FileNotFoundError):
+        shm.unlink()
+
+
+class SharedBuffer:
+    """Binaire placé dans un segment de mémoire partagée.
+
+    Le segment est supprimé par `close`, ou dès que l'objet n'est plus
+    référencé (et au plus tard à l'arrêt de l'interpréteur).
+    """
+
+    def __init__(self, size: int) -> None:
+        """Crée un segment de `size` bytes (initialisés à zéro)."""
+        # Un segment ne peut pas être vide
+        self._shm = SharedMemory(create=True, size=max(1, size))
+        self.size = size
+        self._finalizer = weakref.finalize(self, _release, self._shm)
+
+    @classmethod
+    def copy_of(cls, data: bytes) -> "SharedBuffer":
+        """Crée un segment contenant une copie de `data`."""
+        buffer = cls(len(data))
+        buffer._shm.buf[:len(data)] = data
+        return buffer
+
+    @property
+    def name(self) -> str:
+        """Nom du segment, pour l'ouvrir depuis un autre processus."""
+        return self._shm.name
+
+    def __len__(self) -> int:
+        """Taille du binaire, en bytes."""
+        return self.size
+
+    def __bytes__(self) -> bytes:
+        """Retourne une copie du binaire."""
+        return bytes(self._shm.buf[:self.size])
+
+    def view(self) -> memoryview:
+        """Vue sur le binaire, sans copie.
+
+        La vue doit être libérée (`release`, ou en sortie d'un bloc `with`)
+        avant que le segment ne soit supprimé.
+        """
+        return self._shm.buf[:self.size]
+
+    def chunks(self, chunk_size: int = STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+        """Itère sur des copies du binaire par blocs, pour une réponse diffusée.
+
+        Le segment reste ouvert tant que l'itérateur est référencé.
+        """
+        for start in range(0, self.size, chunk_size):
+            yield bytes(self._shm.buf[start:min(start + chunk_size, self.size)])
+
+    def close(self) -> None:
+        """Supprime le segment (sans effet s'il l'est déjà)."""
+        self._finalizer()
+
+
+def _triangulate_shared(
+    source: str, source_size: int, target: str, hull_size: int | None
+) -> int:
+    """Triangule d'un segment à l'autre, dans un processus du pool.
+
+    Returns:
+        int: Nombre de bytes écrits dans le segment `target`
+
+    Raises:
+        ValueError: Si le binaire est invalide
+
+    """
+    source_shm = SharedMemory(source)
+    target_shm = SharedMemory(target)
+    try:
+        with source_shm.buf[:source_size] as data:
+            hull = None if hull_size is None else range(hull_size)
+            return triangulate_into(data, target_shm.buf, hull)
+    finally:
+        source_shm.close()
+        target_shm.close()
+
+
+def _hull_shared(source: str, source_size: int) -> list[int]:
+    """Enveloppe convexe du PointSet en tête d'un segment, dans un processus du pool.
+
+    Le segment contient un binaire PointSet ou un binaire Triangles, qui
+    commence par le PointSet.
+
+    Raises:
+        ValueError: Si le binaire est invalide
+
+    """
+    source_shm = SharedMemory(source)
+    try:
+        with source_shm.buf[:source_size] as data, data[:HEADER_SIZE] as head:
+            size = HEADER_SIZE + read_point_count(head) * BYTES_PER_POINT
+            with data[:size] as pointset:
+                points = decode_pointset(pointset)
+        return convex_hull(points)
+    finally:
+        source_shm.close()
+
+
+class ComputePool:
+    """Pool de processus de calcul du pipeline fusionné.
+
+    Les processus sont démarrés à la première utilisation, par `spawn`: ils
+    ne partagent pas l'état (verrous, threads) du processus web.
+    """
+
+    def __init__(self, workers: int) -> None:
+        """Prépare un pool de `workers` processus (0: pool désactivé)."""
+        self.workers = workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def triangulate(
+        self, data: bytes | SharedBuffer, hull: list[int] | None = None
+    ) -> SharedBuffer:
+        """Triangule un PointSet binaire dans un processus du pool.
+
+        Seule la longueur du binaire est vérifiée ici; la colinéarité est
+        décidée par le processus de calcul.
+
+        Args:
+            data: Binaire PointSet, de préférence déjà dans un segment
+                  partagé (sinon, il y est copié)
+            hull: Enveloppe convexe déjà calculée (optionnel; seule sa
+                  taille est transmise)
+
+        Returns:
+            SharedBuffer: Binaire Triangles, dans un segment partagé
+
+        Raises:
+            ValueError: Si le binaire est invalide
+
+        """
+        source = data if isinstance(data, SharedBuffer) else SharedBuffer.copy_of(data)
+        try:
+            with source.view() as view:
+                target = SharedBuffer(fan_output_size(view))
+            try:
+                target.size = self._pool().submit(
+                    _triangulate_shared, source.name, len(source), target.name,
+                    None if hull is None else len(hull),
+                ).result()
+            except BaseException:
+                target.close()
+                raise
+        finally:
+            if source is not data:
+                source.close()
+        return target
+
+    def hull(self, data: SharedBuffer) -> list[int]:
+        """Enveloppe convexe d'un PointSet, calculée dans un processus du pool.
+
+        Args:
+            data: Segment commençant par un binaire PointSet (le PointSet
+                  lui-même, ou le binaire Triangles qui le recopie)
+
+        Returns:
+            list[int]: Indices des sommets de l'enveloppe, comme `convex_hull`
+
+        Raises:
+            ValueError: Si le binaire est invalide
+
+        """
+        return self._pool().submit(_hull_shared, data.name, len(data)).result()
+
+    def shutdown(self) -> None:
+        """Arrête les processus du pool; il redémarrera au prochain calcul."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()